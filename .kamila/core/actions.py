@@ -21,6 +21,13 @@ load_dotenv('.kamila/.env')
 
 logger = logging.getLogger(__name__)
 
+# Respostas fixas (pré-renderizadas no cache de áudio do TTS)
+GREETING_MORNING = "Bom dia! Como posso ajudar você hoje?"
+GREETING_AFTERNOON = "Boa tarde! Em que posso ser útil?"
+GREETING_EVENING = "Boa noite! O que você precisa?"
+GOODBYE_RESPONSE = "Tchau! Foi um prazer ajudar você. Até logo!"
+CANNED_RESPONSES = (GREETING_MORNING, GREETING_AFTERNOON, GREETING_EVENING, GOODBYE_RESPONSE)
+
 class ActionManager:
     """Gerencia e executa ações baseadas em intenções."""
 
@@ -233,15 +240,15 @@ class ActionManager:
         current_hour = datetime.now().hour
 
         if 6 <= current_hour < 12:
-            return "Bom dia! Como posso ajudar você hoje?"
+            return GREETING_MORNING
         elif 12 <= current_hour < 18:
-            return "Boa tarde! Em que posso ser útil?"
+            return GREETING_AFTERNOON
         else:
-            return "Boa noite! O que você precisa?"
+            return GREETING_EVENING
 
     def _handle_goodbye(self, command: str) -> str:
         """Manipula despedidas."""
-        return "Tchau! Foi um prazer ajudar você. Até logo!"
+        return GOODBYE_RESPONSE
 
     def _handle_time(self, command: str) -> str:
         """Manipula consultas de hora."""
@@ -0,0 +1,100 @@
+"""
+Audio Frames - Decodificação de Frames PCM para Kamila
+Entrega os frames de 16 bits lidos do microfone ao Porcupine sem criar tuplas
+de inteiros a cada frame: o loop da wake word roda 24/7 (~31 frames/s) e o
+custo por frame é o que define a carga ociosa da CPU.
+"""
+
+import math
+import ctypes
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def pcm_view(data) -> memoryview:
+    """Visão int16 (sem cópia) sobre os bytes de um frame PCM nativo (paInt16)."""
+    return memoryview(data).cast('h')
+
+
+def frame_rms(data) -> float:
+    """Energia RMS de um frame PCM int16 (mesma escala do `energy_threshold` do SpeechRecognition)."""
+    if NUMPY_AVAILABLE:
+        # Vetorizado: roda em todo frame do loop sempre ativo (piso de ruído e barge-in)
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float64)
+        if not samples.size:
+            return 0.0
+        return math.sqrt(samples.dot(samples) / samples.size)
+    return _frame_rms_python(data)
+
+
+def zero_crossing_rate(data) -> float:
+    """Fração de amostras consecutivas com troca de sinal (alta em ruído/fricativas, baixa em vogais)."""
+    if NUMPY_AVAILABLE:
+        signs = np.frombuffer(data, dtype=np.int16) >= 0
+        if signs.size < 2:
+            return 0.0
+        return np.count_nonzero(signs[1:] != signs[:-1]) / (signs.size - 1)
+    return _zero_crossing_rate_python(data)
+
+
+def _frame_rms_python(data) -> float:
+    """`frame_rms` sem numpy (referência)."""
+    samples = pcm_view(data)
+    if not len(samples):
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+def _zero_crossing_rate_python(data) -> float:
+    """`zero_crossing_rate` sem numpy (referência)."""
+    samples = pcm_view(data)
+    if len(samples) < 2:
+        return 0.0
+    crossings = sum(1 for a, b in zip(samples, samples[1:]) if (a >= 0) != (b >= 0))
+    return crossings / (len(samples) - 1)
+
+
+class FrameProcessor:
+    """
+    Passa frames PCM ao Porcupine reutilizando um buffer pré-alocado.
+
+    `Porcupine.process` converte a sequência recebida em um array ctypes
+    elemento a elemento (`(c_short * n)(*pcm)`), o que domina o custo do frame.
+    Quando a instância expõe a função nativa, os bytes são copiados de uma vez
+    (memmove) para um buffer `c_short` reutilizado e a função nativa é chamada
+    direto; caso contrário, usa-se o `process` público com uma visão sem cópia.
+    """
+
+    def __init__(self, porcupine):
+        self.porcupine = porcupine
+        self.frame_length = porcupine.frame_length
+        self.frame_bytes = self.frame_length * ctypes.sizeof(ctypes.c_short)
+
+        self._buffer = (ctypes.c_short * self.frame_length)()
+        self._result = ctypes.c_int()
+        self._native = getattr(porcupine, "_process_func", None)
+        self._handle = getattr(porcupine, "_handle", None)
+        if self._native is None or self._handle is None:
+            self._native = None
+            logger.debug("Função nativa do Porcupine indisponível; usando process() com visão sem cópia")
+
+    def process(self, data) -> int:
+        """Processa um frame (bytes com `frame_length` amostras int16); retorna o índice da palavra ou -1."""
+        if len(data) != self.frame_bytes:
+            return self.porcupine.process(pcm_view(data))
+
+        if self._native is not None:
+            ctypes.memmove(self._buffer, data, self.frame_bytes)
+            status = self._native(self._handle, self._buffer, ctypes.byref(self._result))
+            if getattr(status, "value", status) == 0:
+                return self._result.value
+            # Em caso de erro, o process público gera a exceção adequada
+
+        return self.porcupine.process(pcm_view(data))
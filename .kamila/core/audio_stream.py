@@ -0,0 +1,423 @@
+"""
+Audio Stream - Captura Contínua de Áudio para Kamila
+Um único stream do microfone, aberto uma vez, alimenta um buffer circular de
+frames PCM. A detecção da wake word e a gravação do comando leem do mesmo
+buffer com cursores independentes, de modo que o comando começa com o áudio
+de logo antes do fim da wake word (pre-roll) e o dispositivo nunca é reaberto.
+O FileAudioSource alimenta o mesmo buffer a partir de um arquivo gravado, para
+exercitar o pipeline sem microfone.
+"""
+
+import time
+import wave
+import asyncio
+import weakref
+import logging
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+try:
+    from pydub import AudioSegment
+    PYDUB_AVAILABLE = True
+except ImportError:
+    PYDUB_AVAILABLE = False
+
+
+class AudioRingBuffer:
+    """
+    Buffer circular de frames com um produtor e vários leitores.
+
+    O produtor grava o frame no slot e só então avança a posição; leitores
+    nunca bloqueiam o produtor (cada um guarda o próprio cursor). A condição
+    serve apenas para acordar leitores que esperam por frames novos.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Inicializa o buffer.
+
+        Args:
+            capacity (int): Quantidade de frames mantidos (o mais antigo é sobrescrito)
+        """
+        self.capacity = capacity
+        self._slots: List[Optional[bytes]] = [None] * capacity
+        self._position = 0  # Total de frames já gravados
+        self._closed = False
+        self._new_frame = threading.Condition()
+        self._listeners: List[Callable[[], None]] = []
+
+    @property
+    def position(self) -> int:
+        """Posição absoluta do próximo frame a ser gravado."""
+        return self._position
+
+    @property
+    def oldest(self) -> int:
+        """Posição absoluta do frame mais antigo ainda disponível."""
+        # O slot do frame anterior a este é o próximo a ser sobrescrito; nunca é lido
+        return max(0, self._position - self.capacity + 1)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, frame: bytes):
+        """Grava um frame (chamado pela thread de captura)."""
+        position = self._position
+        self._slots[position % self.capacity] = frame
+        self._position = position + 1
+        with self._new_frame:
+            self._new_frame.notify_all()
+        self._notify_listeners()
+
+    def close(self):
+        """Encerra o buffer; leitores bloqueados são liberados."""
+        self._closed = True
+        with self._new_frame:
+            self._new_frame.notify_all()
+        self._notify_listeners()
+
+    def add_listener(self, listener: Callable[[], None]):
+        """Registra uma função chamada (na thread de captura) a cada frame novo e no fechamento."""
+        self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener: Callable[[], None]):
+        self._listeners = [item for item in self._listeners if item != listener]
+
+    def _notify_listeners(self):
+        for listener in self._listeners:
+            listener()
+
+    def reader(self, preroll: int = 0) -> "RingReader":
+        """Cria um leitor que começa `preroll` frames antes da posição atual."""
+        return RingReader(self, self._position - preroll)
+
+    def get(self, position: int) -> Optional[bytes]:
+        """Frame na posição absoluta (None se já foi sobrescrito ou ainda não existe)."""
+        if position < self.oldest or position >= self._position:
+            return None
+        frame = self._slots[position % self.capacity]
+        # O produtor pode ter avançado durante a leitura
+        return frame if position >= self.oldest else None
+
+    def wait(self, position: int, timeout: Optional[float]) -> bool:
+        """Espera até existir o frame na posição; retorna False no timeout ou se fechado."""
+        with self._new_frame:
+            return self._new_frame.wait_for(
+                lambda: self._position > position or self._closed, timeout
+            ) and self._position > position
+
+
+class RingReader:
+    """Cursor independente sobre um AudioRingBuffer."""
+
+    def __init__(self, ring: AudioRingBuffer, position: int):
+        self.ring = ring
+        self.position = max(position, ring.oldest)
+        self.overruns = 0  # Frames perdidos por leitura lenta
+
+    def read(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Retorna o próximo frame, esperando até `timeout` segundos (None no timeout)."""
+        while True:
+            if self.position < self.ring.oldest:
+                # Leitor ficou para trás: pula para o frame mais antigo disponível
+                self.overruns += self.ring.oldest - self.position
+                self.position = self.ring.oldest
+
+            frame = self.ring.get(self.position)
+            if frame is not None:
+                self.position += 1
+                return frame
+
+            if self.position < self.ring.oldest:
+                continue
+            if not self.ring.wait(self.position, timeout):
+                return None
+
+    def seek(self, position: int):
+        """Move o cursor para uma posição absoluta (limitada ao conteúdo disponível)."""
+        self.position = min(max(position, self.ring.oldest), self.ring.position)
+
+    def skip_to_live(self):
+        """Descarta o que estiver pendente e passa a ler apenas frames novos."""
+        self.position = self.ring.position
+
+    @property
+    def pending(self) -> int:
+        """Frames disponíveis e ainda não lidos."""
+        return self.ring.position - max(self.position, self.ring.oldest)
+
+
+class AsyncRingReader:
+    """
+    Leitor para asyncio: espera frames novos sem ocupar uma thread.
+
+    A thread de captura apenas agenda o despertar do loop de eventos
+    (`call_soon_threadsafe`); a leitura em si nunca bloqueia.
+    """
+
+    def __init__(self, reader: RingReader, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.reader = reader
+        self.loop = loop or asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        reader.ring.add_listener(self._on_frame)
+
+    def _on_frame(self):
+        try:
+            self.loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # Loop de eventos já encerrado
+            pass
+
+    async def read(self) -> Optional[bytes]:
+        """Próximo frame (None se o buffer for fechado)."""
+        while True:
+            frame = self.reader.read(timeout=0)
+            if frame is not None:
+                return frame
+            if self.reader.ring.closed:
+                return None
+            self._ready.clear()
+            # Um frame pode ter chegado entre a leitura e o clear
+            if self.reader.pending:
+                continue
+            await self._ready.wait()
+
+    def close(self):
+        self.reader.ring.remove_listener(self._on_frame)
+
+
+class AudioCapture:
+    """Stream PyAudio em modo callback, aberto uma vez, que alimenta um AudioRingBuffer."""
+
+    def __init__(self, sample_rate: int = 16000, frame_length: int = 512,
+                 device_index: Optional[int] = None, buffer_seconds: float = 10.0):
+        """
+        Inicializa a captura (o stream só é aberto em `start`).
+
+        Args:
+            sample_rate (int): Taxa de amostragem em Hz
+            frame_length (int): Amostras int16 por frame (o frame do Porcupine)
+            device_index (int): Dispositivo de entrada (None = padrão do sistema)
+            buffer_seconds (float): Histórico de áudio mantido no buffer circular
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.device_index = device_index
+        self.sample_width = 2
+
+        capacity = max(2, int(buffer_seconds * sample_rate / frame_length))
+        self.ring = AudioRingBuffer(capacity)
+
+        self._pa = None
+        self._stream = None
+
+    @property
+    def frame_duration(self) -> float:
+        """Duração de um frame em segundos."""
+        return self.frame_length / self.sample_rate
+
+    def frames_for(self, seconds: float) -> int:
+        """Quantidade de frames em `seconds` segundos."""
+        return int(round(seconds / self.frame_duration))
+
+    @property
+    def running(self) -> bool:
+        if self._stream is None:
+            return False
+        try:
+            return self._stream.is_active()
+        except Exception:
+            # Stream de um dispositivo desconectado
+            return False
+
+    def start(self):
+        """Abre o stream do microfone (uma única vez)."""
+        if self._stream is not None:
+            return
+        if not PYAUDIO_AVAILABLE:
+            raise RuntimeError("PyAudio não instalado")
+
+        self._pa = pyaudio.PyAudio()
+        self._stream = self._pa.open(
+            rate=self.sample_rate,
+            channels=1,
+            format=pyaudio.paInt16,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.frame_length,
+            stream_callback=self._on_audio,
+        )
+        self._stream.start_stream()
+        logger.info(f"Captura contínua de áudio iniciada ({self.sample_rate} Hz, frames de {self.frame_length} amostras)")
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        # Roda na thread do PortAudio: apenas grava o frame e retorna
+        self.ring.write(in_data)
+        return None, pyaudio.paContinue
+
+    def reader(self, preroll_seconds: float = 0.0) -> RingReader:
+        """Cria um leitor independente, opcionalmente com `preroll_seconds` de áudio anterior."""
+        return self.ring.reader(self.frames_for(preroll_seconds))
+
+    def restart(self):
+        """Reabre o stream (ex.: dispositivo reconectado); o buffer e os leitores continuam válidos."""
+        self._close_stream()
+        self.start()
+
+    def stop(self):
+        """Fecha o stream e libera o dispositivo (leitores bloqueados são liberados)."""
+        self.ring.close()
+        self._close_stream()
+        logger.info("Captura contínua de áudio encerrada.")
+
+    def _close_stream(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop_stream()
+                self._stream.close()
+            except Exception as e:
+                logger.warning(f"Erro ao fechar o stream de áudio: {e}")
+            self._stream = None
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+
+
+def read_audio_file(path: str, sample_rate: int = 16000) -> bytes:
+    """
+    Lê um arquivo de áudio como PCM int16 mono na taxa pedida.
+
+    WAV mono de 16 bits na taxa certa é lido direto (biblioteca padrão); outros
+    formatos (MP3, WAV estéreo ou em outra taxa) são convertidos com o pydub.
+    """
+    if path.lower().endswith(".wav"):
+        with wave.open(path, "rb") as wav:
+            if wav.getnchannels() == 1 and wav.getsampwidth() == 2 and wav.getframerate() == sample_rate:
+                return wav.readframes(wav.getnframes())
+
+    if not PYDUB_AVAILABLE:
+        raise RuntimeError(f"pydub não instalado; não é possível converter {path} (use WAV mono 16 bits a {sample_rate} Hz)")
+    segment = AudioSegment.from_file(path).set_channels(1).set_frame_rate(sample_rate).set_sample_width(2)
+    return segment.raw_data
+
+
+class FileAudioSource:
+    """
+    Fonte de áudio gravado com a mesma interface do AudioCapture.
+
+    Uma thread grava os frames do arquivo no AudioRingBuffer em tempo real
+    (`realtime=True`) ou o mais rápido possível. No modo rápido, a thread fica
+    no máximo `max_lead` frames à frente do leitor mais adiantado, de modo que
+    nenhum frame é descartado enquanto o comando é processado.
+    """
+
+    def __init__(self, path: str, sample_rate: int = 16000, frame_length: int = 512,
+                 realtime: bool = True, pad_seconds: float = 1.0, buffer_seconds: float = 10.0,
+                 max_lead: int = 2):
+        """
+        Inicializa a fonte (o arquivo é lido e convertido aqui; a reprodução começa em `start`).
+
+        Args:
+            path (str): Arquivo WAV/MP3
+            sample_rate (int): Taxa de amostragem em Hz
+            frame_length (int): Amostras int16 por frame (o frame do Porcupine)
+            realtime (bool): Reproduzir no ritmo do áudio (False = o mais rápido possível)
+            pad_seconds (float): Silêncio acrescentado ao final (para o fim de fala ser detectado)
+            buffer_seconds (float): Histórico de áudio mantido no buffer circular
+            max_lead (int): Frames que a reprodução rápida pode ficar à frente dos leitores
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.sample_width = 2
+        self.realtime = realtime
+        self.max_lead = max(1, max_lead)
+
+        capacity = max(2, int(buffer_seconds * sample_rate / frame_length))
+        self.ring = AudioRingBuffer(capacity)
+
+        frame_bytes = frame_length * self.sample_width
+        pcm = read_audio_file(path, sample_rate)
+        pcm += b"\x00" * (-len(pcm) % frame_bytes)
+        pcm += b"\x00" * (self.frames_for(pad_seconds) * frame_bytes)
+        self._frames = [pcm[start:start + frame_bytes] for start in range(0, len(pcm), frame_bytes)]
+
+        self._readers = weakref.WeakSet()
+        self._stop = threading.Event()
+        self.finished = threading.Event()  # Arquivo inteiro entregue ao buffer
+        self._thread = None
+
+    @property
+    def frame_duration(self) -> float:
+        """Duração de um frame em segundos."""
+        return self.frame_length / self.sample_rate
+
+    def frames_for(self, seconds: float) -> int:
+        """Quantidade de frames em `seconds` segundos."""
+        return int(round(seconds / self.frame_duration))
+
+    @property
+    def duration(self) -> float:
+        """Duração total reproduzida (com o silêncio final), em segundos."""
+        return len(self._frames) * self.frame_duration
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._stop.is_set() and not self.ring.closed
+
+    def start(self):
+        """Começa a reprodução (uma única vez)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._play, name="file-audio-source", daemon=True)
+        self._thread.start()
+        mode = "tempo real" if self.realtime else "o mais rápido possível"
+        logger.info(f"Reproduzindo {self.path} ({self.duration:.1f}s, {mode})")
+
+    def _can_write(self) -> bool:
+        position = self.ring.position
+        return any(position - reader.position < self.max_lead for reader in list(self._readers))
+
+    def _play(self):
+        start = time.perf_counter()
+        for index, frame in enumerate(self._frames):
+            if self.realtime:
+                delay = start + index * self.frame_duration - time.perf_counter()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+            else:
+                while not self._can_write():
+                    if self._stop.wait(0.0005):
+                        break
+            if self._stop.is_set():
+                break
+            self.ring.write(frame)
+
+        self.finished.set()
+        self.ring.close()
+
+    def restart(self):
+        """Sem efeito além de `start`: a reprodução de um arquivo não trava nem é reiniciada."""
+        self.start()
+
+    def reader(self, preroll_seconds: float = 0.0) -> RingReader:
+        """Cria um leitor independente, opcionalmente com `preroll_seconds` de áudio anterior."""
+        reader = self.ring.reader(self.frames_for(preroll_seconds))
+        self._readers.add(reader)
+        return reader
+
+    def stop(self):
+        """Interrompe a reprodução (leitores bloqueados são liberados)."""
+        self._stop.set()
+        self.ring.close()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
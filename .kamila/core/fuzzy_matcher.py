@@ -0,0 +1,159 @@
+"""
+Fuzzy Matcher - Correspondência Aproximada de Intenções para Kamila
+Índice de n-gramas de caracteres com distância de edição sobre as frases de
+exemplo de cada intenção, tolerante a erros de reconhecimento de voz
+(ex.: "diminui o brilio", "camila status monitoramento").
+"""
+
+import heapq
+import logging
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Vocativos ignorados na comparação aproximada (o STT ora inclui, ora omite)
+WAKE_WORDS = {"kamila", "camila", "kammy"}
+
+
+def fold_text(text: str) -> str:
+    """Remove acentos, vocativos e espaços extras (o STT frequentemente erra a acentuação)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(word for word in stripped.split() if word not in WAKE_WORDS)
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> int:
+    """
+    Distância de edição limitada a uma faixa diagonal.
+
+    Retorna `max_distance + 1` assim que a distância certamente excede o limite,
+    o que mantém o custo em O(len * max_distance).
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+
+    too_far = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        if low == 1:
+            current[0] = i
+        row_min = current[0]
+        for j in range(low, high + 1):
+            # Substituição, remoção e inserção (comparações diretas são mais rápidas que min())
+            value = previous[j - 1] + (char_a != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return too_far
+        previous = current
+
+    return min(previous[len(b)], too_far)
+
+
+class FuzzyIntentIndex:
+    """Índice de trigramas sobre frases de exemplo, com reclassificação por distância de edição."""
+
+    def __init__(self, n: int = 3, min_similarity: float = 0.8, max_candidates: int = 8):
+        """
+        Inicializa o índice.
+
+        Args:
+            n (int): Tamanho dos n-gramas de caracteres
+            min_similarity (float): Similaridade mínima (1 - distância normalizada) para aceitar
+            max_candidates (int): Exemplos reclassificados por distância de edição por consulta
+        """
+        self.n = n
+        self.min_similarity = min_similarity
+        self.max_candidates = max_candidates
+
+        self._examples: List[Tuple[str, str]] = []  # (intenção, frase normalizada)
+        self._gram_counts: List[int] = []
+        self._index: Dict[str, List[int]] = defaultdict(list)
+        self._known: Set[Tuple[str, str]] = set()
+
+    def _grams(self, text: str) -> Set[str]:
+        padded = f" {text} "
+        return {padded[i:i + self.n] for i in range(max(1, len(padded) - self.n + 1))}
+
+    def add(self, intent: str, phrases: Iterable[str]):
+        """Indexa frases de exemplo de uma intenção."""
+        for phrase in phrases:
+            folded = fold_text(phrase)
+            if not folded or (intent, folded) in self._known:
+                continue
+
+            example_id = len(self._examples)
+            grams = self._grams(folded)
+            self._examples.append((intent, folded))
+            self._gram_counts.append(len(grams))
+            self._known.add((intent, folded))
+            for gram in grams:
+                self._index[gram].append(example_id)
+
+    def remove_intent(self, intent: str):
+        """Remove todos os exemplos de uma intenção (o índice é reconstruído)."""
+        remaining = [(name, phrase) for name, phrase in self._examples if name != intent]
+        self._examples, self._gram_counts = [], []
+        self._index = defaultdict(list)
+        self._known = set()
+        for name, phrase in remaining:
+            self.add(name, [phrase])
+
+    def __len__(self) -> int:
+        return len(self._examples)
+
+    def match(self, command: str) -> Tuple[Optional[str], float]:
+        """
+        Retorna a intenção do exemplo mais parecido e sua similaridade (0 a 1).
+
+        Retorna (None, 0.0) se nenhum exemplo atingir `min_similarity`.
+        """
+        folded = fold_text(command)
+        if not folded or not self._examples:
+            return None, 0.0
+
+        grams = self._grams(folded)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for example_id in self._index.get(gram, ()):
+                shared[example_id] += 1
+        if not shared:
+            return None, 0.0
+
+        # Pré-seleção pelo coeficiente de Dice dos n-gramas
+        total = len(grams)
+        counts = self._gram_counts
+        ranked = heapq.nlargest(
+            self.max_candidates, shared,
+            key=lambda example_id: shared[example_id] / (total + counts[example_id])
+        )
+
+        best_intent, best_similarity = None, 0.0
+        for example_id in ranked:
+            intent, phrase = self._examples[example_id]
+            longest = max(len(folded), len(phrase))
+            max_distance = int((1.0 - max(self.min_similarity, best_similarity)) * longest)
+            distance = bounded_levenshtein(folded, phrase, max_distance)
+            if distance > max_distance:
+                continue
+            similarity = 1.0 - distance / longest
+            if similarity > best_similarity:
+                best_intent, best_similarity = intent, similarity
+                if distance == 0:
+                    break
+
+        if best_similarity < self.min_similarity:
+            return None, 0.0
+        return best_intent, best_similarity
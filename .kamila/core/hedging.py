@@ -0,0 +1,82 @@
+"""
+Hedging - Requisições Redundantes para Kamila
+Executa uma chamada principal e, se ela demorar mais que um atraso configurável
+(ou falhar), dispara uma alternativa em paralelo; vale o primeiro resultado bem-sucedido.
+Evita que uma chave inválida ou um endpoint lento dobrem a latência do comando.
+"""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Callable, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def hedged_call(primary: Callable[[], T], fallback: Callable[[], T], executor: Executor,
+                delay: Optional[float], hedge_on: Tuple[Type[BaseException], ...] = (Exception,)) -> Tuple[T, int]:
+    """
+    Executa `primary` com `fallback` como requisição redundante.
+
+    Args:
+        primary (Callable): Chamada preferida (ex.: reconhecimento com chave de API)
+        fallback (Callable): Alternativa disparada após `delay` segundos sem resposta
+        executor (Executor): Pool onde as duas chamadas rodam (precisa de 2 workers livres)
+        delay (float): Atraso antes de disparar a alternativa; 0 dispara as duas juntas e
+            None desativa o hedging (a alternativa só roda se a principal falhar)
+        hedge_on (Tuple): Exceções da chamada principal que disparam a alternativa na hora;
+            outras exceções antes do atraso são repassadas ao chamador
+
+    Returns:
+        Tuple: (resultado, índice da chamada vencedora: 0 = principal, 1 = alternativa)
+
+    Raises:
+        Exception: A exceção da última chamada concluída, se nenhuma tiver sucesso
+    """
+    futures = [executor.submit(primary)]
+    index = {futures[0]: 0}
+
+    done, _ = wait(futures, timeout=delay)
+    if done:
+        error = futures[0].exception()
+        if error is None:
+            return futures[0].result(), 0
+        if not isinstance(error, hedge_on):
+            raise error
+        logger.debug(f"Chamada principal falhou ({error}); disparando a alternativa")
+    else:
+        logger.debug(f"Chamada principal sem resposta após {delay}s; disparando a alternativa em paralelo")
+
+    second = executor.submit(fallback)
+    futures.append(second)
+    index[second] = 1
+
+    # A principal pode ter terminado entre o fim da espera e o disparo da alternativa:
+    # confere primeiro as que já terminaram, e só espera as restantes
+    last_error = None
+    pending = set()
+    for future in futures:
+        if not future.done():
+            pending.add(future)
+            continue
+        error = future.exception()
+        if error is None:
+            for other in futures:
+                if other is not future:
+                    other.cancel()
+            return future.result(), index[future]
+        last_error = error
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                # A perdedora não pode ser interrompida no meio da requisição; seu resultado é descartado
+                for other in pending:
+                    other.cancel()
+                return future.result(), index[future]
+            last_error = error
+
+    raise last_error
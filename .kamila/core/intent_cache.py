@@ -0,0 +1,74 @@
+"""
+Intent Cache - Cache LRU de Intenções para Kamila
+Guarda o resultado (intenção, confiança) de comandos já normalizados para que
+comandos repetidos não passem de novo pela avaliação dos padrões.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class IntentCache:
+    """Cache LRU limitado, com expiração opcional (TTL) e contadores de acerto."""
+
+    def __init__(self, max_size: int = 256, ttl: Optional[float] = None):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_size (int): Número máximo de comandos guardados (0 desativa o cache)
+            ttl (float): Tempo de vida de cada entrada em segundos (None = sem expiração)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Tuple[Optional[str], float], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[Optional[str], float]]:
+        """Retorna o resultado guardado para o comando ou None se não houver."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if self.ttl is None or time.monotonic() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Tuple[Optional[str], float]):
+        """Guarda o resultado de um comando, descartando o menos usado se necessário."""
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Invalida todas as entradas (os contadores são mantidos)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de uso do cache."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl
+            }
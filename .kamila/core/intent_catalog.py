@@ -0,0 +1,211 @@
+"""
+Intent Catalog - Catálogo de Intenções Externo para Kamila
+Carrega as intenções de um arquivo de dados (JSON ou YAML), mantém em disco um
+cache do índice compilado indexado pelo hash do conteúdo (e do código que o
+compila) e observa o arquivo
+para recarregar o catálogo sem reiniciar a assistente.
+"""
+
+import os
+import glob
+import functools
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+# Arquivo padrão do catálogo e diretório do cache compilado
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'intents.json')
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache')
+
+# Incrementar quando a estrutura do índice compilado mudar (invalida caches antigos)
+CACHE_FORMAT_VERSION = 2
+
+# Módulos que geram os objetos gravados no cache; o hash do código-fonte deles entra
+# na chave, para que qualquer alteração no compilador invalide os caches antigos
+COMPILER_MODULES = (
+    'intent_catalog.py',
+    'interpreter.py',
+    'intent_matcher.py',
+    'fuzzy_matcher.py',
+    'suggestion_trie.py',
+)
+
+
+class CompiledCatalog:
+    """Intenções e todos os índices derivados delas, trocados juntos em uma única atribuição."""
+
+    def __init__(self, intents: Dict[str, Dict[str, Any]], matcher, fuzzy, suggestions, digest: str = ""):
+        self.intents = intents
+        self.matcher = matcher
+        self.fuzzy = fuzzy
+        self.suggestions = suggestions
+        self.digest = digest
+
+
+def read_catalog_file(path: str) -> Tuple[Dict[str, Dict[str, Any]], str]:
+    """
+    Lê o arquivo de intenções.
+
+    Returns:
+        Tuple: (intenções, hash SHA-256 do conteúdo)
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    digest = hashlib.sha256(content).hexdigest()
+    text = content.decode('utf-8')
+
+    if path.endswith(('.yaml', '.yml')):
+        if not YAML_AVAILABLE:
+            raise ValueError("PyYAML não instalado; use um catálogo em JSON ou instale pyyaml.")
+        intents = yaml.safe_load(text)
+    else:
+        intents = json.loads(text)
+
+    if not isinstance(intents, dict):
+        raise ValueError(f"Catálogo de intenções inválido em {path}: esperado um objeto por intenção.")
+
+    for name, data in intents.items():
+        if not isinstance(data, dict) or not isinstance(data.get("patterns"), list):
+            raise ValueError(f"Intenção '{name}' sem lista de 'patterns' em {path}.")
+        data.setdefault("responses", [])
+        data.setdefault("context", "general")
+
+    return intents, digest
+
+
+@functools.lru_cache(maxsize=1)
+def compiler_fingerprint() -> str:
+    """Hash do código-fonte dos módulos que compilam o catálogo."""
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    hasher = hashlib.sha256()
+    for name in COMPILER_MODULES:
+        hasher.update(name.encode('utf-8'))
+        try:
+            with open(os.path.join(module_dir, name), 'rb') as f:
+                hasher.update(f.read())
+        except OSError:
+            hasher.update(b'<ausente>')
+    return hasher.hexdigest()
+
+
+def _cache_path(path: str, digest: str, cache_dir: str) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    code = compiler_fingerprint()[:12]
+    return os.path.join(cache_dir, f"{stem}-v{CACHE_FORMAT_VERSION}-{code}-{digest[:16]}.pkl")
+
+
+def load_compiled_catalog(path: str, build: Callable[[Dict[str, Dict[str, Any]]], CompiledCatalog],
+                          cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> CompiledCatalog:
+    """
+    Carrega o catálogo compilado, usando o cache em disco quando o conteúdo não mudou.
+
+    Args:
+        path (str): Arquivo de intenções (JSON ou YAML)
+        build (Callable): Compila as intenções lidas em um CompiledCatalog
+        cache_dir (str): Diretório do cache compilado (None desativa o cache)
+    """
+    intents, digest = read_catalog_file(path)
+
+    cache_file = _cache_path(path, digest, cache_dir) if cache_dir else None
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                catalog = pickle.load(f)
+            if isinstance(catalog, CompiledCatalog) and catalog.digest == digest and all(
+                    hasattr(catalog, name) for name in ("intents", "matcher", "fuzzy", "suggestions")):
+                logger.info(f" Catálogo de intenções carregado do cache ({len(catalog.intents)} intenções)")
+                return catalog
+        except Exception as e:
+            logger.warning(f" Cache do catálogo inválido, recompilando: {e}")
+
+    catalog = build(intents)
+    catalog.digest = digest
+
+    if cache_file:
+        _write_cache(catalog, cache_file)
+
+    logger.info(f" Catálogo de intenções compilado ({len(catalog.intents)} intenções)")
+    return catalog
+
+
+def _write_cache(catalog: CompiledCatalog, cache_file: str):
+    """Grava o cache de forma atômica e remove versões antigas do mesmo catálogo."""
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(temp_file, 'wb') as f:
+            pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+
+        stem = os.path.basename(cache_file).split('-v')[0]
+        for stale in glob.glob(os.path.join(os.path.dirname(cache_file), f"{stem}-v*.pkl")):
+            if stale != cache_file:
+                os.remove(stale)
+
+    except Exception as e:
+        logger.warning(f" Não foi possível gravar o cache do catálogo: {e}")
+
+
+class CatalogWatcher:
+    """Observa o arquivo do catálogo (por polling) e chama `on_change` quando ele é alterado."""
+
+    def __init__(self, path: str, on_change: Callable[[], None], interval: float = 2.0):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._signature = self._stat()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def start(self):
+        """Inicia a observação em uma thread daemon."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self._thread.start()
+        logger.info(f" Observando alterações em {self.path}")
+
+    def stop(self):
+        """Para a observação."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
+
+    def check(self) -> bool:
+        """Verifica o arquivo uma vez; retorna True se uma alteração foi tratada."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+
+        self._signature = signature
+        try:
+            self.on_change()
+        except Exception as e:
+            logger.error(f" Erro ao recarregar o catálogo de intenções: {e}")
+        return True
+
+    def _watch_loop(self):
+        while not self._stop.wait(self.interval):
+            self.check()
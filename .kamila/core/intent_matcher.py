@@ -0,0 +1,419 @@
+"""
+Intent Matcher - Motor de Correspondência de Intenções para Kamila
+Compila os padrões de todas as intenções uma única vez e avalia o comando
+em uma só passada, mantendo a mesma pontuação de confiança do interpretador.
+
+Antes de avaliar as regex, um índice invertido (palavra -> padrões) e um
+autômato Aho-Corasick sobre os literais obrigatórios de cada padrão descartam
+os padrões que não têm como pontuar, de modo que o custo por comando não cresce
+com o tamanho do catálogo.
+"""
+
+import re
+import time
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Any
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+# Extrai palavras de padrões e comandos (mesma regra usada no cálculo de cobertura)
+WORD_RE = re.compile(r'\w+')
+
+# Limite de alternativas literais enumeradas por trecho de um padrão
+MAX_LITERAL_ALTERNATIVES = 32
+
+
+def _alternatives(items, limit: int = MAX_LITERAL_ALTERNATIVES, spaces: bool = False) -> Optional[Set[str]]:
+    """
+    Enumera as strings que uma sequência regex pode casar, se o conjunto for finito e pequeno.
+
+    Retorna None quando a sequência contém construções abertas (`.*`, `\\s+`, classes etc.).
+    Com `spaces=True`, `\\s`, `\\s+` e `\\s*` são tratados como um espaço simples, o que
+    permite gerar frases de exemplo a partir dos padrões.
+    """
+    results = {""}
+    for op, av in items:
+        options = _node_alternatives(str(op), av, limit, spaces)
+        if options is None:
+            return None
+        results = {prefix + option for prefix in results for option in options}
+        if len(results) > limit:
+            return None
+    return results
+
+
+def _is_space_class(items) -> bool:
+    """Indica se a sequência é exatamente `\\s`."""
+    return len(items) == 1 and str(items[0][0]) == "IN" and \
+        [str(value) for _, value in items[0][1]] == ["CATEGORY_SPACE"]
+
+
+def _node_alternatives(op: str, av, limit: int = MAX_LITERAL_ALTERNATIVES, spaces: bool = False) -> Optional[Set[str]]:
+    """Enumera as strings de um único nó da árvore de parsing."""
+    if op == "LITERAL":
+        return {chr(av)}
+    if op in ("AT", "ASSERT", "ASSERT_NOT"):
+        # Âncoras e lookarounds não consomem texto
+        return {""}
+    if op == "SUBPATTERN":
+        return _alternatives(av[-1], limit, spaces)
+    if op == "BRANCH":
+        options: Set[str] = set()
+        for branch in av[1]:
+            branch_options = _alternatives(branch, limit, spaces)
+            if branch_options is None:
+                return None
+            options |= branch_options
+        return options
+    if op == "IN":
+        if spaces and _is_space_class([(op, av)]):
+            return {" "}
+        if all(str(item_op) == "LITERAL" for item_op, _ in av):
+            return {chr(code) for _, code in av}
+        return None
+    if op in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"):
+        minimum, maximum, item = av
+        if maximum == 0:
+            return {""}
+        if spaces and _is_space_class(item):
+            return {" "}
+        if maximum == 1:
+            options = _alternatives(item, limit, spaces)
+            if options is None:
+                return None
+            return options | {""} if minimum == 0 else options
+    return None
+
+
+def expand_pattern(source: str, limit: int = 64) -> List[str]:
+    """
+    Gera as frases de exemplo descritas por um padrão (ex.: `(diminuir|baixar) (brilho|luz)`
+    gera "diminuir brilho", "baixar luz" etc.).
+
+    Padrões com trechos abertos (`.*`, `(.*)`) ou com mais de `limit` combinações não
+    descrevem frases completas e retornam uma lista vazia.
+    """
+    try:
+        options = _alternatives(sre_parse.parse(source), limit, spaces=True)
+    except Exception:
+        return []
+    if not options:
+        return []
+    return sorted(" ".join(option.split()) for option in options if option.strip())
+
+
+def _minimal(options: Iterable[str]) -> FrozenSet[str]:
+    """Remove alternativas que contêm outra alternativa (basta encontrar a menor)."""
+    ordered = sorted(set(options), key=len)
+    kept: List[str] = []
+    for option in ordered:
+        if not any(shorter in option for shorter in kept):
+            kept.append(option)
+    return frozenset(kept)
+
+
+def required_literals(source: str) -> List[FrozenSet[str]]:
+    """
+    Extrai os literais obrigatórios de um padrão.
+
+    Retorna uma lista de grupos: para a regex casar, o comando precisa conter ao
+    menos uma string de cada grupo (ex.: `(diminuir|reduzir) (brilho|luz)` gera
+    um único grupo com as combinações). Padrões abertos como `(.*)` podem não ter
+    nenhum grupo; esses são tratados como "curingas" e avaliados sempre que o
+    índice de palavras os seleciona.
+    """
+    try:
+        parsed = sre_parse.parse(source)
+    except Exception:
+        return []
+
+    groups: List[FrozenSet[str]] = []
+    run: Optional[Set[str]] = {""}
+
+    def close_run():
+        if run and "" not in run:
+            groups.append(_minimal(option.casefold() for option in run))
+
+    for op, av in parsed:
+        options = _node_alternatives(str(op), av)
+        if options is not None and run is not None:
+            combined = {prefix + option for prefix in run for option in options}
+            if len(combined) <= MAX_LITERAL_ALTERNATIVES:
+                run = combined
+                continue
+        close_run()
+        # Inicia um novo trecho a partir deste nó (se ele for finito)
+        run = options if options is not None and len(options) <= MAX_LITERAL_ALTERNATIVES else {""}
+
+        # Repetições como `(abc)+` ainda exigem ao menos uma ocorrência do item
+        if options is None and str(op) in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") and av[0] >= 1:
+            item_options = _alternatives(av[2])
+            if item_options and "" not in item_options:
+                groups.append(_minimal(option.casefold() for option in item_options))
+
+    close_run()
+    return groups
+
+
+class AhoCorasick:
+    """Autômato Aho-Corasick: encontra todos os literais presentes em um texto em uma só varredura."""
+
+    def __init__(self, words: Iterable[str]):
+        """Constrói a trie de literais e os links de falha."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[str, ...]] = [()]
+
+        for word in words:
+            self._insert(word)
+        self._build_failure_links()
+
+    def _insert(self, word: str):
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if word not in self._output[state]:
+            self._output[state] += (word,)
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """Retorna o conjunto de literais que aparecem em `text`."""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class CompiledPattern:
+    """Padrão de uma intenção já compilado, com seu conjunto de palavras pré-calculado."""
+
+    __slots__ = ("intent", "source", "regex", "words", "requirements")
+
+    def __init__(self, intent: str, source: str, regex):
+        self.intent = intent
+        self.source = source
+        self.regex = regex
+        self.words = frozenset(WORD_RE.findall(source))
+        self.requirements = required_literals(source)
+
+    @property
+    def is_catch_all(self) -> bool:
+        """Padrões sem literal obrigatório (ex.: `(.*)`) não podem ser podados pelo autômato."""
+        return not self.requirements
+
+
+class IntentMatcher:
+    """
+    Avalia todas as intenções em uma única passada sobre os padrões compilados.
+
+    A confiança de uma intenção é a maior cobertura entre seus padrões que têm
+    correspondência no comando: |palavras do padrão ∩ palavras do comando| / |palavras do padrão|.
+    """
+
+    def __init__(self, intents: Dict[str, Dict[str, Any]], use_index: bool = True):
+        """Compila os padrões do catálogo de intenções."""
+        self.patterns: List[CompiledPattern] = []
+        self.intent_order: Dict[str, int] = {}
+        self.use_index = use_index
+
+        # IntentProfiler opcional (instrumentação por padrão; None = caminho rápido)
+        self.profiler = None
+
+        # Índices invertidos palavra -> posições e literal obrigatório -> posições
+        self._word_index: Dict[str, List[int]] = {}
+        self._literal_index: Dict[str, List[int]] = {}
+        self._catch_all: FrozenSet[int] = frozenset()
+        self._automaton = AhoCorasick([])
+
+        for name, data in intents.items():
+            self._add_intent(name, data.get("patterns", []))
+        self._build_index()
+
+    def _add_intent(self, name: str, patterns: List[str]):
+        """Compila os padrões de uma intenção; padrões inválidos são ignorados."""
+        if name not in self.intent_order:
+            self.intent_order[name] = len(self.intent_order)
+
+        for source in patterns:
+            try:
+                regex = re.compile(source, re.IGNORECASE)
+            except re.error as e:
+                logger.debug(f"Erro no padrão {source}: {e}")
+                continue
+
+            compiled = CompiledPattern(name, source, regex)
+            if not compiled.words:
+                # Sem palavras o padrão nunca pontua; não há por que avaliá-lo
+                logger.debug(f"Padrão sem palavras ignorado: {source}")
+                continue
+            self.patterns.append(compiled)
+
+        # Mantém a lista ordenada pelo catálogo para preservar o desempate original
+        self.patterns.sort(key=lambda p: self.intent_order[p.intent])
+
+    def _build_index(self):
+        """Reconstrói o índice invertido de palavras e o autômato de literais."""
+        word_index: Dict[str, List[int]] = {}
+        literal_index: Dict[str, List[int]] = {}
+        literals: Set[str] = set()
+        catch_all: List[int] = []
+
+        for position, pattern in enumerate(self.patterns):
+            for word in pattern.words:
+                word_index.setdefault(word, []).append(position)
+            if pattern.is_catch_all:
+                catch_all.append(position)
+                continue
+            for group in pattern.requirements:
+                literals.update(group)
+            # Basta indexar o primeiro grupo; os demais são conferidos na seleção
+            for literal in pattern.requirements[0]:
+                literal_index.setdefault(literal, []).append(position)
+
+        self._word_index = word_index
+        self._literal_index = literal_index
+        self._catch_all = frozenset(catch_all)
+        self._automaton = AhoCorasick(literals)
+
+        if catch_all:
+            sources = [self.patterns[position].source for position in catch_all]
+            logger.debug(f"Padrões sem literal obrigatório (podados só pelo índice de palavras): {sources}")
+
+    def add_intent(self, name: str, patterns: List[str]):
+        """Adiciona (ou substitui) uma intenção no conjunto compilado."""
+        if name in self.intent_order:
+            self.patterns = [p for p in self.patterns if p.intent != name]
+        self._add_intent(name, patterns)
+        self._build_index()
+
+    def candidates(self, command: str, command_words: Optional[Set[str]] = None) -> List[CompiledPattern]:
+        """
+        Retorna os padrões que ainda podem pontuar para o comando, na ordem do catálogo.
+
+        A poda é exata: um padrão sem nenhuma palavra em comum com o comando teria
+        cobertura zero, e um padrão cujo grupo de literais obrigatórios não aparece
+        no comando não tem como casar.
+        """
+        if command_words is None:
+            command_words = set(WORD_RE.findall(command))
+        if not self.use_index:
+            return self.patterns
+
+        by_word: Set[int] = set()
+        for word in command_words:
+            by_word.update(self._word_index.get(word, ()))
+        if not by_word:
+            return []
+
+        found = self._automaton.find(command.casefold())
+        by_literal: Set[int] = set(self._catch_all)
+        for literal in found:
+            by_literal.update(self._literal_index.get(literal, ()))
+
+        selected = []
+        for position in sorted(by_word & by_literal):
+            pattern = self.patterns[position]
+            if all(not group.isdisjoint(found) for group in pattern.requirements[1:]):
+                selected.append(pattern)
+        return selected
+
+    def candidate_intents(self, command: str) -> List[str]:
+        """Retorna as intenções que passam pelo pré-filtro (útil para depuração)."""
+        seen: Dict[str, None] = {}
+        for pattern in self.candidates(command):
+            seen.setdefault(pattern.intent, None)
+        return list(seen)
+
+    def __getstate__(self):
+        # O profiler pertence à sessão atual; não vai para o cache do catálogo
+        state = self.__dict__.copy()
+        state["profiler"] = None
+        return state
+
+    def score(self, command: str) -> Dict[str, float]:
+        """Calcula a confiança de cada intenção com ao menos um padrão correspondente."""
+        if self.profiler is not None:
+            return self._score_profiled(command)[0]
+
+        command_words = set(WORD_RE.findall(command))
+        scores: Dict[str, float] = {}
+
+        for pattern in self.candidates(command, command_words):
+            if not pattern.regex.search(command):
+                continue
+            coverage = len(pattern.words & command_words) / len(pattern.words)
+            if coverage > scores.get(pattern.intent, 0.0):
+                scores[pattern.intent] = coverage
+
+        return scores
+
+    def _score_profiled(self, command: str) -> Tuple[Dict[str, float], Dict[str, CompiledPattern]]:
+        """Mesmo cálculo de `score`, cronometrando cada regex; retorna também o padrão de cada pontuação."""
+        profiler = self.profiler
+        command_words = set(WORD_RE.findall(command))
+        scores: Dict[str, float] = {}
+        sources: Dict[str, CompiledPattern] = {}
+
+        for pattern in self.candidates(command, command_words):
+            start = time.perf_counter_ns()
+            matched = pattern.regex.search(command) is not None
+            profiler.record_evaluation(pattern, time.perf_counter_ns() - start, matched, command)
+            if not matched:
+                continue
+            coverage = len(pattern.words & command_words) / len(pattern.words)
+            if coverage > scores.get(pattern.intent, 0.0):
+                scores[pattern.intent] = coverage
+                sources[pattern.intent] = pattern
+
+        return scores, sources
+
+    def best(self, command: str) -> Tuple[Optional[str], float]:
+        """Retorna a intenção de maior confiança (empates favorecem a ordem do catálogo)."""
+        best_intent = None
+        best_confidence = 0.0
+
+        profiler = self.profiler
+        if profiler is not None:
+            scores, sources = self._score_profiled(command)
+        else:
+            scores = self.score(command)
+
+        # `score` preserva a ordem do catálogo, então o primeiro máximo estrito vence
+        for intent, confidence in scores.items():
+            if confidence > best_confidence:
+                best_confidence = confidence
+                best_intent = intent
+
+        if profiler is not None and best_intent is not None:
+            profiler.record_win(sources[best_intent])
+
+        return best_intent, best_confidence
@@ -0,0 +1,171 @@
+"""
+Intent Profiler - Instrumentação dos Padrões de Intenção para Kamila
+Registra, por padrão do catálogo, o tempo de avaliação da regex, quantas vezes
+ela foi avaliada, casou e venceu. Serve para podar padrões mortos e encontrar
+padrões caros (ex.: capturas `(.*)` com retrocesso excessivo).
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PatternStats:
+    """Contadores de um padrão."""
+
+    __slots__ = ("intent", "source", "evaluations", "matches", "wins",
+                 "total_ns", "max_ns", "slowest_command", "catch_all")
+
+    def __init__(self, intent: str, source: str, catch_all: bool = False):
+        self.intent = intent
+        self.source = source
+        self.evaluations = 0
+        self.matches = 0
+        self.wins = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.slowest_command: Optional[str] = None
+        self.catch_all = catch_all
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "intent": self.intent,
+            "pattern": self.source,
+            "evaluations": self.evaluations,
+            "matches": self.matches,
+            "wins": self.wins,
+            "total_us": round(self.total_ns / 1000.0, 2),
+            "mean_us": round(self.total_ns / self.evaluations / 1000.0, 2) if self.evaluations else 0.0,
+            "max_us": round(self.max_ns / 1000.0, 2),
+            "slowest_command": self.slowest_command,
+            "catch_all": self.catch_all,
+        }
+
+
+class IntentProfiler:
+    """Acumula estatísticas por padrão e por comando (ativado sob demanda)."""
+
+    def __init__(self, callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Inicializa o profiler.
+
+        Args:
+            callback (Callable): Recebe um evento (dict) por comando interpretado,
+                para envio a um sistema de métricas
+        """
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Zera todas as estatísticas."""
+        with self._lock:
+            self._patterns: Dict[Tuple[str, str], PatternStats] = {}
+            self._commands = 0
+            self._evaluations = 0
+            self._fuzzy_fallbacks = 0
+            self._fuzzy_wins = 0
+            self._unmatched = 0
+            self._total_ns = 0
+
+    def _stats(self, pattern) -> PatternStats:
+        key = (pattern.intent, pattern.source)
+        stats = self._patterns.get(key)
+        if stats is None:
+            stats = self._patterns[key] = PatternStats(pattern.intent, pattern.source, pattern.is_catch_all)
+        return stats
+
+    def record_evaluation(self, pattern, elapsed_ns: int, matched: bool, command: str):
+        """Registra uma avaliação de regex (chamado pelo IntentMatcher)."""
+        with self._lock:
+            stats = self._stats(pattern)
+            stats.evaluations += 1
+            stats.matches += matched
+            stats.total_ns += elapsed_ns
+            if elapsed_ns > stats.max_ns:
+                stats.max_ns = elapsed_ns
+                stats.slowest_command = command
+        self._local.evaluated = getattr(self._local, "evaluated", 0) + 1
+
+    def record_win(self, pattern):
+        """Registra o padrão que definiu a intenção vencedora."""
+        with self._lock:
+            self._stats(pattern).wins += 1
+        self._local.winner = pattern.source
+
+    def record_command(self, command: str, intent: Optional[str], confidence: float,
+                       elapsed_ns: int, fuzzy_fallback: bool = False, fuzzy_win: bool = False):
+        """Fecha o registro de um comando e notifica o callback de métricas."""
+        evaluated = getattr(self._local, "evaluated", 0)
+        winner = getattr(self._local, "winner", None)
+        self._local.evaluated, self._local.winner = 0, None
+
+        with self._lock:
+            self._commands += 1
+            self._evaluations += evaluated
+            self._fuzzy_fallbacks += fuzzy_fallback
+            self._fuzzy_wins += fuzzy_win
+            self._unmatched += intent is None
+            self._total_ns += elapsed_ns
+
+        if self.callback:
+            event = {
+                "command": command,
+                "intent": intent,
+                "confidence": confidence,
+                "elapsed_us": round(elapsed_ns / 1000.0, 2),
+                "patterns_evaluated": evaluated,
+                "winning_pattern": None if fuzzy_win else winner,
+                "fuzzy": fuzzy_win,
+            }
+            try:
+                self.callback(event)
+            except Exception as e:
+                logger.error(f" Erro no callback de métricas: {e}")
+
+    def get_report(self, patterns: Iterable = (), slow_threshold_us: float = 500.0) -> Dict[str, Any]:
+        """
+        Monta o relatório.
+
+        Args:
+            patterns (Iterable): Padrões compilados do catálogo; os que nunca foram
+                avaliados também aparecem (com contadores zerados)
+            slow_threshold_us (float): Tempo máximo de uma avaliação para marcar o padrão como lento
+
+        Returns:
+            Dict: Resumo, padrões ordenados por tempo total, padrões mortos e lentos
+        """
+        with self._lock:
+            for pattern in patterns:
+                self._stats(pattern)
+            rows = [stats.to_dict() for stats in self._patterns.values()]
+            commands = self._commands
+            summary = {
+                "commands": commands,
+                "regex_evaluations": self._evaluations,
+                "evaluations_per_command": round(self._evaluations / commands, 2) if commands else 0.0,
+                "mean_us": round(self._total_ns / commands / 1000.0, 2) if commands else 0.0,
+                "fuzzy_fallbacks": self._fuzzy_fallbacks,
+                "fuzzy_wins": self._fuzzy_wins,
+                "unmatched": self._unmatched,
+            }
+
+        rows.sort(key=lambda row: row["total_us"], reverse=True)
+        return {
+            "summary": summary,
+            "patterns": rows,
+            "dead_patterns": [row["pattern"] for row in rows if row["matches"] == 0],
+            "slow_patterns": [row["pattern"] for row in rows if row["max_us"] > slow_threshold_us],
+        }
+
+    def export_json(self, path: str, patterns: Iterable = ()) -> Dict[str, Any]:
+        """Grava o relatório em JSON e o retorna."""
+        report = self.get_report(patterns)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f" Relatório de profiling salvo em {path}")
+        return report
@@ -8,25 +8,62 @@ import os
 import re
 import logging
 import json
-from typing import Dict, List, Optional, Tuple, Any
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 
+from .intent_matcher import IntentMatcher, expand_pattern
+from .fuzzy_matcher import FuzzyIntentIndex
+from .suggestion_trie import SuggestionTrie
+from .intent_cache import IntentCache
+from .intent_profiler import IntentProfiler
+from .intent_catalog import (
+    CatalogWatcher, CompiledCatalog, DEFAULT_CACHE_DIR, DEFAULT_CATALOG_PATH,
+    load_compiled_catalog
+)
 
 # Carregar variáveis de ambiente
 load_dotenv('.kamila/.env')
 
 logger = logging.getLogger(__name__)
 
+# Palavras de preenchimento removidas na normalização
+FILLER_WORDS = ['por favor', 'por gentileza', 'você pode', 'me diz', 'me fala']
+
 class CommandInterpreter:
     """Interpreta comandos de voz e identifica intenções."""
 
-    def __init__(self):
-        """Inicializa o interpretador de comandos."""
+    def __init__(self, cache_size: int = 256, cache_ttl: Optional[float] = None, fuzzy_matching: bool = True,
+                 catalog_path: Optional[str] = None, catalog_cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
+        """
+        Inicializa o interpretador de comandos.
+
+        Args:
+            cache_size (int): Comandos normalizados mantidos no cache de intenções (0 desativa)
+            cache_ttl (float): Validade das entradas do cache em segundos (None = sem expiração)
+            fuzzy_matching (bool): Usa correspondência aproximada quando as regex não atingem o limiar
+            catalog_path (str): Arquivo de intenções (JSON/YAML); padrão: core/intents.json
+            catalog_cache_dir (str): Diretório do cache do catálogo compilado (None desativa)
+        """
         logger.info(" Inicializando Command Interpreter...")
 
-        # Dicionário de intenções e padrões
-        self.intents = self._load_intents()
+        self.catalog_path = catalog_path or os.getenv('KAMILA_INTENTS_FILE', DEFAULT_CATALOG_PATH)
+        self.catalog_cache_dir = catalog_cache_dir
+        self.fuzzy_matching = fuzzy_matching
+
+        # Intenções adicionadas em tempo de execução (reaplicadas a cada recarga do catálogo)
+        self._custom_intents: Dict[str, Dict[str, Any]] = {}
+        self._watcher = None
+
+        # Instrumentação por padrão (desativada por padrão; ver enable_profiling)
+        self._profiler: Optional[IntentProfiler] = None
+
+        # Intenções e índices compilados (padrões, índice aproximado e trie de sugestões)
+        self._catalog = self._load_catalog()
+
+        # Cache de comando normalizado -> (intenção, confiança)
+        self._cache = IntentCache(max_size=cache_size, ttl=cache_ttl)
 
         # Configurações
         self.confidence_threshold = 0.7
@@ -35,297 +72,128 @@ class CommandInterpreter:
         # Contexto atual
         self.current_context = "general"
 
+        # Estado da interpretação incremental (interpret_partial)
+        self._partial_command = None
+        self._partial_result: Tuple[Optional[str], float] = (None, 0.0)
+
         logger.info(" Command Interpreter inicializado com sucesso!")
 
-    def _load_intents(self) -> Dict[str, Dict[str, Any]]:
-        """Carrega definições de intenções."""
-        intents = {
-            "greeting": {
-                "patterns": [
-                    r"(oi|olá|bom dia|boa tarde|boa noite|e aí|eai|opa)( kamila| kammy)?",
-                    r"kamila, (oi|olá|bom dia|boa tarde|boa noite)",
-                    r"(iniciar|ligar|ativar) (a |kamila|assistente)"
-                ],
-                "responses": [
-                    "Olá! Como posso ajudar?",
-                    "Oi! Estou aqui para ajudar!",
-                    "Olá! O que você precisa?",
-                    "Oi! Pronto para ajudar!"
-                ],
-                "context": "general"
-            },
-            "goodbye": {
-                "patterns": [
-                    r"(tchau|adeus|até logo|até mais|até depois)",
-                    r"(desligar|encerrar|sair|parar) (a |kamila|assistente)",
-                    r"kamila, (tchau|adeus|até logo)"
-                ],
-                "responses": [
-                    "Tchau! Foi bom conversar com você!",
-                    "Até logo! Me chame quando precisar!",
-                    "Tchau! Estarei aqui se precisar de ajuda!"
-                ],
-                "context": "general"
-            },
-            "time": {
-                "patterns": [
-                    r"que horas",
-                    r"hora atual",
-                    r"me diz a hora",
-                    r"qual.*hora",
-                    r"que.*horas"
-                ],
-                "responses": [
-                    "Agora são {time}.",
-                    "São {time} no momento."
-                ],
-                "context": "general"
-            },
-            "date": {
-                "patterns": [
-                    r"(que dia é hoje|qual é a data|data de hoje)",
-                    r"kamila, (que dia é hoje|qual é a data)"
-                ],
-                "responses": [
-                    "Hoje é {date}.",
-                    "A data de hoje é {date}."
-                ],
-                "context": "general"
-            },
-            "weather": {
-                "patterns": [
-                    r"(como está o tempo|qual é a previsão|previsão do tempo)",
-                    r"(clima|temperatura) (hoje|agora)",
-                    r"kamila, (como está o tempo|previsão do tempo)"
-                ],
-                "responses": [
-                    "Vou verificar a previsão do tempo para você.",
-                    "Deixe-me checar como está o clima."
-                ],
-                "context": "general"
-            },
-            "help": {
-                "patterns": [
-                    r"(ajuda|help|o que você faz|como funciona)",
-                    r"(quais são seus comandos|o que você sabe fazer)",
-                    r"kamila, (ajuda|help|o que você faz)"
-                ],
-                "responses": [
-                    "Posso ajudar com várias coisas! Pergunte sobre hora, data, clima, ou apenas converse comigo!",
-                    "Estou aqui para ajudar! Posso responder perguntas sobre hora, data, clima e muito mais!"
-                ],
-                "context": "general"
-            },
-            "status": {
-                "patterns": [
-                    r"(como você está|está tudo bem|como vai)",
-                    r"(status|estado|condição)",
-                    r"kamila, (como você está|está tudo bem)"
-                ],
-                "responses": [
-                    "Estou ótima! Pronta para ajudar!",
-                    "Tudo bem por aqui! E você?",
-                    "Estou funcionando perfeitamente!"
-                ],
-                "context": "general"
-            },
-            "music": {
-                "patterns": [
-                    r"(tocar música|colocar música|reproduzir)",
-                    r"(música|canção|som)",
-                    r"kamila, (tocar|colocar) (música|uma música)"
-                ],
-                "responses": [
-                    "Vou tocar uma música para você!",
-                    "Que tal ouvirmos uma música?"
-                ],
-                "context": "entertainment"
-            },
-            "lights": {
-                "patterns": [
-                    r"(acender|apagar|ligar|desligar) (a luz|luz|luzes)",
-                    r"(luz|luzes) (on|off|ligada|desligada)",
-                    r"kamila, (acende|apaga|liga|desliga) (a luz|luz)"
-                ],
-                "responses": [
-                    "Controle de luzes ativado.",
-                    "Vou ajustar as luzes para você."
-                ],
-                "context": "smart_home"
-            },
-            "volume": {
-                "patterns": [
-                    r"(aumentar|diminuir|alterar) (o volume|volume)",
-                    r"(volume|falar) (mais alto|mais baixo)",
-                    r"kamila, (aumenta|diminui) (o volume|volume)"
-                ],
-                "responses": [
-                    "Ajustando o volume.",
-                    "Volume alterado com sucesso."
-                ],
-                "context": "audio"
-            },
-            "camera_monitor": {
-                "patterns": [
-                    r"(capturar|tirar|fotografar) (uma foto|foto|imagem)",
-                    r"(usar|abrir|ativar) (a câmera|câmera|webcam)",
-                    r"kamila, (captura|tira) (uma foto|foto)"
-                ],
-                "responses": [
-                    "Capturando imagem da câmera.",
-                    "Vou tirar uma foto para você."
-                ],
-                "context": "camera"
-            },
-            "start_monitoring": {
-                "patterns": [
-                    r"(iniciar|começar|ativar) (monitoramento|vigilância|monitor)",
-                    r"(ficar|vigiar|fiscalizar) (de olho|atenta|vigilante)",
-                    r"kamila, (inicia|começa) (monitoramento|vigilância)"
-                ],
-                "responses": [
-                    "Iniciando monitoramento de emergência.",
-                    "Vou ficar vigiando por convulsões ou quedas."
-                ],
-                "context": "health"
-            },
-            "stop_monitoring": {
-                "patterns": [
-                    r"(parar|encerrar|desativar) (monitoramento|vigilância|monitor)",
-                    r"(não|pare de) (vigiar|fiscalizar|monitorar)",
-                    r"kamila, (para|encerra) (monitoramento|vigilância)"
-                ],
-                "responses": [
-                    "Monitoramento de emergência parado.",
-                    "Parando vigilância."
-                ],
-                "context": "health"
-            },
-            "monitoring_status": {
-                "patterns": [
-                    r"(status|estado) (do monitoramento|da vigilância)",
-                    r"(está|como está) (monitorando|vigilando)",
-                    r"kamila, (status|estado) (do monitoramento|da vigilância)"
-                ],
-                "responses": [
-                    "Verificando status do monitoramento.",
-                    "Deixe-me checar como está a vigilância."
-                ],
-                "context": "health"
-            },
-            "clear_history": {
-                "patterns": [
-                    r"(limpar|apagar|deletar) (histórico|memória|conversas)",
-                    r"(esquecer|não lembrar) (do que falei|das conversas)",
-                    r"kamila, (limpa|apaga) (histórico|memória)"
-                ],
-                "responses": [
-                    "Limpando histórico de conversação.",
-                    "Histórico apagado com sucesso."
-                ],
-                "context": "privacy"
-            },
-            "health_protocol": {
-                "patterns": [
-                    r"(ativar|iniciar|ligar) (protocolo de saúde|protocolo emergência|modo saúde)",
-                    r"(preciso|me ajuda|socorro) (de saúde|emergência|médica)",
-                    r"kamila, (ativa|inicia) (protocolo de saúde|protocolo emergência)"
-                ],
-                "responses": [
-                    "Ativando protocolo de saúde completo.",
-                    "Protocolo de emergência ativado. Estou cuidando de tudo."
-                ],
-                "context": "health"
-            },
-            "dim_lights": {
-                "patterns": [
-                    r"(diminuir|reduzir|baixar) (brilho|luz|luzes)",
-                    r"(luz|luzes) (mais baixa|fraca|suave)",
-                    r"kamila, (diminui|reduz) (o brilho|brilho)"
-                ],
-                "responses": [
-                    "Diminuindo brilho para seu conforto.",
-                    "Brilho reduzido para um ambiente mais tranquilo."
-                ],
-                "context": "health"
-            },
-            "lower_volume": {
-                "patterns": [
-                    r"(diminuir|reduzir|baixar) (volume|som|áudio)",
-                    r"(volume|som) (mais baixo|baixo|suave)",
-                    r"kamila, (diminui|reduz) (o volume|volume)"
-                ],
-                "responses": [
-                    "Diminuindo volume do sistema.",
-                    "Volume reduzido para ambiente mais tranquilo."
-                ],
-                "context": "health"
-            },
-            "emergency_contact": {
-                "patterns": [
-                    r"(chamar|contatar|ligar) (contatos|emergência|socorro)",
-                    r"(notificar|avisar) (alguém|contatos|família)",
-                    r"kamila, (chama|contata) (emergência|socorro)"
-                ],
-                "responses": [
-                    "Notificando contatos de emergência.",
-                    "Ajuda está a caminho."
-                ],
-                "context": "health"
-            },
-            "record_crisis": {
-                "patterns": [
-                    r"(registrar|anotar|gravar) (crise|ataque|episódio)",
-                    r"(salvar|guardar) (detalhes|informações) (da crise|do episódio)",
-                    r"kamila, (registra|anota) (crise|ataque)"
-                ],
-                "responses": [
-                    "Registrando detalhes da crise.",
-                    "Vou anotar isso para seu médico."
-                ],
-                "context": "health"
-            },
-            "daily_checkin": {
-                "patterns": [
-                    r"(check-in|checkin|verificação) (diário|diária|do dia)",
-                    r"(como está|como foi) (seu dia|hoje)",
-                    r"kamila, (faz|me faz) (check-in|verificação)"
-                ],
-                "responses": [
-                    "Fazendo check-in diário de saúde.",
-                    "Como você está se sentindo hoje?"
-                ],
-                "context": "health"
-            },
-            "medication_reminder": {
-                "patterns": [
-                    r"(lembrete|lembrar) (de medicação|remédio|remédios)",
-                    r"(hora de tomar|tomar) (remédio|medicação)",
-                    r"kamila, (lembra|lembrete) (medicação|remédio)"
-                ],
-                "responses": [
-                    "Lembrete de medicação.",
-                    "É hora de tomar seus remédios."
-                ],
-                "context": "health"
-            },
-            "execute_on_pc": {
-                "patterns": [
-                    r"(?:abrir|abre|inicia|liga|roda)\s+(?:o|a|meu|minha)?\s*(.*)",
-                    r"(?:clica|clicar|aperte|aperta|digita|digite)\s+(?:em|no|na|o|a)?\s*(.*)",
-                    r"(?:mexe|mover|deslocar|arrastar)\s+(.*)",
-                    r"(?:pesquisar|busca|procurar)\s+(?:por)?\s*(.*)\s+(?:no navegador|no chrome|no windows)"
-                ],
-                "responses": [
-                    "Entendido, cuidando disso para você.",
-                    "Já estou indo mexer no computador. Um momento.",
-                    "Braços e pernas ativados! Vou fazer isso agora."
-                ],
-                "context": "operating_system"
-            }
-        }
+    @property
+    def intents(self) -> Dict[str, Dict[str, Any]]:
+        """Dicionário de intenções e padrões do catálogo atual."""
+        return self._catalog.intents
+
+    @property
+    def _matcher(self) -> IntentMatcher:
+        return self._catalog.matcher
+
+    @property
+    def _fuzzy(self) -> FuzzyIntentIndex:
+        return self._catalog.fuzzy
+
+    @property
+    def _suggestions(self) -> SuggestionTrie:
+        return self._catalog.suggestions
+
+    def _load_catalog(self) -> CompiledCatalog:
+        """Carrega o catálogo compilado (do cache em disco quando o arquivo não mudou)."""
+        try:
+            catalog = load_compiled_catalog(self.catalog_path, self._compile_catalog, self.catalog_cache_dir)
+        except Exception as e:
+            logger.error(f" Erro ao carregar intenções de {self.catalog_path}: {e}")
+            catalog = self._compile_catalog({})
+
+        for name, data in self._custom_intents.items():
+            self._add_to_catalog(catalog, name, data)
+        return catalog
+
+    def _compile_catalog(self, intents: Dict[str, Dict[str, Any]]) -> CompiledCatalog:
+        """Compila as intenções em todos os índices usados na interpretação."""
+        # Padrões compilados uma única vez para todas as intenções
+        matcher = IntentMatcher(intents)
+
+        # Índice aproximado sobre as frases de exemplo (tolerante a erros do STT)
+        fuzzy = FuzzyIntentIndex()
+        for name, data in intents.items():
+            fuzzy.add(name, self._example_phrases(data["patterns"]))
+
+        # Trie de exemplos para autocompletar (ranking por frequência de uso)
+        suggestions = SuggestionTrie()
+        for data in intents.values():
+            suggestions.insert(self._suggestion_examples(data["patterns"]))
+
+        return CompiledCatalog(intents, matcher, fuzzy, suggestions)
+
+    def _add_to_catalog(self, catalog: CompiledCatalog, name: str, data: Dict[str, Any]):
+        """Adiciona (ou substitui) uma intenção em um catálogo compilado."""
+        catalog.intents[name] = data
+        catalog.matcher.add_intent(name, data["patterns"])
+        catalog.fuzzy.remove_intent(name)
+        catalog.fuzzy.add(name, self._example_phrases(data["patterns"]))
+        catalog.suggestions.insert(self._suggestion_examples(data["patterns"]))
+
+    def reload_catalog(self):
+        """
+        Recompila o catálogo a partir do arquivo e o troca de forma atômica.
 
-        return intents
+        O catálogo novo é montado por completo antes da troca; interpretações em
+        andamento terminam com o catálogo antigo.
+        """
+        catalog = load_compiled_catalog(self.catalog_path, self._compile_catalog, self.catalog_cache_dir)
+        for name, data in self._custom_intents.items():
+            self._add_to_catalog(catalog, name, data)
+        catalog.matcher.profiler = self._profiler
+
+        self._catalog = catalog
+        self._cache.clear()
+        self.reset_partial()
+        logger.info(f" Catálogo de intenções recarregado: {len(catalog.intents)} intenções")
+
+    def enable_hot_reload(self, interval: float = 2.0):
+        """Observa o arquivo de intenções e recarrega o catálogo quando ele muda."""
+        if self._watcher is None:
+            self._watcher = CatalogWatcher(self.catalog_path, self.reload_catalog, interval)
+        self._watcher.start()
+
+    def disable_hot_reload(self):
+        """Para de observar o arquivo de intenções."""
+        if self._watcher:
+            self._watcher.stop()
+            self._watcher = None
+
+    def enable_profiling(self, callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> IntentProfiler:
+        """
+        Ativa a instrumentação por padrão (tempo de cada regex, correspondências e vitórias).
+
+        Args:
+            callback (Callable): Recebe um evento por comando interpretado (ex.: envio a métricas)
+
+        Returns:
+            IntentProfiler: Profiler ativo (estatísticas acumuladas desde a ativação)
+        """
+        self._profiler = IntentProfiler(callback)
+        self._catalog.matcher.profiler = self._profiler
+        # Comandos em cache não passariam pelos padrões
+        self._cache.clear()
+        logger.info(" Profiling de intenções ativado")
+        return self._profiler
+
+    def disable_profiling(self):
+        """Desativa a instrumentação e descarta as estatísticas acumuladas."""
+        self._profiler = None
+        self._catalog.matcher.profiler = None
+
+    def get_profiling_report(self, slow_threshold_us: float = 500.0) -> Dict[str, Any]:
+        """Relatório por padrão: tempo, avaliações, correspondências, vitórias, padrões mortos e lentos."""
+        if not self._profiler:
+            return {}
+        return self._profiler.get_report(self._matcher.patterns, slow_threshold_us)
+
+    def export_profiling_report(self, path: str) -> Dict[str, Any]:
+        """Grava o relatório de profiling em JSON."""
+        if not self._profiler:
+            return {}
+        return self._profiler.export_json(path, self._matcher.patterns)
 
     def interpret_command(self, command: str) -> Optional[str]:
         """
@@ -347,11 +215,12 @@ class CommandInterpreter:
             # Normalizar comando
             normalized_command = self._normalize_command(command)
 
-            # Buscar intenção
-            intent, confidence = self._find_best_intent(normalized_command)
+            # Buscar intenção (consultando o cache antes dos padrões)
+            intent, confidence = self._match(normalized_command)
 
             if intent and confidence >= self.confidence_threshold:
                 logger.info(f" Intenção identificada: {intent} (confiança: {confidence:.2f})")
+                self._suggestions.record_usage(normalized_command)
                 return intent
             else:
                 logger.debug(f" Intenção não reconhecida (melhor: {intent}, confiança: {confidence:.2f})")
@@ -361,6 +230,105 @@ class CommandInterpreter:
             logger.error(f" Erro ao interpretar comando: {e}")
             return None
 
+    def interpret_batch(self, commands: List[str], with_confidence: bool = False) -> List[Any]:
+        """
+        Interpreta uma lista de comandos de uma vez (ex.: transcrições gravadas em log).
+
+        A normalização é feita sobre o lote inteiro e cada comando distinto é avaliado
+        uma única vez. O lote não passa pelo cache de intenções, para que a reprodução
+        de logs extensos não descarte as entradas do uso ao vivo.
+
+        Args:
+            commands (List[str]): Comandos a serem interpretados
+            with_confidence (bool): Se True, retorna tuplas (intenção, confiança)
+
+        Returns:
+            List: Intenção (ou tupla) para cada comando, na mesma ordem
+        """
+        normalized_commands = self._normalize_batch(commands)
+
+        results: Dict[str, Tuple[Optional[str], float]] = {}
+        for normalized in normalized_commands:
+            if normalized and normalized not in results:
+                try:
+                    results[normalized] = self._find_best_intent(normalized)
+                except Exception as e:
+                    logger.error(f" Erro ao interpretar comando: {e}")
+                    results[normalized] = (None, 0.0)
+
+        output = []
+        for normalized in normalized_commands:
+            intent, confidence = results.get(normalized, (None, 0.0))
+            if not intent or confidence < self.confidence_threshold:
+                intent = None
+            output.append((intent, confidence) if with_confidence else intent)
+
+        logger.debug(f" Lote interpretado: {len(commands)} comandos ({len(results)} distintos)")
+        return output
+
+    def interpret_partial(self, prefix: str, final: bool = False) -> Optional[str]:
+        """
+        Interpreta incrementalmente uma transcrição parcial (STT em streaming).
+
+        Só reavalia quando chegam palavras completas novas: a última palavra é
+        ignorada enquanto o texto não terminar em espaço (a menos que `final=True`).
+        Permite disparar a ação ou a chamada ao LLM antes de o usuário terminar de falar.
+        Os prefixos intermediários não passam pelo cache de intenções, para não
+        descartar as entradas do uso ao vivo; só a transcrição final é cacheada.
+
+        Args:
+            prefix (str): Transcrição parcial acumulada até agora
+            final (bool): Indica que a transcrição está completa
+
+        Returns:
+            str: Intenção identificada até o momento ou None
+        """
+        try:
+            text = prefix or ""
+            if not final and text and not text[-1].isspace():
+                words = text.split()
+                text = text[:text.rstrip().rfind(words[-1])] if words else ""
+
+            normalized = self._normalize_command(text)
+            if normalized != self._partial_command or final:
+                self._partial_command = normalized
+                if not normalized:
+                    self._partial_result = (None, 0.0)
+                elif final:
+                    self._partial_result = self._match(normalized)
+                else:
+                    self._partial_result = self._find_best_intent(normalized)
+
+            intent, confidence = self._partial_result
+            if intent and confidence >= self.confidence_threshold:
+                return intent
+            return None
+
+        except Exception as e:
+            logger.error(f" Erro ao interpretar transcrição parcial: {e}")
+            return None
+
+    def reset_partial(self):
+        """Descarta o estado de interpret_partial (início de uma nova fala)."""
+        self._partial_command = None
+        self._partial_result = (None, 0.0)
+
+    def _normalize_batch(self, commands: List[str]) -> List[str]:
+        """Normaliza vários comandos aplicando cada etapa uma única vez sobre o lote inteiro."""
+        if not commands:
+            return []
+
+        # Uma linha por comando; as etapas abaixo nunca atravessam quebras de linha. Quebras
+        # dentro de um comando viram "\r": continuam sendo espaço em branco que não forma
+        # palavra de preenchimento, exatamente como em `_normalize_command`
+        joined = "\n".join((command or "").replace("\n", "\r") for command in commands)
+        joined = re.sub(r'[^\w\s]', ' ', joined.lower())
+
+        for word in FILLER_WORDS:
+            joined = joined.replace(word, '')
+
+        return [' '.join(line.split()) for line in joined.split("\n")]
+
     def _normalize_command(self, command: str) -> str:
         """Normaliza o comando para facilitar matching."""
         # Converter para minúsculas
@@ -370,8 +338,7 @@ class CommandInterpreter:
         normalized = re.sub(r'[^\w\s]', ' ', normalized)
 
         # Remover palavras de preenchimento comuns
-        filler_words = ['por favor', 'por gentileza', 'você pode', 'me diz', 'me fala']
-        for word in filler_words:
+        for word in FILLER_WORDS:
             normalized = normalized.replace(word, '')
 
         # Remover espaços extras
@@ -379,22 +346,59 @@ class CommandInterpreter:
 
         return normalized
 
-    def _find_best_intent(self, command: str) -> Tuple[Optional[str], float]:
-        """Encontra a melhor intenção para o comando."""
-        best_intent = None
-        best_confidence = 0.0
+    def _match(self, normalized_command: str) -> Tuple[Optional[str], float]:
+        """Resolve um comando normalizado usando o cache na frente de `_find_best_intent`."""
+        cached = self._cache.get(normalized_command)
+        if cached is not None:
+            return cached
 
-        for intent_name, intent_data in self.intents.items():
-            confidence = self._calculate_confidence(command, intent_data["patterns"])
+        result = self._find_best_intent(normalized_command)
+        self._cache.put(normalized_command, result)
+        return result
 
-            if confidence > best_confidence:
-                best_confidence = confidence
-                best_intent = intent_name
+    def _find_best_intent(self, command: str) -> Tuple[Optional[str], float]:
+        """
+        Encontra a melhor intenção para o comando.
 
-        return best_intent, best_confidence
+        As regex têm prioridade; quando a confiança fica abaixo do limiar, a
+        similaridade com as frases de exemplo pode assumir o lugar dela.
+        """
+        catalog = self._catalog
+        profiler = self._profiler
+        start = time.perf_counter_ns() if profiler else 0
+        fuzzy_fallback = fuzzy_win = False
+
+        intent, confidence = catalog.matcher.best(command)
+
+        if self.fuzzy_matching and confidence < self.confidence_threshold:
+            fuzzy_fallback = True
+            fuzzy_intent, similarity = catalog.fuzzy.match(command)
+            if fuzzy_intent and similarity > confidence:
+                logger.debug(f" Correspondência aproximada: {fuzzy_intent} (similaridade: {similarity:.2f})")
+                intent, confidence = fuzzy_intent, similarity
+                fuzzy_win = True
+
+        if profiler:
+            accepted = intent if confidence >= self.confidence_threshold else None
+            profiler.record_command(command, accepted, confidence, time.perf_counter_ns() - start,
+                                    fuzzy_fallback, fuzzy_win)
+
+        return intent, confidence
+
+    def _example_phrases(self, patterns: List[str]) -> List[str]:
+        """Gera frases de exemplo normalizadas a partir dos padrões de uma intenção."""
+        phrases = []
+        for pattern in patterns:
+            phrases.extend(self._normalize_command(example) for example in expand_pattern(pattern))
+        return phrases
 
     def _calculate_confidence(self, command: str, patterns: List[str]) -> float:
-        """Calcula confiança de matching para um conjunto de padrões."""
+        """
+        Calcula confiança de matching para um conjunto de padrões.
+
+        Implementação de referência (padrões não compilados); o caminho principal
+        usa o IntentMatcher, que produz as mesmas confianças.
+        """
         max_confidence = 0.0
 
         for pattern in patterns:
@@ -474,11 +478,14 @@ class CommandInterpreter:
     def add_custom_intent(self, name: str, patterns: List[str], responses: List[str], context: str = "general"):
         """Adiciona uma nova intenção personalizada."""
         try:
-            self.intents[name] = {
+            data = {
                 "patterns": patterns,
                 "responses": responses,
                 "context": context
             }
+            self._custom_intents[name] = data
+            self._add_to_catalog(self._catalog, name, data)
+            self._cache.clear()
 
             logger.info(f" Nova intenção adicionada: {name}")
             return True
@@ -498,31 +505,40 @@ class CommandInterpreter:
     def set_confidence_threshold(self, threshold: float):
         """Define o threshold de confiança."""
         self.confidence_threshold = max(0.0, min(1.0, threshold))
+        self._cache.clear()
         logger.info(f" Threshold de confiança definido: {threshold}")
 
-    def get_context_suggestions(self, partial_command: str) -> List[str]:
-        """Retorna sugestões de comandos baseadas no contexto atual."""
-        suggestions = []
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Retorna acertos, falhas e ocupação do cache de intenções."""
+        return self._cache.get_stats()
 
-        try:
-            # Buscar comandos que começam com o texto parcial
-            partial_lower = partial_command.lower()
+    def clear_cache(self):
+        """Esvazia o cache de intenções."""
+        self._cache.clear()
 
-            for intent_name, intent_data in self.intents.items():
-                for pattern in intent_data["patterns"]:
-                    # Extrair exemplos do padrão
-                    examples = self._extract_examples_from_pattern(pattern)
-                    for example in examples:
-                        if example.startswith(partial_lower) and len(example) > len(partial_lower):
-                            suggestions.append(example)
+    def get_context_suggestions(self, partial_command: str) -> List[str]:
+        """
+        Retorna sugestões de comandos que completam o texto parcial.
 
-            # Limitar sugestões
-            return suggestions[:self.max_alternatives]
+        As sugestões vêm de uma trie de exemplos montada uma única vez (e atualizada
+        por `add_custom_intent`), ordenada pela frequência com que cada comando foi
+        reconhecido; o custo é proporcional ao tamanho do prefixo.
+        """
+        try:
+            return self._suggestions.complete(partial_command, self.max_alternatives)
 
         except Exception as e:
             logger.error(f" Erro ao gerar sugestões: {e}")
             return []
 
+    def _suggestion_examples(self, patterns: List[str]) -> List[str]:
+        """Exemplos para autocompletar: trechos dos padrões seguidos das frases completas."""
+        examples = []
+        for pattern in patterns:
+            examples.extend(self._extract_examples_from_pattern(pattern))
+        examples.extend(self._example_phrases(patterns))
+        return examples
+
     def _extract_examples_from_pattern(self, pattern: str) -> List[str]:
         """Extrai exemplos de comandos de um padrão regex."""
         examples = []
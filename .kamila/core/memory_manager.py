@@ -35,6 +35,28 @@ class MemoryManager:
         self.updater = MemoryUpdater(self.store)
 
     def process_interaction(self, user_input: str):
+        prompt = self._prepare_prompt(user_input)
+        
+        assistant_response = self.llm.generate_response(prompt)
+        
+        self._finish_interaction(user_input, assistant_response)
+        return assistant_response
+
+    def process_interaction_stream(self, user_input: str):
+        """
+        Igual a `process_interaction`, mas entrega a resposta em pedaços à medida
+        que o LLM gera; a memória é atualizada quando o streaming termina.
+        """
+        prompt = self._prepare_prompt(user_input)
+
+        parts = []
+        for chunk in self.llm.generate_response_stream(prompt):
+            parts.append(chunk)
+            yield chunk
+
+        self._finish_interaction(user_input, "".join(parts).strip())
+
+    def _prepare_prompt(self, user_input: str) -> str:
         relevant_memories = self.retriever.retrieve_relevant_memories(user_input)
         recent_context = self.buffer.get_recent_context()
         
@@ -43,9 +65,9 @@ class MemoryManager:
         print("\n[PROMPT ENVIADO PARA A IA]:\n---")
         print(prompt)
         print("---\n")
-        
-        assistant_response = self.llm.generate_response(prompt)
-        
+        return prompt
+
+    def _finish_interaction(self, user_input: str, assistant_response: str):
         self.buffer.add_interaction(user_input, assistant_response)
 
         # Otimização: Processar e salvar fatos em background para não bloquear a resposta
@@ -63,8 +85,6 @@ class MemoryManager:
                 self.user_name = name.strip().capitalize()
                 print(f"[Memory Manager] Nome de usuário atualizado para: {self.user_name}")
 
-        return assistant_response
-
     def add_health_event(self, event_type: str, details: dict):
         """
         Adiciona um evento de saúde à memória e processa como um fato importante.
@@ -0,0 +1,176 @@
+"""
+Speech Pipeline - Fala em Streaming para Kamila
+Divide o texto gerado aos pedaços pelo LLM em frases e entrega cada frase à
+fila do TTS assim que ela termina: a primeira frase começa a tocar enquanto o
+modelo ainda gera o resto. O tempo até o primeiro áudio é medido a cada resposta.
+"""
+
+import re
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from .tts_engine import PRIORITY_NORMAL
+
+logger = logging.getLogger(__name__)
+
+# Fim de frase: pontuação final seguida de espaço (ou quebra de linha)
+SENTENCE_END = re.compile(r'[.!?…]+["\')\]]*\s+|\n+')
+
+# Abreviações comuns que terminam em ponto sem encerrar a frase
+ABBREVIATIONS = {"sr", "sra", "srta", "dr", "dra", "prof", "profa", "etc", "ex", "obs", "av", "nº", "n"}
+
+
+class SentenceChunker:
+    """
+    Acumula pedaços de texto e devolve as frases completas.
+
+    Frases muito longas (sem pontuação) são cortadas no último espaço antes de
+    `max_chars` para não segurar o áudio até o fim da geração.
+    """
+
+    def __init__(self, min_chars: int = 2, max_chars: int = 250):
+        """
+        Inicializa o divisor.
+
+        Args:
+            min_chars (int): Tamanho mínimo de uma frase (fragmentos menores se juntam à próxima)
+            max_chars (int): Tamanho a partir do qual o texto é cortado mesmo sem pontuação
+        """
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Adiciona um pedaço de texto; retorna as frases que ficaram completas."""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            words = self._buffer[start:match.start()].split()
+            last_word = words[-1].lower().rstrip(".") if words else ""
+            if len(candidate) < self.min_chars or (match.group().startswith(".") and last_word in ABBREVIATIONS):
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+
+        while len(self._buffer) > self.max_chars:
+            cut = self._buffer.rfind(" ", 0, self.max_chars)
+            if cut <= 0:
+                cut = self.max_chars
+            sentences.append(self._buffer[:cut].strip())
+            self._buffer = self._buffer[cut:].lstrip()
+        return [sentence for sentence in sentences if sentence]
+
+    def flush(self) -> Optional[str]:
+        """Devolve o texto restante (fim da geração)."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+
+class SpeechPipeline:
+    """
+    Liga o streaming do LLM à fila de fala do TTSEngine, frase a frase.
+
+    Registra, por resposta, o tempo até o primeiro áudio (do início da geração
+    até a primeira frase começar a tocar) e o tempo total de geração.
+    """
+
+    def __init__(self, tts_engine, priority: int = PRIORITY_NORMAL, min_chars: int = 2, max_chars: int = 250):
+        """
+        Inicializa o pipeline.
+
+        Args:
+            tts_engine: TTSEngine (usa `submit`; motores sem fila recebem `speak` por frase)
+            priority (int): Prioridade das frases na fila de fala
+            min_chars (int): Veja `SentenceChunker`
+            max_chars (int): Veja `SentenceChunker`
+        """
+        self.tts = tts_engine
+        self.priority = priority
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+
+        # Tempo até o primeiro áudio das últimas respostas (segundos)
+        self.latencies = deque(maxlen=200)
+        self.generation_times = deque(maxlen=200)
+        self._lock = threading.Lock()
+
+    def speak_stream(self, chunks: Iterable[str], started: Optional[float] = None) -> str:
+        """
+        Consome o streaming do LLM e enfileira cada frase assim que termina.
+
+        Retorna assim que a geração acaba (sem esperar a fala). Se a fala for
+        interrompida (alerta de emergência, barge-in do usuário), as frases seguintes
+        não são faladas, mas o texto continua sendo lido para ser devolvido por inteiro.
+
+        Args:
+            chunks (Iterable[str]): Pedaços de texto (ex.: `generate_response_stream`)
+            started (float): Instante de referência (`time.perf_counter()`); padrão: agora
+
+        Returns:
+            str: Texto completo gerado
+        """
+        started = started if started is not None else time.perf_counter()
+        chunker = SentenceChunker(self.min_chars, self.max_chars)
+        state = {"first": True, "futures": [], "interruptions": getattr(self.tts, "interruptions", 0)}
+        parts = []
+
+        for chunk in chunks:
+            if not chunk:
+                continue
+            parts.append(chunk)
+            for sentence in chunker.feed(chunk):
+                self._submit(sentence, started, state)
+
+        rest = chunker.flush()
+        if rest:
+            self._submit(rest, started, state)
+
+        generation = time.perf_counter() - started
+        with self._lock:
+            self.generation_times.append(generation)
+        logger.info(f"Geração concluída em {generation:.2f}s ({len(state['futures'])} frase(s) enviada(s) ao TTS)")
+        return "".join(parts).strip()
+
+    def _submit(self, sentence: str, started: float, state: Dict):
+        if getattr(self.tts, "interruptions", 0) != state["interruptions"]:
+            return
+        if any(future.cancelled() for future in state["futures"]):
+            return
+
+        on_start = None
+        if state["first"]:
+            state["first"] = False
+
+            def on_start():
+                self._record_first_audio(time.perf_counter() - started)
+
+        if hasattr(self.tts, "submit"):
+            state["futures"].append(self.tts.submit(sentence, priority=self.priority, on_start=on_start))
+        else:
+            if on_start:
+                on_start()
+            self.tts.speak(sentence)
+
+    def _record_first_audio(self, latency: float):
+        with self._lock:
+            self.latencies.append(latency)
+        logger.info(f"Tempo até o primeiro áudio: {latency:.2f}s")
+
+    def get_stats(self) -> Dict[str, float]:
+        """Estatísticas do tempo até o primeiro áudio (segundos)."""
+        with self._lock:
+            latencies = list(self.latencies)
+        if not latencies:
+            return {"responses": 0, "last": 0.0, "mean": 0.0, "max": 0.0}
+        return {
+            "responses": len(latencies),
+            "last": round(latencies[-1], 3),
+            "mean": round(sum(latencies) / len(latencies), 3),
+            "max": round(max(latencies), 3),
+        }
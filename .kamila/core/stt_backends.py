@@ -0,0 +1,357 @@
+"""
+STT Backends - Motores de Reconhecimento Plugáveis para Kamila
+Interface comum para os reconhecedores usados pelo STTEngine. Cada backend abre
+uma sessão por comando que recebe os frames à medida que chegam e pode emitir
+hipóteses parciais antes da transcrição final. Backends sem streaming (como o
+Google Speech Recognition) acumulam o áudio e só produzem o resultado final.
+"""
+
+import os
+import json
+import time
+import logging
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+
+from .hedging import hedged_call
+
+logger = logging.getLogger(__name__)
+
+try:
+    import speech_recognition as sr
+    SPEECH_RECOGNITION_AVAILABLE = True
+except ImportError:
+    SPEECH_RECOGNITION_AVAILABLE = False
+
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+# Modelo Vosk padrão (ex.: vosk-model-small-pt-0.3, descompactado em models/)
+DEFAULT_VOSK_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'models', 'vosk-model-small-pt-0.3'
+)
+
+
+class Transcript:
+    """Hipótese de transcrição (parcial ou final)."""
+
+    __slots__ = ("text", "is_final", "elapsed")
+
+    def __init__(self, text: str, is_final: bool, elapsed: float = 0.0):
+        self.text = text
+        self.is_final = is_final
+        self.elapsed = elapsed  # Segundos desde o início da sessão
+
+    def __repr__(self) -> str:
+        kind = "final" if self.is_final else "parcial"
+        return f"Transcript({kind}: {self.text!r})"
+
+
+class RecognitionSession(ABC):
+    """Sessão de reconhecimento de um comando."""
+
+    # Confiança da transcrição final (0 a 1), quando o backend a informa
+    confidence: Optional[float] = None
+
+    @abstractmethod
+    def feed(self, frame: bytes) -> Optional[str]:
+        """Recebe um frame PCM; retorna uma nova hipótese parcial ou None."""
+
+    @abstractmethod
+    def finish(self) -> Optional[str]:
+        """Encerra a sessão e retorna a transcrição final (None se nada foi entendido)."""
+
+
+class BufferedSession(RecognitionSession):
+    """Sessão para backends sem streaming: acumula o áudio e reconhece no final."""
+
+    def __init__(self, backend: "STTBackend", sample_rate: int, sample_width: int):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self._frames: List[bytes] = []
+
+    def feed(self, frame: bytes) -> Optional[str]:
+        self._frames.append(frame)
+        return None
+
+    def finish(self) -> Optional[str]:
+        return self.backend.recognize(b"".join(self._frames), self.sample_rate, self.sample_width)
+
+
+class STTBackend(ABC):
+    """Interface dos backends de reconhecimento."""
+
+    name = "base"
+    streaming = False  # True se a sessão emite hipóteses parciais
+
+    @abstractmethod
+    def recognize(self, pcm: bytes, sample_rate: int, sample_width: int = 2) -> Optional[str]:
+        """Transcreve um comando completo (PCM mono)."""
+
+    def open_session(self, sample_rate: int, sample_width: int = 2) -> RecognitionSession:
+        """Abre uma sessão para um novo comando."""
+        return BufferedSession(self, sample_rate, sample_width)
+
+    def close(self):
+        """Libera recursos do backend."""
+
+
+def stream_session(session: RecognitionSession, frames: Iterable[bytes]):
+    """
+    Alimenta uma sessão com frames e gera as hipóteses (parciais repetidas são omitidas).
+
+    Yields:
+        Transcript: Hipóteses parciais e, por último, a final (se houver)
+    """
+    start = time.perf_counter()
+    last_partial = None
+    for frame in frames:
+        partial = session.feed(frame)
+        if partial and partial != last_partial:
+            last_partial = partial
+            yield Transcript(partial, False, time.perf_counter() - start)
+
+    final = session.finish()
+    if final:
+        yield Transcript(final, True, time.perf_counter() - start)
+
+
+class GoogleBackend(STTBackend):
+    """
+    Google Speech Recognition (online, sem streaming).
+
+    Com GOOGLE_API_KEY configurada, a requisição com chave é a principal e a
+    sem chave é disparada em paralelo após `hedge_delay` segundos (ou na hora,
+    se a chave for recusada); vale a primeira transcrição bem-sucedida.
+    """
+
+    name = "google"
+
+    def __init__(self, recognizer, executor, hedge_delay: Optional[float], language: str = 'pt-BR'):
+        if not SPEECH_RECOGNITION_AVAILABLE:
+            raise RuntimeError("SpeechRecognition não instalado")
+        self.recognizer = recognizer
+        self.executor = executor
+        self.hedge_delay = hedge_delay
+        self.language = language
+
+    def recognize(self, pcm: bytes, sample_rate: int, sample_width: int = 2) -> Optional[str]:
+        audio = sr.AudioData(pcm, sample_rate, sample_width)
+        api_key = os.getenv('GOOGLE_API_KEY')
+
+        def recognize_with_key():
+            return self.recognizer.recognize_google(audio, key=api_key, language=self.language)
+
+        def recognize_without_key():
+            return self.recognizer.recognize_google(audio, language=self.language)
+
+        try:
+            if api_key and api_key != "sua_chave_google_speech_aqui":
+                logger.debug("Tentando transcrever com GOOGLE_API_KEY...")
+                command, winner = hedged_call(
+                    recognize_with_key, recognize_without_key, self.executor,
+                    self.hedge_delay, hedge_on=(sr.RequestError,)
+                )
+                if winner == 1:
+                    logger.warning("Transcrição obtida pelo serviço padrão (a requisição com a API Key falhou ou demorou).")
+            else:
+                logger.debug("Chave de API do Google não configurada. Usando o serviço padrão.")
+                command = recognize_without_key()
+        except sr.UnknownValueError:
+            logger.warning("Não foi possível entender o áudio.")
+            return None
+        except sr.RequestError as e:
+            logger.error(f"Serviço de reconhecimento falhou: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Erro inesperado na transcrição: {e}")
+            return None
+
+        return command or None
+
+
+class ScriptedSession(RecognitionSession):
+    def __init__(self, text: Optional[str], frames_per_word: int):
+        self.words = text.split() if text else []
+        self.frames_per_word = frames_per_word
+        self.frames = 0
+
+    def feed(self, frame: bytes) -> Optional[str]:
+        self.frames += 1
+        heard = min(len(self.words), self.frames // self.frames_per_word)
+        return " ".join(self.words[:heard]) or None
+
+    def finish(self) -> Optional[str]:
+        return " ".join(self.words) or None
+
+
+class ScriptedBackend(STTBackend):
+    """
+    Backend local de substituição (testes e demonstrações, sem rede nem modelo).
+
+    Cada sessão "reconhece" o próximo texto do roteiro, revelando uma palavra
+    a cada `frames_per_word` frames recebidos, como um reconhecedor em streaming.
+    """
+
+    name = "scripted"
+    streaming = True
+
+    def __init__(self, transcripts: Iterable[Optional[str]], frames_per_word: int = 5):
+        self.transcripts = list(transcripts)
+        self.frames_per_word = frames_per_word
+        self.sessions = 0
+
+    def _next_text(self) -> Optional[str]:
+        text = self.transcripts[self.sessions % len(self.transcripts)] if self.transcripts else None
+        self.sessions += 1
+        return text
+
+    def recognize(self, pcm: bytes, sample_rate: int, sample_width: int = 2) -> Optional[str]:
+        return self._next_text()
+
+    def open_session(self, sample_rate: int, sample_width: int = 2) -> RecognitionSession:
+        return ScriptedSession(self._next_text(), self.frames_per_word)
+
+
+class VoskSession(RecognitionSession):
+    def __init__(self, model, sample_rate: int):
+        self._recognizer = vosk.KaldiRecognizer(model, sample_rate)
+        self._recognizer.SetWords(True)
+        self._segments: List[str] = []
+        self._confidences: List[float] = []
+
+    def _collect(self, result: str):
+        data = json.loads(result)
+        if data.get("text"):
+            self._segments.append(data["text"])
+            self._confidences.extend(word.get("conf", 1.0) for word in data.get("result", []))
+
+    def feed(self, frame: bytes) -> Optional[str]:
+        if self._recognizer.AcceptWaveform(frame):
+            # Fim de um segmento: o texto dele já é definitivo
+            self._collect(self._recognizer.Result())
+            return " ".join(self._segments) or None
+        partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        return " ".join(self._segments + [partial]).strip() or None
+
+    def finish(self) -> Optional[str]:
+        self._collect(self._recognizer.FinalResult())
+        if self._confidences:
+            self.confidence = sum(self._confidences) / len(self._confidences)
+        return " ".join(self._segments) or None
+
+
+class VoskBackend(STTBackend):
+    """
+    Reconhecimento offline com Vosk (Kaldi em CPU), em streaming.
+
+    Elimina a ida e volta pela rede e continua funcionando sem internet.
+    """
+
+    name = "vosk"
+    streaming = True
+
+    def __init__(self, model_path: Optional[str] = None):
+        if not VOSK_AVAILABLE:
+            raise RuntimeError("Vosk não instalado (pip install vosk)")
+        model_path = model_path or os.getenv('VOSK_MODEL_PATH', DEFAULT_VOSK_MODEL_PATH)
+        if not os.path.isdir(model_path):
+            raise RuntimeError(f"Modelo Vosk não encontrado em {model_path}")
+
+        vosk.SetLogLevel(-1)
+        self.model = vosk.Model(model_path)
+        logger.info(f"Modelo Vosk carregado: {model_path}")
+
+    def open_session(self, sample_rate: int, sample_width: int = 2) -> RecognitionSession:
+        return VoskSession(self.model, sample_rate)
+
+    def recognize(self, pcm: bytes, sample_rate: int, sample_width: int = 2) -> Optional[str]:
+        session = self.open_session(sample_rate, sample_width)
+        session.feed(pcm)
+        return session.finish()
+
+
+class FallbackSession(RecognitionSession):
+    def __init__(self, backend: "FallbackBackend", sample_rate: int, sample_width: int):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self._primary = backend.primary.open_session(sample_rate, sample_width)
+        self._frames: List[bytes] = []
+
+    def feed(self, frame: bytes) -> Optional[str]:
+        self._frames.append(frame)
+        return self._primary.feed(frame)
+
+    def finish(self) -> Optional[str]:
+        text = self._primary.finish()
+        self.confidence = self._primary.confidence
+        if text and (self.confidence is None or self.confidence >= self.backend.min_confidence):
+            return text
+
+        reason = "sem transcrição local" if not text else f"confiança local baixa ({self.confidence:.2f})"
+        logger.info(f"Consultando {self.backend.secondary.name} como segunda opinião: {reason}")
+        second = self.backend.secondary.recognize(b"".join(self._frames), self.sample_rate, self.sample_width)
+        if second:
+            self.confidence = None
+            return second
+        return text
+
+
+class FallbackBackend(STTBackend):
+    """
+    Backend principal (local) com um secundário (online) como segunda opinião.
+
+    O secundário só é consultado quando o principal não entende o comando ou
+    informa confiança abaixo de `min_confidence`.
+    """
+
+    def __init__(self, primary: STTBackend, secondary: STTBackend, min_confidence: float = 0.6):
+        self.primary = primary
+        self.secondary = secondary
+        self.min_confidence = min_confidence
+        self.name = f"{primary.name}+{secondary.name}"
+        self.streaming = primary.streaming
+
+    def open_session(self, sample_rate: int, sample_width: int = 2) -> RecognitionSession:
+        return FallbackSession(self, sample_rate, sample_width)
+
+    def recognize(self, pcm: bytes, sample_rate: int, sample_width: int = 2) -> Optional[str]:
+        session = self.open_session(sample_rate, sample_width)
+        session.feed(pcm)
+        return session.finish()
+
+    def close(self):
+        self.primary.close()
+        self.secondary.close()
+
+
+def create_backend(recognizer, executor, hedge_delay: Optional[float], backend: Optional[str] = None) -> STTBackend:
+    """
+    Cria o backend configurado em `STT_BACKEND`.
+
+    - "google": apenas o Google Speech Recognition (online)
+    - "vosk": apenas o Vosk (offline)
+    - "auto" (padrão): Vosk com o Google como segunda opinião, se o Vosk e o
+      modelo estiverem disponíveis; caso contrário, Google
+    """
+    choice = (backend or os.getenv('STT_BACKEND', 'auto')).strip().lower()
+
+    if choice == "google":
+        return GoogleBackend(recognizer, executor, hedge_delay)
+
+    try:
+        local = VoskBackend()
+    except Exception as e:
+        if choice == "vosk":
+            raise
+        logger.info(f"Reconhecimento offline indisponível ({e}). Usando Google Speech Recognition.")
+        return GoogleBackend(recognizer, executor, hedge_delay)
+
+    if choice == "vosk":
+        return local
+    return FallbackBackend(local, GoogleBackend(recognizer, executor, hedge_delay))
@@ -7,14 +7,39 @@ Versão final e robusta com fallback inteligente e calibração dinâmica.
 import os
 import sys
 import time
+import asyncio
+import inspect
 import logging
 import threading
-from concurrent.futures import ThreadPoolExecutor
-import speech_recognition as sr
-from pvporcupine import create as create_porcupine
+from concurrent.futures import ThreadPoolExecutor, wait
 from dotenv import load_dotenv
-import pyaudio
-import struct
+
+from collections import deque
+
+from .audio_stream import AsyncRingReader, AudioCapture
+from .stt_backends import Transcript, create_backend, stream_session
+from .vad import Endpointer, NoiseFloorEstimator, OnsetDetector, create_vad
+from .wake_words import create_wake_word_detector, parse_keywords
+
+try:
+    import speech_recognition as sr
+    SPEECH_RECOGNITION_AVAILABLE = True
+except ImportError:
+    sr = None
+    SPEECH_RECOGNITION_AVAILABLE = False
+
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+
+if SPEECH_RECOGNITION_AVAILABLE:
+    WaitTimeoutError = sr.WaitTimeoutError
+else:
+    class WaitTimeoutError(Exception):
+        """Nenhuma fala a tempo (o mesmo papel de sr.WaitTimeoutError sem o SpeechRecognition)."""
 
 # Carregar variáveis de ambiente da raiz do projeto
 dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env')
@@ -23,28 +48,169 @@ if os.path.exists(dotenv_path):
 
 logger = logging.getLogger(__name__)
 
+# Áudio anterior ao fim da wake word incluído no início do comando (s)
+COMMAND_PREROLL_SECONDS = 0.3
+
+# Sem frames novos por esse tempo (s), a captura contínua é considerada travada e reaberta
+CAPTURE_STALL_SECONDS = 2.0
+
+# Atraso padrão (s) antes de disparar o reconhecimento sem chave em paralelo ao com chave
+DEFAULT_HEDGE_DELAY = 0.8
+
+# Limiar de energia e pausa final padrão do sr.Recognizer (valem também sem o SpeechRecognition)
+DEFAULT_ENERGY_THRESHOLD = 300
+DEFAULT_PAUSE_THRESHOLD = 0.8
+
+# Modos de barge-in (BARGE_IN): interromper a fala da assistente quando o usuário
+# diz uma palavra-chave ("wake") ou também quando começa a falar ("vad")
+BARGE_IN_MODES = ("off", "wake", "vad")
+
+
+def _hedge_delay_from_env(default):
+    """Lê STT_HEDGE_DELAY (segundos); "off" ou valor negativo desativa o hedging."""
+    value = os.getenv('STT_HEDGE_DELAY', '').strip()
+    if not value:
+        return default
+    if value.lower() in ("off", "none", "false"):
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        logger.warning(f"STT_HEDGE_DELAY inválido ({value}); usando {default}s")
+        return default
+    return delay if delay >= 0 else None
+
+
+class CommandRecorder:
+    """
+    Separa um comando do áudio contínuo, frame a frame.
+
+    Antes da fala, mantém só o trecho de pre-roll mais recente; o início e o fim
+    são decididos pelo Endpointer. Não lê áudio sozinho: serve tanto ao
+    gravador com threads quanto ao assíncrono.
+    """
+
+    def __init__(self, endpointer, noise_floor, capture, timeout, phrase_time_limit):
+        self.endpointer = endpointer
+        self.noise_floor = noise_floor
+        self.timeout_frames = capture.frames_for(timeout)
+        self.limit_frames = capture.frames_for(phrase_time_limit)
+        self.leading = deque(maxlen=max(1, capture.frames_for(max(COMMAND_PREROLL_SECONDS, 0.5))))
+        self.started = False
+        self.done = False
+        self.waited = self.recorded = 0
+        endpointer.reset()
+
+    def push(self, pcm):
+        """Processa um frame; retorna os frames que passam a fazer parte do comando."""
+        self.noise_floor.update(pcm)
+        state = self.endpointer.process(pcm)
+
+        if not self.started:
+            self.leading.append(pcm)
+            if state == "start":
+                self.started = True
+                self.recorded = len(self.leading)
+                return list(self.leading)
+            self.waited += 1
+            if self.waited >= self.timeout_frames:
+                raise WaitTimeoutError("Nenhuma fala detectada")
+            return []
+
+        self.recorded += 1
+        if state == "end" or self.recorded >= self.limit_frames:
+            self.done = True
+            if self.endpointer.ended:
+                logger.debug(f"Fim de fala após {self.endpointer.latencies[-1]:.2f}s de silêncio")
+        return [pcm]
+
+
 class STTEngine:
     """Motor de reconhecimento de voz."""
 
-    def __init__(self, wake_word="kamila"):
-        """Inicializa o motor STT."""
+    def __init__(self, wake_word="kamila", hedge_delay=DEFAULT_HEDGE_DELAY, backend=None, audio_source=None,
+                 wake_detector=None):
+        """
+        Inicializa o motor STT.
+
+        Args:
+            wake_word (str): Palavra de ativação
+            hedge_delay (float): Segundos até disparar o reconhecimento sem chave em paralelo
+                (0 = imediatamente, None = só após falha da chave); STT_HEDGE_DELAY tem prioridade
+            backend (STTBackend): Reconhecedor (padrão: definido por STT_BACKEND)
+            audio_source: Fonte de áudio no lugar do microfone (ex.: FileAudioSource, para
+                testes e benchmarks sem hardware de áudio)
+            wake_detector: Detector de palavras-chave no lugar do Porcupine (ex.:
+                ScriptedWakeDetector, para testes e benchmarks sem chave de acesso)
+        """
         logger.info("Inicializando STT Engine...")
         self.wake_word = wake_word
-        self.recognizer = sr.Recognizer()
+        self.hedge_delay = _hedge_delay_from_env(hedge_delay)
+        self.recognizer = sr.Recognizer() if SPEECH_RECOGNITION_AVAILABLE else None
         self.microphone = None
+        self.device_index = None
         self.porcupine = None
+        self.wake_detector = wake_detector
+        self._keyword_callbacks = {}
+        self._async_wake_reader = None
+
+        # Stream único do microfone compartilhado entre a wake word e o comando
+        self.audio_source = audio_source
+        self.capture = None
+        self.endpointer = None
+        self.noise_floor = None
+        self._wake_position = None
+        self._last_wake_position = None
 
         self._listening = False
         self._listen_thread = None
         self.executor = ThreadPoolExecutor(max_workers=1)
+        # Callbacks das palavras-chave rodam fora da thread de detecção, que segue ouvindo
+        self._callback_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stt-callback")
+        self._callback_futures = set()
+        # Dono da gravação: cada comando despachado recebe um token; só o dono atual
+        # libera a gravação, e um fluxo antigo não volta a gravar depois de substituído
+        self._command_lock = threading.Lock()
+        self._command_generation = 0
+        self._recording_token = None
+        self._flow = threading.local()
+
+        # Barge-in: interrompe a fala da assistente (veja enable_barge_in)
+        self._barge_in = None
+        self._is_speaking = None
+        self._on_speech = None
+        self.onset_detector = None
+        # Sessões de reconhecimento do caminho assíncrono (feed/finish bloqueiam até o resultado)
+        self._recognition_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="stt-recognize")
+        # Requisições com chave e sem chave rodam em paralelo em um pool próprio: um `finish`
+        # bloqueado no pool de reconhecimento nunca ocupa os workers de que o hedging precisa
+        self._hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="stt-hedge")
+        self.backend = backend or create_backend(self.recognizer, self._hedge_executor, self.hedge_delay)
+        logger.info(f"Backend de reconhecimento: {self.backend.name}")
         
-        self._setup_microphone()
-        self._setup_porcupine()
+        if audio_source is None:
+            self._setup_microphone()
+        # Piso de ruído contínuo: o limiar inicial é só o ponto de partida
+        self.noise_floor = NoiseFloorEstimator(initial_threshold=self._recognizer_setting(
+            'energy_threshold', DEFAULT_ENERGY_THRESHOLD))
+        if wake_detector is None:
+            self._setup_porcupine()
+        else:
+            self.porcupine = getattr(wake_detector, "porcupine", None)
+            logger.info(f"Detector de palavras-chave injetado: {', '.join(wake_detector.keywords)}")
+        self._setup_capture()
         
         logger.info("STT Engine inicializado com sucesso!")
 
+    def _recognizer_setting(self, name, default):
+        """Configuração do Recognizer (ou o padrão dele, sem o SpeechRecognition instalado)."""
+        return getattr(self.recognizer, name, default)
+
     def _setup_microphone(self):
         """Configura o microfone e calibra o Recognizer de forma manual e robusta."""
+        if not SPEECH_RECOGNITION_AVAILABLE:
+            logger.error("SpeechRecognition não instalado; microfone indisponível.")
+            return
         try:
             mic_list = sr.Microphone.list_microphone_names()
             if not mic_list:
@@ -57,6 +223,7 @@ class STTEngine:
                     device_index = i
                     break
             if device_index is None: device_index = 0
+            self.device_index = device_index
 
             self.microphone = sr.Microphone(device_index=device_index, sample_rate=16000)
             
@@ -67,52 +234,185 @@ class STTEngine:
             self.recognizer.pause_threshold = 1.5
 
             logger.info(f"Microfone configurado: {mic_list[device_index]}")
-            logger.info(f"MODO MANUAL: Limiar de energia FIXO em {self.recognizer.energy_threshold} | Pausa de {self.recognizer.pause_threshold}s")
+            logger.info(f"Limiar de energia inicial em {self.recognizer.energy_threshold} (ajustado continuamente pelo piso de ruído) | Pausa de {self.recognizer.pause_threshold}s")
 
         except Exception as e:
             logger.error(f"Erro crítico ao configurar microfone: {e}")
             self.microphone = None
 
     def _setup_porcupine(self):
-        """Configura o sistema de detecção de wake word."""
+        """Configura a detecção das palavras-chave (PORCUPINE_KEYWORDS; padrão: só a wake word)."""
         try:
             access_key = os.getenv('PICOVOICE_ACCESS_KEY')
             if not access_key:
                 logger.warning("PICOVOICE_ACCESS_KEY não encontrada! Wake word desativada.")
                 self.porcupine = None
                 return
-            
-            model_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'models', 'porcupine_models', 'porcupine_params_pt.pv')
-            keyword_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'models', 'wake_words', 'camila_pt_windows_v3_0_0.ppn')
-            
-            if not os.path.exists(model_path) or not os.path.exists(keyword_path):
-                logger.error("Arquivos de modelo do Porcupine (.pv ou .ppn) não encontrados!")
+
+            keywords = parse_keywords(os.getenv('PORCUPINE_KEYWORDS'), default_name=self.wake_word)
+            self.wake_detector = create_wake_word_detector(access_key, keywords)
+            if self.wake_detector is None:
+                logger.error("Nenhuma palavra-chave do Porcupine pôde ser carregada!")
                 self.porcupine = None
                 return
 
-            self.porcupine = create_porcupine(
-                access_key=access_key,
-                keyword_paths=[keyword_path],
-                model_path=model_path
-            )
-            logger.info("Porcupine configurado com sucesso para wake word 'kamila'")
+            # A primeira instância define a taxa de amostragem e o tamanho do frame
+            self.porcupine = self.wake_detector.porcupine
 
         except Exception as e:
             logger.error(f"Erro ao configurar Porcupine: {e}")
+            self.wake_detector = None
             self.porcupine = None
 
-    def start_listening(self, callback):
-        """Inicia a escuta da wake word em background."""
+    def _setup_capture(self):
+        """Prepara a captura contínua (aberta uma vez ao iniciar a escuta)."""
+        detector = self.wake_detector
+        if self.audio_source is not None:
+            self.capture = self.audio_source
+            if detector and (self.capture.sample_rate, self.capture.frame_length) != (
+                    detector.sample_rate, detector.frame_length):
+                logger.error(f"A fonte de áudio precisa de {detector.sample_rate} Hz e frames de "
+                             f"{detector.frame_length} amostras para a wake word.")
+        elif not detector:
+            return
+        else:
+            self.capture = AudioCapture(
+                sample_rate=detector.sample_rate,
+                frame_length=detector.frame_length,
+                device_index=self.device_index,
+            )
+
+        # Fim de fala adaptativo sobre os frames compartilhados (a pausa fixa vira o teto)
+        vad = create_vad(sample_rate=self.capture.sample_rate, energy_threshold=self.noise_floor.min_threshold,
+                         noise_estimator=self.noise_floor)
+        self.endpointer = Endpointer(vad, self.capture.frame_duration,
+                                     max_silence=self._recognizer_setting('pause_threshold', DEFAULT_PAUSE_THRESHOLD))
+        logger.info(f"VAD configurado: {type(vad).__name__} (silêncio final de "
+                    f"{self.endpointer.min_silence}s a {self.endpointer.max_silence}s)")
+
+    def start_listening(self, callback, keyword_callbacks=None):
+        """
+        Inicia a escuta da wake word em background.
+
+        Args:
+            callback: Chamado na detecção da wake word (e de palavras sem callback próprio)
+            keyword_callbacks (dict): Callback por palavra-chave de PORCUPINE_KEYWORDS
+                (ex.: {"socorro": on_emergency}); esses callbacks não gravam comando
+        """
         if self._listening:
             logger.warning("Já está ouvindo.")
             return
 
+        self._keyword_callbacks = dict(keyword_callbacks or {})
+        if self.wake_detector:
+            unknown = set(self._keyword_callbacks) - set(self.wake_detector.keywords)
+            if unknown:
+                logger.warning(f"Palavras-chave sem modelo carregado: {', '.join(sorted(unknown))}")
+
         logger.info(f"Iniciando escuta da wake word '{self.wake_word}' em background...")
         self._listening = True
         self._listen_thread = threading.Thread(target=self._listen_loop, args=(callback,))
         self._listen_thread.daemon = True
         self._listen_thread.start()
 
+    def enable_barge_in(self, interrupt, is_speaking=None, on_speech=None, mode=None):
+        """
+        Ativa o barge-in: o usuário pode interromper a fala da assistente.
+
+        Qualquer palavra-chave detectada chama `interrupt()` no mesmo frame, antes do
+        callback. No modo "vad", o início de fala do usuário enquanto `is_speaking()`
+        for verdadeiro também interrompe, e `on_speech` é chamado para gravar o comando
+        (a gravação começa no início da fala).
+
+        Args:
+            interrupt: Cancela a fala atual e a fila (ex.: TTSEngine.interrupt)
+            is_speaking: Retorna True enquanto a assistente fala (necessário no modo "vad")
+            on_speech: Callback do comando falado por cima da assistente (modo "vad")
+            mode (str): "off", "wake" ou "vad" (padrão: BARGE_IN, ou "wake")
+        """
+        mode = (mode or os.getenv('BARGE_IN', 'wake')).strip().lower()
+        if mode not in BARGE_IN_MODES:
+            logger.warning(f"BARGE_IN inválido ({mode}); usando 'wake'")
+            mode = "wake"
+        if mode == "off":
+            self._barge_in = None
+            logger.info("Barge-in desativado.")
+            return
+
+        self._barge_in = interrupt
+        if mode == "vad" and is_speaking is not None and on_speech is not None and self.capture is not None:
+            self._is_speaking = is_speaking
+            self._on_speech = on_speech
+            self.onset_detector = OnsetDetector(self.noise_floor, self.capture.frame_duration)
+        elif mode == "vad":
+            logger.warning("Barge-in por voz requer a captura contínua, is_speaking e on_speech; usando só a wake word.")
+            mode = "wake"
+        logger.info(f"Barge-in ativado (modo '{mode}').")
+
+    def _interrupt_speech(self):
+        """Barge-in: interrompe a fala da assistente (na própria thread de detecção, sem esperar)."""
+        if self._barge_in is None:
+            return
+        try:
+            self._barge_in()
+        except Exception as e:
+            logger.error(f"Erro ao interromper a fala (barge-in): {e}")
+
+    @property
+    def _recording(self):
+        """True enquanto um comando está sendo (ou vai ser) gravado."""
+        return self._recording_token is not None
+
+    def _begin_recording(self):
+        """Abre um novo comando, substituindo o anterior; retorna o token do dono."""
+        with self._command_lock:
+            self._command_generation += 1
+            self._recording_token = self._command_generation
+            return self._recording_token
+
+    def _claim_recording(self, token):
+        """Retoma a gravação para `token`; False se um comando mais recente já o substituiu."""
+        with self._command_lock:
+            if token != self._command_generation:
+                return False
+            self._recording_token = token
+            return True
+
+    def _end_recording(self, token):
+        """Libera a gravação, se `token` ainda for o dono (um fluxo antigo não libera a do novo)."""
+        with self._command_lock:
+            if self._recording_token == token:
+                self._recording_token = None
+
+    def _dispatch(self, handler, records_command):
+        """Executa o callback fora da thread de detecção."""
+        token = self._begin_recording() if records_command else None
+
+        def run():
+            # A gravação feita dentro do callback (listen_for_command) pertence a este comando
+            self._flow.token = token
+            try:
+                handler()
+            except Exception as e:
+                logger.error(f"Erro no callback da palavra-chave: {e}", exc_info=True)
+            finally:
+                self._flow.token = None
+                if token is not None:
+                    self._end_recording(token)
+
+        future = self._callback_executor.submit(run)
+        self._callback_futures.add(future)
+        future.add_done_callback(self._callback_futures.discard)
+
+    def wait_for_callbacks(self, timeout=None):
+        """Espera os callbacks em andamento terminarem (ex.: ao fim de um arquivo de áudio)."""
+        wait(list(self._callback_futures), timeout=timeout)
+
+    @property
+    def listening(self):
+        """True enquanto a thread de escuta da wake word estiver ativa."""
+        return self._listening
+
     def stop_listening(self):
         """Para a escuta da wake word."""
         if not self._listening:
@@ -124,13 +424,37 @@ class STTEngine:
             self._listen_thread.join(timeout=2.0)
             self._listen_thread = None
 
+    def _keyword_callback(self, keyword, callback):
+        """Callback da palavra detectada e se ele grava um comando (o padrão, se ela não tiver um próprio)."""
+        handler = self._keyword_callbacks.get(keyword)
+        if handler is None:
+            logger.info("Palavra de ativação detectada!")
+            return callback, True
+        logger.info(f"Palavra-chave '{keyword}' detectada!")
+        return handler, False
+
     def _listen_loop(self, callback):
         """Loop de escuta executado em thread separada."""
-        if not self.porcupine:
+        if not self.wake_detector:
             logger.error("Porcupine não configurado. Abortando loop de escuta.")
             self._listening = False
             return
 
+        if self.capture is not None:
+            try:
+                self.capture.start()
+            except Exception as e:
+                logger.error(f"Falha ao abrir a captura contínua ({e}). Usando streams reabertos a cada ativação.")
+                self.capture = None
+            else:
+                self._listen_loop_shared(callback)
+                return
+
+        if not self.porcupine or not PYAUDIO_AVAILABLE:
+            logger.error("Sem captura contínua, a escuta precisa do Porcupine e do PyAudio. Abortando loop de escuta.")
+            self._listening = False
+            return
+
         pa = None
         audio_stream = None
 
@@ -153,11 +477,13 @@ class STTEngine:
                     # Note: read() bloqueia por um tempo curto (tamanho do buffer),
                     # então verificamos _listening no loop.
                     pcm = audio_stream.read(self.porcupine.frame_length, exception_on_overflow=False)
-                    pcm = struct.unpack_from("h" * self.porcupine.frame_length, pcm)
+                    self.noise_floor.update(pcm)
 
-                    keyword_index = self.porcupine.process(pcm)
-                    if keyword_index >= 0:
-                        logger.info("Palavra de ativação detectada!")
+                    # Sem tupla de inteiros por frame: os bytes vão direto para um buffer reutilizado
+                    keyword = self.wake_detector.process(pcm)
+                    if keyword is not None:
+                        self._interrupt_speech()
+                        handler, _ = self._keyword_callback(keyword, callback)
 
                         # Fecha o stream para liberar o microfone para o speech_recognition
                         if audio_stream:
@@ -168,7 +494,7 @@ class STTEngine:
                         # Chama o callback (que vai executar wake_up -> listen_for_command)
                         # Este callback é síncrono e vai bloquear esta thread, o que é desejado
                         # pois não queremos detectar wake word enquanto estamos processando um comando.
-                        callback()
+                        handler()
 
                         # Ao retornar do callback, o loop continua e o stream será reaberto.
 
@@ -194,6 +520,67 @@ class STTEngine:
                 pa.terminate()
             logger.info("Thread de escuta encerrada.")
 
+    def _listen_loop_shared(self, callback):
+        """Loop da wake word sobre a captura contínua (o microfone nunca é fechado)."""
+        reader = self.capture.reader()
+        last_frame = time.monotonic()
+
+        try:
+            while self._listening:
+                pcm = reader.read(timeout=0.5)
+                if pcm is None:
+                    if self.capture.ring.closed:
+                        break
+                    # Stream morto (dispositivo desconectado) ou sem callbacks: sem isso o loop ficaria surdo
+                    stalled = time.monotonic() - last_frame
+                    if not self.capture.running or stalled >= CAPTURE_STALL_SECONDS:
+                        self._restart_capture(stalled)
+                        last_frame = time.monotonic()
+                    continue
+                last_frame = time.monotonic()
+
+                self.noise_floor.update(pcm)
+                keyword = self.wake_detector.process(pcm)
+                if keyword is not None:
+                    # Barge-in no mesmo frame da detecção, antes de despachar o callback
+                    self._interrupt_speech()
+                    handler, records_command = self._keyword_callback(keyword, callback)
+                    if records_command and self._recording:
+                        # Wake word dita durante a gravação de um comando: já estamos ouvindo
+                        continue
+                    if records_command:
+                        # O comando será gravado a partir deste ponto do buffer (com pre-roll)
+                        self._wake_position = self._last_wake_position = reader.position
+                        if self.onset_detector is not None:
+                            self.onset_detector.reset()
+
+                    # O callback roda em outra thread: a detecção continua durante o comando
+                    # e a resposta, o que permite interromper a assistente a qualquer momento
+                    self._dispatch(handler, records_command)
+
+                elif self.onset_detector is not None and not self._recording and self._is_speaking():
+                    if self.onset_detector.process(pcm):
+                        logger.info("Usuário começou a falar durante a resposta (barge-in).")
+                        self._interrupt_speech()
+                        # Grava desde o início da fala detectada
+                        self._wake_position = self._last_wake_position = reader.position - self.onset_detector.min_frames
+                        self._dispatch(self._on_speech, True)
+
+        except Exception as e:
+            logger.critical(f"Falha fatal no loop de áudio: {e}", exc_info=True)
+        finally:
+            # Captura encerrada (ou fim do arquivo, com FileAudioSource)
+            self._listening = False
+            logger.info("Thread de escuta encerrada.")
+
+    def _restart_capture(self, stalled):
+        """Reabre a captura contínua parada; o buffer e a posição dos leitores são mantidos."""
+        logger.warning(f"Captura de áudio parada (sem frames há {stalled:.1f}s). Reabrindo o microfone...")
+        try:
+            self.capture.restart()
+        except Exception as e:
+            logger.error(f"Falha ao reabrir a captura de áudio (nova tentativa em seguida): {e}")
+
     def block_for_wake_word(self):
         """DEPRECATED: Mantido para compatibilidade, mas não recomendado."""
         logger.warning("block_for_wake_word está obsoleto. Use start_listening(callback) em vez disso.")
@@ -207,8 +594,7 @@ class STTEngine:
         try:
             while True:
                 pcm = stream.read(self.porcupine.frame_length, exception_on_overflow=False)
-                pcm = struct.unpack_from("h" * self.porcupine.frame_length, pcm)
-                if self.porcupine.process(pcm) >= 0:
+                if self.wake_detector.process(pcm) is not None:
                     return True
         finally:
             stream.close()
@@ -231,69 +617,270 @@ class STTEngine:
 
     def listen_for_command_async(self, timeout=10):
         """Ouve e inicia a transcrição em background. Retorna um Future."""
-        if not self.microphone:
+        if not self.microphone and self.capture is None:
             logger.error("Microfone não disponível, impossível ouvir o comando.")
             return None
 
         try:
             logger.info(f"Ouvindo comando (timeout de {timeout}s)...")
+            if self._capture_has_audio():
+                pcm = self._record_from_capture(timeout, phrase_time_limit=15)
+                logger.info("Áudio capturado. Iniciando transcrição em background...")
+                return self.executor.submit(self._recognize_pcm, pcm, self.capture.sample_rate,
+                                            self.capture.sample_width)
+
+            # Limiar atual do piso de ruído medido pelo loop da wake word
+            self.recognizer.energy_threshold = self.noise_floor.threshold
             with self.microphone as source:
-                # O ajuste dinâmico já está ativo, mas uma pequena recalibração ajuda
                 logger.info("Aguardando frase do usuário...") 
                 audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=15)
             
             logger.info("Áudio capturado. Iniciando transcrição em background...")
             
-            def recognize_task():
-                api_key = os.getenv('GOOGLE_API_KEY')
-                command = None
-
-                # Helper function inside task
-                def recognize_call(key=None):
-                    if key:
-                        return self.recognizer.recognize_google(audio, key=key, language='pt-BR')
-                    return self.recognizer.recognize_google(audio, language='pt-BR')
-
-                try:
-                    # 1. Tenta com a chave de API (melhor qualidade)
-                    if api_key and api_key != "sua_chave_google_speech_aqui":
-                        logger.debug("Tentando transcrever com GOOGLE_API_KEY...")
-                        command = recognize_call(key=api_key)
-                    else:
-                        raise sr.RequestError("Chave de API do Google não configurada.")
-                except sr.RequestError as e:
-                    # 2. Se a chave falhar (Unauthorized, offline, etc.), tenta o método padrão
-                    logger.warning(f"Erro com a API Key ({e}). Usando fallback para o serviço padrão.")
-                    try:
-                        command = recognize_call()
-                    except Exception as inner_e:
-                        logger.error(f"Serviço de reconhecimento padrão também falhou: {inner_e}")
-                        return None
-                except sr.UnknownValueError:
-                    logger.warning("Não foi possível entender o áudio.")
-                    return None
-
-                if command:
-                    logger.info(f"Comando reconhecido: '{command}'")
-                    return command.lower()
-                return None
-
             # Retorna o Future para que o chamador possa esperar ou continuar
-            return self.executor.submit(recognize_task)
+            return self.executor.submit(self._recognize, audio)
 
-        except sr.WaitTimeoutError:
+        except WaitTimeoutError:
             logger.warning("Timeout: Nenhum comando foi falado a tempo.")
             return None
         except Exception as e:
             logger.error(f"Erro inesperado ao ouvir comando: {e}", exc_info=True)
             return None
             
+    def _command_reader(self):
+        """Leitor do comando: começa `COMMAND_PREROLL_SECONDS` antes do fim da wake word."""
+        reader = self.capture.reader()
+        if self._wake_position is not None:
+            reader.seek(self._wake_position - self.capture.frames_for(COMMAND_PREROLL_SECONDS))
+            self._wake_position = None
+        return reader
+
+    def command_frames(self, timeout=10, phrase_time_limit=15):
+        """
+        Gera os frames do comando a partir do buffer da captura contínua.
+
+        Começa `COMMAND_PREROLL_SECONDS` antes do fim da wake word; o início e o
+        fim da fala são decididos pelo VAD/Endpointer. Os frames saem à medida
+        que chegam, para que o reconhecimento possa acompanhar a fala (ou para
+        que um benchmark use o próprio reconhecedor).
+
+        Raises:
+            WaitTimeoutError: Nenhuma fala a tempo, captura encerrada ou comando
+                substituído por uma ativação mais recente
+        """
+        token = getattr(self._flow, "token", None)
+        if token is None:
+            token = self._begin_recording()
+        elif not self._claim_recording(token):
+            # Uma nova wake word já iniciou outro comando: este fluxo não disputa o microfone com ele
+            logger.info("Comando substituído por uma ativação mais recente; gravação cancelada.")
+            raise WaitTimeoutError("Comando substituído por uma ativação mais recente")
+
+        recorder = CommandRecorder(self.endpointer, self.noise_floor, self.capture, timeout, phrase_time_limit)
+        reader = self._command_reader()
+
+        logger.info("Aguardando frase do usuário...")
+        try:
+            while not recorder.done:
+                pcm = reader.read(timeout=1.0)
+                if pcm is None:
+                    if self.capture.ring.closed:
+                        raise WaitTimeoutError("Captura de áudio encerrada")
+                    continue
+                yield from recorder.push(pcm)
+        finally:
+            # A partir daqui, a wake word volta a iniciar um novo comando (barge-in na resposta)
+            self._end_recording(token)
+
+    def _capture_has_audio(self):
+        """
+        True se o comando deve ser lido do buffer da captura contínua.
+
+        Vale também depois que a fonte terminou (ex.: fim de um FileAudioSource no
+        modo rápido): o áudio que já está no buffer continua sendo lido.
+        """
+        return self.capture is not None and (self.capture.running or self.capture.ring.closed)
+
+    def _record_from_capture(self, timeout, phrase_time_limit):
+        """Grava o comando completo (PCM) a partir da captura contínua."""
+        return b"".join(self.command_frames(timeout, phrase_time_limit))
+
+    def stream_transcripts(self, timeout=10, phrase_time_limit=15):
+        """
+        Ouve um comando e gera hipóteses parciais e a final enquanto o áudio chega.
+
+        Com um backend em streaming, o interpretador e o LLM podem começar a
+        trabalhar sobre o texto parcial antes do fim da fala; backends sem
+        streaming emitem apenas a transcrição final.
+
+        Yields:
+            Transcript: `text` (minúsculo), `is_final` e `elapsed`
+        """
+        if not self._capture_has_audio():
+            logger.error("Captura contínua não disponível; use listen_for_command.")
+            return
+
+        session = self.backend.open_session(self.capture.sample_rate, self.capture.sample_width)
+        try:
+            for transcript in stream_session(session, self.command_frames(timeout, phrase_time_limit)):
+                transcript.text = transcript.text.lower()
+                if transcript.is_final:
+                    logger.info(f"Comando reconhecido: '{transcript.text}'")
+                yield transcript
+        except WaitTimeoutError:
+            logger.warning("Timeout: Nenhum comando foi falado a tempo.")
+
+    # --- API assíncrona: roda em um único loop de eventos, sem thread de escuta ---
+
+    def _start_async_capture(self):
+        if self.capture is None or not self.wake_detector:
+            raise RuntimeError("A API assíncrona precisa da captura contínua e do Porcupine")
+        if self._listening:
+            raise RuntimeError("A escuta em thread (start_listening) já está ativa")
+        self.capture.start()
+
+    async def wait_for_wake(self):
+        """
+        Espera a próxima palavra-chave sem bloquear o loop de eventos.
+
+        Os frames chegam pelo callback do PyAudio, que só agenda o despertar do
+        loop; a detecção roda no próprio loop (microssegundos por frame).
+
+        Returns:
+            str: Palavra detectada (ex.: "kamila", "socorro") ou None se a captura for encerrada
+        """
+        self._start_async_capture()
+        loop = asyncio.get_running_loop()
+        if self._async_wake_reader is None or self._async_wake_reader.loop is not loop:
+            if self._async_wake_reader is not None:
+                self._async_wake_reader.close()
+            self._async_wake_reader = AsyncRingReader(self.capture.reader(), loop)
+        reader = self._async_wake_reader
+        # O áudio anterior já foi consumido (ou descartado) pelo comando
+        reader.reader.skip_to_live()
+
+        while True:
+            pcm = await reader.read()
+            if pcm is None:
+                return None
+            self.noise_floor.update(pcm)
+            keyword = self.wake_detector.process(pcm)
+            if keyword is not None:
+                logger.info(f"Palavra-chave '{keyword}' detectada!")
+                self._interrupt_speech()
+                self._wake_position = self._last_wake_position = reader.reader.position
+                return keyword
+
+    async def stream_transcripts_async(self, timeout=10, phrase_time_limit=15):
+        """
+        Versão assíncrona de `stream_transcripts` (mesmos objetos Transcript).
+
+        Frames vêm do buffer sem thread de espera; o reconhecimento em si (rede
+        ou modelo local) roda no pool de reconhecimento.
+        """
+        self._start_async_capture()
+        loop = asyncio.get_running_loop()
+        recorder = CommandRecorder(self.endpointer, self.noise_floor, self.capture, timeout, phrase_time_limit)
+        reader = AsyncRingReader(self._command_reader(), loop)
+        session = self.backend.open_session(self.capture.sample_rate, self.capture.sample_width)
+        start = time.perf_counter()
+        last_partial = None
+
+        logger.info("Aguardando frase do usuário...")
+        try:
+            while not recorder.done:
+                pcm = await reader.read()
+                if pcm is None:
+                    raise WaitTimeoutError("Captura de áudio encerrada")
+                for frame in recorder.push(pcm):
+                    if self.backend.streaming:
+                        partial = await loop.run_in_executor(self._recognition_executor, session.feed, frame)
+                    else:
+                        partial = session.feed(frame)
+                    if partial and partial != last_partial:
+                        last_partial = partial
+                        yield Transcript(partial.lower(), False, time.perf_counter() - start)
+            final = await loop.run_in_executor(self._recognition_executor, session.finish)
+        except WaitTimeoutError:
+            logger.warning("Timeout: Nenhum comando foi falado a tempo.")
+            return
+        finally:
+            reader.close()
+
+        if final:
+            logger.info(f"Comando reconhecido: '{final.lower()}'")
+            yield Transcript(final.lower(), True, time.perf_counter() - start)
+
+    async def commands(self, timeout=10, phrase_time_limit=15, keyword_callbacks=None):
+        """
+        Gera, indefinidamente, as transcrições dos comandos ditos após a wake word.
+
+        Args:
+            keyword_callbacks (dict): Callback (função ou corrotina) por palavra-chave;
+                essas palavras não gravam comando (ex.: {"socorro": on_emergency})
+
+        Yields:
+            Transcript: Parciais e a final de cada comando
+        """
+        keyword_callbacks = keyword_callbacks or {}
+        while True:
+            keyword = await self.wait_for_wake()
+            if keyword is None:
+                return
+
+            handler = keyword_callbacks.get(keyword)
+            if handler is not None:
+                self._wake_position = None
+                result = handler()
+                if inspect.isawaitable(result):
+                    await result
+                continue
+
+            async for transcript in self.stream_transcripts_async(timeout, phrase_time_limit):
+                yield transcript
+
+    @property
+    def last_wake_time(self):
+        """Instante (s de áudio desde o início da captura) da última ativação, ou None."""
+        if self._last_wake_position is None or self.capture is None:
+            return None
+        return self._last_wake_position * self.capture.frame_duration
+
+    @property
+    def current_energy_threshold(self):
+        """Limiar de energia de fala atual (acompanha o ruído do ambiente)."""
+        return self.noise_floor.threshold
+
+    def get_endpoint_stats(self):
+        """Latência de endpoint (silêncio aguardado antes de encerrar cada comando)."""
+        return self.endpointer.get_stats() if self.endpointer else {}
+
+    def _recognize(self, audio):
+        """Transcreve o áudio capturado pelo microfone (sr.AudioData) com o backend configurado."""
+        return self._recognize_pcm(audio.get_raw_data(), audio.sample_rate, audio.sample_width)
+
+    def _recognize_pcm(self, pcm, sample_rate, sample_width):
+        """Transcreve um comando em PCM com o backend configurado."""
+        command = self.backend.recognize(pcm, sample_rate, sample_width)
+        if command:
+            logger.info(f"Comando reconhecido: '{command}'")
+            return command.lower()
+        return None
+
     def cleanup(self):
         """Limpa recursos."""
         logger.info("Limpando STT Engine...")
         self.stop_listening() # Garante que a thread pare
-        if self.porcupine:
-            self.porcupine.delete()
+        if self._async_wake_reader is not None:
+            self._async_wake_reader.close()
+        if self.capture is not None:
+            self.capture.stop()
+        if self.wake_detector:
+            self.wake_detector.delete()
         logger.info("STT Engine limpo!")
         self.executor.shutdown(wait=False)
+        self._callback_executor.shutdown(wait=False)
+        self._recognition_executor.shutdown(wait=False)
+        self._hedge_executor.shutdown(wait=False)
+        self.backend.close()
         logger.info("STT Engine limpo!")
\ No newline at end of file
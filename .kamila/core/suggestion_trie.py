@@ -0,0 +1,103 @@
+"""
+Suggestion Trie - Autocompletar de Comandos para Kamila
+Trie de prefixos sobre os exemplos de comandos, ordenada pela frequência de uso.
+Cada nó guarda os k melhores complementos, de modo que uma consulta custa
+proporcionalmente ao tamanho do prefixo.
+"""
+
+import threading
+from typing import Dict, Iterable, List
+
+
+class _Node:
+    """Nó da trie: filhos por caractere e os melhores complementos da subárvore."""
+
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.top: List[str] = []
+
+
+class SuggestionTrie:
+    """Trie de sugestões com ranking por frequência de uso (empates seguem a ordem de inserção)."""
+
+    def __init__(self, top_k: int = 10):
+        """
+        Inicializa a trie.
+
+        Args:
+            top_k (int): Quantidade máxima de complementos mantidos por nó
+        """
+        # Um a mais para compensar a exclusão do próprio prefixo nas consultas
+        self.top_k = top_k + 1
+        self._root = _Node()
+        self._counts: Dict[str, int] = {}
+        self._order: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _rank(self, text: str):
+        return -self._counts[text], self._order[text]
+
+    def _update_path(self, text: str, create: bool):
+        """Reordena o top-k de cada nó no caminho de `text` (criando nós se pedido)."""
+        node = self._root
+        path = [node]
+        for char in text:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return
+                child = node.children[char] = _Node()
+            node = child
+            path.append(node)
+
+        for node in path:
+            if text not in node.top:
+                node.top.append(text)
+            node.top.sort(key=self._rank)
+            del node.top[self.top_k:]
+
+    def insert(self, texts: Iterable[str]):
+        """Adiciona exemplos de comandos (exemplos já conhecidos são ignorados)."""
+        with self._lock:
+            for text in texts:
+                text = text.lower().strip()
+                if not text or text in self._counts:
+                    continue
+                self._counts[text] = 0
+                self._order[text] = len(self._order)
+                self._update_path(text, create=True)
+
+    def record_usage(self, text: str) -> bool:
+        """Incrementa a frequência de uso de um exemplo; retorna False se ele não existir."""
+        text = text.lower().strip()
+        with self._lock:
+            if text not in self._counts:
+                return False
+            self._counts[text] += 1
+            self._update_path(text, create=False)
+            return True
+
+    def complete(self, prefix: str, k: int = 3) -> List[str]:
+        """Retorna até k complementos mais usados que começam com `prefix` (e são maiores que ele)."""
+        prefix = prefix.lower()
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [text for text in node.top if len(text) > len(prefix)][:k]
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __getstate__(self):
+        # O lock não é serializável (a trie é gravada no cache do catálogo compilado)
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
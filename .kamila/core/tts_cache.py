@@ -0,0 +1,202 @@
+"""
+TTS Cache - Áudio Pré-Renderizado para Kamila
+Guarda em disco o áudio já sintetizado das frases fixas (saudações, avisos,
+alertas de emergência), endereçado pelo conteúdo: a chave é o hash de (texto,
+voz, velocidade, volume). Uma frase em cache toca direto do WAV, sem passar
+pelo pyttsx3, e começa em milissegundos. O cache é limitado por tamanho, com
+descarte do arquivo usado há mais tempo (LRU).
+"""
+
+import os
+import json
+import wave
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyaudio
+    PYAUDIO_AVAILABLE = True
+except ImportError:
+    PYAUDIO_AVAILABLE = False
+
+KAMILA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(KAMILA_DIR, 'cache', 'tts')
+DEFAULT_MAX_MB = 50
+
+
+def cache_key(text: str, voice_id: Optional[str], rate: int, volume: float) -> str:
+    """Hash do conteúdo: o mesmo texto com outra voz, velocidade ou volume é outro arquivo."""
+    payload = json.dumps([text, voice_id, int(rate), round(float(volume), 3)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Arquivos WAV endereçados pelo conteúdo, com limite de tamanho total (LRU)."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        """
+        Inicializa o cache (os arquivos já existentes em disco são reaproveitados).
+
+        Args:
+            directory (str): Diretório dos arquivos
+            max_bytes (int): Tamanho total máximo; acima dele, os menos usados são apagados
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # chave -> tamanho, do menos ao mais usado
+        self.total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        files = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith(".wav"):
+                files.append((os.path.getmtime(path), name[:-4], os.path.getsize(path)))
+            elif name.endswith(".tmp"):
+                os.remove(path)  # renderização interrompida
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".wav")
+
+    def get(self, key: str) -> Optional[str]:
+        """Caminho do áudio da chave (marcado como usado agora) ou None."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        path = self.path(key)
+        try:
+            os.utime(path)  # a ordem de uso sobrevive a reinícios
+        except OSError:
+            self.discard(key)
+            return None
+        return path
+
+    def store(self, key: str, render: Callable[[str], None]) -> Optional[str]:
+        """
+        Renderiza o áudio da chave com `render(caminho)` e o adiciona ao cache.
+
+        Returns:
+            str: Caminho do arquivo, ou None se a renderização não gerou áudio
+        """
+        path = self.path(key)
+        temp = path + ".tmp"
+        try:
+            render(temp)
+            if not os.path.exists(temp) or os.path.getsize(temp) == 0:
+                raise RuntimeError("arquivo de áudio vazio")
+            os.replace(temp, path)
+        except Exception as e:
+            logger.error(f"Erro ao renderizar áudio para o cache: {e}")
+            if os.path.exists(temp):
+                os.remove(temp)
+            return None
+
+        size = os.path.getsize(path)
+        with self._lock:
+            self.total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict()
+        return path
+
+    def discard(self, key: str):
+        """Remove uma entrada (ex.: arquivo corrompido ou apagado por fora)."""
+        with self._lock:
+            self.total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+            logger.debug(f"Áudio {key[:12]} descartado do cache (LRU)")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class WavPlayer:
+    """Toca arquivos WAV pelo PyAudio, em blocos, com parada entre os blocos."""
+
+    def __init__(self, chunk: int = 1024):
+        if not PYAUDIO_AVAILABLE:
+            raise RuntimeError("pyaudio não instalado")
+        self.chunk = chunk
+        self._pa = None  # Criado na primeira reprodução (na thread de fala)
+
+    def play(self, path: str, should_stop: Optional[Callable[[], bool]] = None) -> bool:
+        """Toca o arquivo; retorna False se `should_stop()` interromper a reprodução."""
+        if self._pa is None:
+            self._pa = pyaudio.PyAudio()
+        with wave.open(path, 'rb') as wf:
+            stream = self._pa.open(
+                format=self._pa.get_format_from_width(wf.getsampwidth()),
+                channels=wf.getnchannels(),
+                rate=wf.getframerate(),
+                output=True
+            )
+            try:
+                data = wf.readframes(self.chunk)
+                while data:
+                    if should_stop is not None and should_stop():
+                        return False
+                    stream.write(data)
+                    data = wf.readframes(self.chunk)
+            finally:
+                stream.stop_stream()
+                stream.close()
+        return True
+
+    def close(self):
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+
+
+def create_tts_cache() -> Optional[TTSCache]:
+    """
+    Cria o cache configurado (`TTS_CACHE_DIR`, `TTS_CACHE_MAX_MB`).
+
+    `TTS_CACHE=0` desativa o cache; sem pyaudio também não há cache, já que
+    o áudio em disco não teria como ser tocado.
+    """
+    if os.getenv('TTS_CACHE', '1').strip().lower() in ('0', 'false', 'no'):
+        return None
+    if not PYAUDIO_AVAILABLE:
+        logger.info("pyaudio não instalado; cache de áudio do TTS desativado.")
+        return None
+    try:
+        max_mb = float(os.getenv('TTS_CACHE_MAX_MB', DEFAULT_MAX_MB))
+        return TTSCache(os.getenv('TTS_CACHE_DIR', DEFAULT_CACHE_DIR), int(max_mb * 1024 * 1024))
+    except Exception as e:
+        logger.error(f"Erro ao criar o cache de áudio do TTS: {e}")
+        return None
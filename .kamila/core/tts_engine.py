@@ -2,42 +2,94 @@
 """
 TTS Engine - Text-to-Speech para Kamila
 Motor de síntese de voz usando pyttsx3.
-VERSÃO OTIMIZADA - Reutiliza a instância do motor para performance.
+VERSÃO OTIMIZADA - Uma thread dedicada é dona do motor e fala os textos de uma
+fila de prioridades; alertas de emergência interrompem a fala em andamento.
+Frases fixas pré-renderizadas tocam direto do cache de áudio (tts_cache.py).
 """
 
 import os
+import heapq
+import itertools
 import logging
 import threading
-import pyttsx3
-import threading
+import queue
+from concurrent.futures import Future
+from typing import Callable, Iterable, List, Optional
 from dotenv import load_dotenv
 import re
 
+from .tts_cache import TTSCache, WavPlayer, cache_key, create_tts_cache
+
+try:
+    import pyttsx3
+    PYTTSX3_AVAILABLE = True
+except ImportError:
+    PYTTSX3_AVAILABLE = False
+
 load_dotenv(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '.env'))
 
 logger = logging.getLogger(__name__)
 
+# Prioridades da fila de fala (menor = mais urgente)
+PRIORITY_EMERGENCY = 0  # Interrompe a fala atual e descarta a fila menos urgente
+PRIORITY_HIGH = 1
+PRIORITY_NORMAL = 5
+PRIORITY_BACKGROUND = 9  # Pré-renderização do cache (não toca áudio)
+
+_STOP = object()
+
+
 class TTSEngine:
-    """Motor de síntese de voz otimizado que reutiliza a instância do motor."""
+    """Motor de síntese de voz com uma thread dedicada e fila de prioridades."""
 
-    def __init__(self):
-        """Inicializa as configurações do motor TTS e o próprio motor."""
-        logger.info("Inicializando TTS Engine...")
-        self._lock = threading.Lock()
+    def __init__(self, engine_factory=None, cache: Optional[TTSCache] = None, player=None):
+        """
+        Inicializa o motor TTS e a thread de fala (dona do motor pyttsx3).
 
-        # Initialize engine once
-        try:
-            self.engine = pyttsx3.init()
-        except Exception as e:
-            logger.error(f"Failed to initialize pyttsx3 engine: {e}")
-            raise
+        Args:
+            engine_factory: Função que cria o motor (padrão: pyttsx3.init); chamada na thread de fala
+            cache (TTSCache): Cache de áudio pré-renderizado (padrão: `create_tts_cache()` com o
+                motor real; com um motor injetado, só é usado se passado explicitamente)
+            player: Objeto com `play(caminho, should_stop) -> bool` (padrão: WavPlayer)
+        """
+        logger.info("Inicializando TTS Engine...")
+        self._lock = threading.RLock()
+        self._engine_factory = engine_factory or (pyttsx3.init if PYTTSX3_AVAILABLE else None)
+        if self._engine_factory is None:
+            raise RuntimeError("pyttsx3 não instalado")
 
-        self.voice_id = self._get_portuguese_voice_id()
+        self.engine = None
+        self.voice_id = None
         self.rate = int(os.getenv('VOICE_RATE', 180))
         self.volume = float(os.getenv('VOICE_VOLUME', 0.9))
-        
-        # Configure initial properties
-        self._configure_engine()
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()  # Ordem de chegada dentro da mesma prioridade
+        self._current = None  # Item sendo falado agora
+        self._preempt = threading.Event()
+        self._rendering = False
+        self.interruptions = 0  # Quantas vezes a fala foi interrompida (barge-in, emergência)
+
+        if cache is None and engine_factory is None:
+            cache = create_tts_cache()
+        if cache is not None and player is None:
+            try:
+                player = WavPlayer()
+            except RuntimeError as e:
+                logger.warning(f"Cache de áudio do TTS desativado: {e}")
+                cache = None
+        self.cache = cache
+        self.player = player
+
+        # O motor é criado na própria thread de fala (drivers como o SAPI5 não toleram troca de thread)
+        self._ready = threading.Event()
+        self._init_error = None
+        self._worker = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+        self._worker.start()
+        self._ready.wait()
+        if self._init_error is not None:
+            logger.error(f"Failed to initialize pyttsx3 engine: {self._init_error}")
+            raise self._init_error
 
         if self.voice_id:
             logger.info(f"Voz em Português encontrada e configurada.")
@@ -47,6 +99,147 @@ class TTSEngine:
         logger.info(f"Volume: {self.volume}, Velocidade: {self.rate} WPM")
         logger.info("TTS Engine configurado com sucesso!")
 
+    def _start_engine(self):
+        """Cria e configura o motor (na thread de fala)."""
+        self.engine = self._engine_factory()
+        self.voice_id = self._get_portuguese_voice_id()
+        self._configure_engine()
+        try:
+            # Ponto de interrupção: a cada palavra, verifica se há alerta mais urgente
+            self.engine.connect('started-word', self._on_word)
+        except Exception as e:
+            logger.warning(f"Motor TTS sem eventos de palavra; a interrupção vale só entre frases: {e}")
+
+    def _on_word(self, name, location, length):
+        if self._preempt.is_set() and not self._rendering:
+            self.engine.stop()
+
+    def _run(self):
+        """Loop da thread de fala: uma frase por vez, sempre a mais urgente da fila."""
+        try:
+            self._start_engine()
+        except Exception as e:
+            self._init_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        while True:
+            item = self._take()
+            priority, _, text, future, on_start, mode = item
+            if text is _STOP:
+                break
+            if not future.set_running_or_notify_cancel():
+                self._current = None
+                continue
+            if self._preempt.is_set():
+                # Interrompido entre sair da fila e começar a tocar
+                self._current = None
+                future.set_result(False)
+                continue
+
+            try:
+                if on_start is not None:
+                    try:
+                        on_start()
+                    except Exception as e:
+                        logger.error(f"Erro no callback de início da fala: {e}")
+                completed = self._speak_item(text, mode)
+            except Exception as e:
+                # Um erro inesperado (cache, player, motor) não pode matar a única thread de fala
+                logger.error(f"Erro inesperado na thread de fala: {e}")
+                self._current = None
+                future.set_exception(e)
+                continue
+            self._current = None
+            future.set_result(completed and not self._preempt.is_set())
+
+    def _take(self):
+        """
+        Tira o item mais urgente da fila e o publica como atual, atomicamente.
+
+        Usa a mesma trava de `interrupt`: o item nunca fica fora da fila e fora de
+        `_current` ao mesmo tempo, então nenhuma interrupção o deixa passar.
+        """
+        with self._queue.not_empty:
+            while not self._queue.queue:
+                self._queue.not_empty.wait()
+            item = heapq.heappop(self._queue.queue)
+            if item[2] is not _STOP:
+                self._preempt.clear()
+                self._current = item
+            return item
+
+    def _speak_item(self, text: str, mode: str) -> bool:
+        """
+        Fala um item da fila, tocando do cache quando o áudio já foi renderizado.
+
+        Modos: "speak" (sintetiza se não estiver em cache), "cache" (renderiza para o
+        cache antes de tocar), "urgent" (sintetiza na hora se não estiver em cache e
+        renderiza em segundo plano depois) e "warm" (só renderiza, sem tocar).
+        """
+        if self.cache is not None:
+            key = cache_key(text, self.voice_id, self.rate, self.volume)
+            render = lambda target: self._render(text, target)
+            if mode == "warm":
+                return key in self.cache or self.cache.store(key, render) is not None
+
+            path = self.cache.get(key)
+            if path is None and mode == "cache":
+                path = self.cache.store(key, render)
+            if path is not None:
+                try:
+                    logger.info(f"Tocando do cache: '{text[:70]}...'")
+                    if not self.player.play(path, self._preempt.is_set):
+                        logger.info("Fala interrompida por uma mensagem mais urgente.")
+                    return True
+                except Exception as e:
+                    logger.error(f"Erro ao tocar o áudio do cache; sintetizando: {e}")
+                    self.cache.discard(key)
+        if mode == "warm":
+            return False
+        spoken = self._say(text)
+        if mode == "urgent" and self.cache is not None and key not in self.cache:
+            # A emergência não espera a renderização; o arquivo fica pronto para a próxima vez
+            self._queue.put((PRIORITY_BACKGROUND, next(self._sequence), text, Future(), None, "warm"))
+        return spoken
+
+    def _render(self, text: str, target: str):
+        """Sintetiza o texto para um arquivo WAV (sem tocar)."""
+        with self._lock:
+            self._rendering = True
+            try:
+                self._configure_engine()
+                self.engine.save_to_file(text, target)
+                self.engine.runAndWait()
+            finally:
+                self._rendering = False
+
+    def _say(self, text: str) -> bool:
+        with self._lock:
+            try:
+                # Re-apply configuration just in case properties were changed externally
+                # or reset (though typically they persist)
+                self._configure_engine()
+
+                logger.info(f"Preparando para falar: '{text[:70]}...'")
+
+                self.engine.say(text)
+                self.engine.runAndWait()
+
+                if self._preempt.is_set():
+                    logger.info("Fala interrompida por uma mensagem mais urgente.")
+                else:
+                    logger.info("Fala concluída com sucesso.")
+                return True
+
+            except RuntimeError as re_err:
+                logger.error(f"Erro de Runtime no TTS (loop já rodando?): {re_err}")
+            except Exception as e:
+                logger.error(f"Erro CRÍTICO durante a execução da fala: {e}")
+                print(f"Kamila (erro de voz): {text}")
+            return False
+
     def _configure_engine(self):
         """Aplica as configurações atuais ao motor."""
         try:
@@ -89,78 +282,129 @@ class TTSEngine:
         except Exception:
             return text.encode('ascii', 'ignore').decode('ascii')
 
-    def speak(self, text: str):
-        """Fala o texto usando o motor compartilhado de forma segura."""
+    def submit(self, text: str, priority: int = PRIORITY_NORMAL,
+               on_start: Optional[Callable[[], None]] = None, cache: bool = False) -> Future:
+        """
+        Coloca o texto na fila de fala sem bloquear.
+
+        Com `PRIORITY_EMERGENCY`, a fala em andamento é interrompida (na próxima
+        palavra) e a fila menos urgente é descartada. `on_start` é chamado na
+        thread de fala logo antes da frase começar a tocar. Com `cache=True`, o
+        áudio é renderizado para o cache (se ainda não estiver lá) e tocado do arquivo;
+        em emergências fora do cache, a frase é sintetizada na hora e renderizada
+        para o cache em segundo plano.
+
+        Returns:
+            Future: True quando a frase for falada por inteiro, False se falhar ou
+                for interrompida; cancelado se for descartado da fila
+        """
+        future = Future()
         if not text or not text.strip():
             logger.warning("Texto vazio para falar. Ignorando.")
-            return
+            future.set_result(False)
+            return future
 
-        sanitized_text = self._sanitize_text(text)
+        if priority <= PRIORITY_EMERGENCY:
+            self.interrupt(priority)
+        mode = "speak"
+        if cache and self.cache is not None:
+            mode = "urgent" if priority <= PRIORITY_EMERGENCY else "cache"
+        self._queue.put((priority, next(self._sequence), self._sanitize_text(text), future, on_start, mode))
+        return future
 
-        with self._lock:
-            try:
-                # Re-apply configuration just in case properties were changed externally
-                # or reset (though typically they persist)
-                self._configure_engine()
+    def warm_cache(self, phrases: Iterable[str]) -> List[Future]:
+        """
+        Pré-renderiza frases fixas no cache de áudio, em segundo plano.
 
-                logger.info(f"Preparando para falar: '{sanitized_text[:70]}...'")
+        As renderizações entram na fila com `PRIORITY_BACKGROUND` (qualquer fala
+        passa à frente) e não são descartadas por `interrupt`.
 
-                self.engine.say(sanitized_text)
-                self.engine.runAndWait()
+        Returns:
+            list: Um Future por frase (True quando o áudio estiver no cache)
+        """
+        if self.cache is None:
+            return []
+        futures = []
+        for phrase in phrases:
+            if phrase and phrase.strip():
+                future = Future()
+                self._queue.put((PRIORITY_BACKGROUND, next(self._sequence), self._sanitize_text(phrase),
+                                 future, None, "warm"))
+                futures.append(future)
+        return futures
 
-                logger.info("Fala concluída com sucesso.")
+    def interrupt(self, priority: int = None) -> int:
+        """
+        Interrompe a fala atual e descarta a fila.
 
-            except RuntimeError as re_err:
-                logger.error(f"Erro de Runtime no TTS (loop já rodando?): {re_err}")
-            except Exception as e:
-                logger.error(f"Erro CRÍTICO durante a execução da fala: {e}")
-                print(f"Kamila (erro de voz): {sanitized_text}")
+        Args:
+            priority (int): Só afeta mensagens menos urgentes que esta (None = todas)
 
-    def cleanup(self):
-        """Libera recursos se necessário."""
-        # pyttsx3 engine doesn't have an explicit close/destroy method exposed easily,
-        # but we can stop the loop if running.
-        with self._lock:
-            try:
-                self.engine.stop()
-            except:
-                pass
-        logger.info("TTS Engine cleanup executado.")
-        
-    def speak_async(self, text: str):
+        Returns:
+            int: Quantidade de mensagens descartadas da fila
         """
-        Versão que não bloqueia o programa.
-        Nota: pyttsx3 runAndWait é bloqueante. Para ser verdadeiramente async,
-        isso deveria rodar em uma thread separada.
-        Nesta implementação otimizada, mantemos o comportamento de bloqueio da thread chamada,
-        mas usamos o lock para evitar colisão.
-        """
-        if not text or not text.strip():
-            return
+        def affected(item):
+            return item[2] is not _STOP and item[5] != "warm" and (priority is None or item[0] > priority)
 
-        sanitized_text = self._sanitize_text(text)
+        with self._queue.mutex:
+            dropped = [item for item in self._queue.queue if affected(item)]
+            if dropped:
+                self._queue.queue[:] = [item for item in self._queue.queue if not affected(item)]
+                heapq.heapify(self._queue.queue)
+            # Na mesma trava de `_take`: o item atual é sempre visto aqui ou na fila
+            current = self._current
+            if current is not None and affected(current):
+                self._preempt.set()
 
-        def _speak_thread():
-            try:
-                engine = pyttsx3.init()
-                if self.voice_id:
-                    engine.setProperty('voice', self.voice_id)
-                engine.setProperty('rate', self.rate)
-                engine.setProperty('volume', self.volume)
+        for item in dropped:
+            item[3].cancel()
 
-                engine.say(sanitized_text)
+        if dropped or self._preempt.is_set():
+            self.interruptions += 1
+        if dropped:
+            logger.info(f"{len(dropped)} mensagem(ns) descartada(s) da fila de fala.")
+        return len(dropped)
 
-                engine.runAndWait()
+    @property
+    def speaking(self) -> bool:
+        """True enquanto uma frase está tocando (renderizações do cache não contam)."""
+        current = self._current
+        return current is not None and current[5] != "warm"
 
-            except Exception as e:
-                logger.error(f"Erro no speak_async: {e}")
+    def speak(self, text: str, priority: int = PRIORITY_NORMAL):
+        """Fala o texto pela thread de fala e espera terminar."""
+        if threading.current_thread() is self._worker:
+            # Chamado de dentro da thread de fala (ex.: callback do motor): fala direto
+            self._speak_item(self._sanitize_text(text), "speak")
+            return
+        future = self.submit(text, priority)
+        try:
+            future.result()
+        except Exception:
+            pass
 
-        thread = threading.Thread(target=_speak_thread)
-        thread.start()
-        with self._lock:
-            try:
-                self._configure_engine()
-                self.engine.say(sanitized_text)
-                self.engine.runAndWait()
-            except Exception as e:
-                logger.error(f"Erro no speak_async: {e}")
\ No newline at end of file
+    def cleanup(self):
+        """Interrompe a fala, descarta a fila e encerra a thread de fala."""
+        self.interrupt()
+        self._queue.put((float("-inf"), next(self._sequence), _STOP, None, None, None))
+        self._worker.join(timeout=2.0)
+        with self._queue.mutex:
+            pending = [item for item in self._queue.queue if item[2] is not _STOP]
+            self._queue.queue[:] = [item for item in self._queue.queue if item[2] is _STOP]
+        for item in pending:
+            item[3].cancel()  # Renderizações do cache que não chegaram a rodar
+        if self.player is not None:
+            self.player.close()
+        if self.cache is not None:
+            logger.info(f"Cache de áudio do TTS: {self.cache.get_stats()}")
+        logger.info("TTS Engine cleanup executado.")
+        
+    def speak_async(self, text: str, priority: int = PRIORITY_NORMAL) -> Future:
+        """
+        Versão que não bloqueia o programa: enfileira o texto na thread de fala
+        (mesmo motor, uma única síntese) e retorna na hora.
+
+        Returns:
+            Future: O mesmo de `submit` (True quando a frase terminar de ser falada)
+        """
+        return self.submit(text, priority)
@@ -0,0 +1,309 @@
+"""
+VAD - Detecção de Atividade de Voz e Fim de Fala para Kamila
+Classifica os frames da captura contínua como fala ou silêncio (energia +
+taxa de cruzamento por zero, ou WebRTC VAD quando instalado) e decide o fim do
+comando de forma adaptativa, em vez de esperar uma pausa fixa de 1,5 s. O piso
+de ruído é acompanhado continuamente sobre o áudio sempre ativo.
+"""
+
+import os
+import logging
+from collections import deque
+from typing import Dict, Optional
+
+from .audio_frames import frame_rms, zero_crossing_rate
+
+logger = logging.getLogger(__name__)
+
+try:
+    import webrtcvad
+    WEBRTCVAD_AVAILABLE = True
+except ImportError:
+    WEBRTCVAD_AVAILABLE = False
+
+
+class NoiseFloorEstimator:
+    """
+    Estimativa contínua do piso de ruído sobre os frames sempre ativos.
+
+    Roda no loop da wake word (inclusive fora dos comandos) e segue o mínimo da
+    energia na janela recente: as pausas entre palavras mantêm o piso no nível
+    do ambiente enquanto alguém fala, mas um ruído persistente (TV, ventilador)
+    eleva o piso em poucos segundos. O limiar de fala deriva desse piso.
+    """
+
+    def __init__(self, initial_threshold: float = 400.0, min_threshold: float = 150.0,
+                 max_threshold: float = 4000.0, noise_ratio: float = 3.0,
+                 window: int = 40, smoothing: float = 0.2, stride: int = 4):
+        """
+        Inicializa o estimador.
+
+        Args:
+            initial_threshold (float): Limiar usado até o primeiro frame ser medido
+            min_threshold (float): Limiar mínimo (ambientes muito silenciosos)
+            max_threshold (float): Limiar máximo
+            noise_ratio (float): Quanto acima do piso de ruído a fala precisa estar
+            window (int): Medições consideradas no mínimo (40 x 4 frames ≈ 5 s a 16 kHz)
+            smoothing (float): Suavização do piso entre medições (0 a 1)
+            stride (int): Mede 1 a cada `stride` frames (o piso muda devagar)
+        """
+        self.initial_threshold = initial_threshold
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.noise_ratio = noise_ratio
+        self.smoothing = smoothing
+        self.stride = max(1, stride)
+        self.noise_floor: Optional[float] = None
+        self._recent = deque(maxlen=window)
+        self._frames = 0
+
+    @property
+    def threshold(self) -> float:
+        """Limiar de energia de fala atual."""
+        if self.noise_floor is None:
+            return self.initial_threshold
+        return min(self.max_threshold, max(self.min_threshold, self.noise_floor * self.noise_ratio))
+
+    def update(self, frame: bytes) -> float:
+        """Considera um frame do áudio contínuo; retorna o limiar atual."""
+        self._frames += 1
+        if self._frames % self.stride:
+            return self.threshold
+
+        self._recent.append(frame_rms(frame))
+        minimum = min(self._recent)
+        if self.noise_floor is None:
+            self.noise_floor = minimum
+        else:
+            self.noise_floor += self.smoothing * (minimum - self.noise_floor)
+        return self.threshold
+
+
+class OnsetDetector:
+    """
+    Detecta o início de fala do usuário enquanto a assistente fala (barge-in).
+
+    Sem cancelamento de eco, o microfone também capta o alto-falante; por isso
+    o limiar é o do piso de ruído multiplicado por `ratio` e a fala precisa
+    durar `min_speech` segundos seguidos para contar.
+    """
+
+    def __init__(self, noise_estimator: NoiseFloorEstimator, frame_duration: float,
+                 min_speech: float = 0.25, ratio: float = 2.0):
+        """
+        Inicializa o detector.
+
+        Args:
+            noise_estimator (NoiseFloorEstimator): Piso de ruído contínuo
+            frame_duration (float): Duração de um frame em segundos
+            min_speech (float): Fala contínua necessária para disparar
+            ratio (float): Quanto acima do limiar de fala normal a energia precisa estar
+        """
+        self.noise_estimator = noise_estimator
+        self.ratio = ratio
+        self.min_frames = max(1, int(round(min_speech / frame_duration)))
+        self.reset()
+
+    def reset(self):
+        self._run = 0
+
+    def process(self, frame: bytes) -> bool:
+        """Processa um frame; True no frame em que o início de fala é confirmado."""
+        if frame_rms(frame) > self.noise_estimator.threshold * self.ratio:
+            self._run += 1
+        else:
+            self._run = 0
+        if self._run >= self.min_frames:
+            self._run = 0
+            return True
+        return False
+
+
+class EnergyVAD:
+    """
+    VAD por energia e cruzamentos por zero, com piso de ruído adaptativo.
+
+    Um frame é fala quando a energia supera o limiar e o ZCR é compatível com
+    voz, ou quando a energia é muito alta (consoantes fricativas têm ZCR alto).
+    O piso de ruído acompanha os frames de silêncio, de modo que o limiar sobe
+    em ambientes barulhentos.
+    """
+
+    def __init__(self, energy_threshold: float = 400.0, noise_ratio: float = 3.0,
+                 max_zcr: float = 0.35, adapt_rate: float = 0.05,
+                 noise_estimator: Optional[NoiseFloorEstimator] = None):
+        """
+        Inicializa o VAD.
+
+        Args:
+            energy_threshold (float): Limiar mínimo de energia RMS
+            noise_ratio (float): Quanto acima do piso de ruído a energia precisa estar
+            max_zcr (float): ZCR máximo para frames de energia moderada contarem como fala
+            adapt_rate (float): Velocidade de adaptação do piso de ruído (0 a 1)
+            noise_estimator (NoiseFloorEstimator): Piso de ruído contínuo (o limiar
+                nunca fica abaixo do limiar dele)
+        """
+        self.min_threshold = energy_threshold
+        self.noise_ratio = noise_ratio
+        self.max_zcr = max_zcr
+        self.adapt_rate = adapt_rate
+        self.noise_floor: Optional[float] = None
+        self.noise_estimator = noise_estimator
+
+    @property
+    def threshold(self) -> float:
+        """Limiar de energia atual."""
+        threshold = self.min_threshold
+        if self.noise_floor is not None:
+            threshold = max(threshold, self.noise_floor * self.noise_ratio)
+        if self.noise_estimator is not None:
+            threshold = max(threshold, self.noise_estimator.threshold)
+        return threshold
+
+    def is_speech(self, frame: bytes) -> bool:
+        energy = frame_rms(frame)
+        threshold = self.threshold
+
+        if energy > threshold * 2:
+            speech = True
+        elif energy > threshold:
+            speech = zero_crossing_rate(frame) <= self.max_zcr
+        else:
+            speech = False
+
+        if not speech:
+            if self.noise_floor is None:
+                self.noise_floor = energy
+            else:
+                self.noise_floor += self.adapt_rate * (energy - self.noise_floor)
+        return speech
+
+
+class WebRTCVAD:
+    """VAD do WebRTC (pacote `webrtcvad`) sobre sub-frames de 10 ms, por maioria."""
+
+    def __init__(self, sample_rate: int = 16000, aggressiveness: int = 2):
+        if not WEBRTCVAD_AVAILABLE:
+            raise RuntimeError("webrtcvad não instalado")
+        self.sample_rate = sample_rate
+        self._vad = webrtcvad.Vad(aggressiveness)
+        # O WebRTC só aceita blocos de 10, 20 ou 30 ms
+        self._chunk_bytes = sample_rate // 100 * 2
+
+    def is_speech(self, frame: bytes) -> bool:
+        chunks = [
+            frame[start:start + self._chunk_bytes]
+            for start in range(0, len(frame) - self._chunk_bytes + 1, self._chunk_bytes)
+        ]
+        if not chunks:
+            return False
+        votes = sum(self._vad.is_speech(chunk, self.sample_rate) for chunk in chunks)
+        return votes * 2 > len(chunks)
+
+
+def create_vad(backend: Optional[str] = None, sample_rate: int = 16000, energy_threshold: float = 400.0,
+               noise_estimator: Optional[NoiseFloorEstimator] = None):
+    """
+    Cria o VAD configurado (`VAD_BACKEND`: "energy" ou "webrtc").
+
+    O WebRTC VAD só é usado quando o pacote está instalado; caso contrário, o
+    VAD por energia assume.
+    """
+    backend = (backend or os.getenv('VAD_BACKEND', 'energy')).strip().lower()
+    if backend == "webrtc":
+        if WEBRTCVAD_AVAILABLE:
+            return WebRTCVAD(sample_rate)
+        logger.warning("VAD_BACKEND=webrtc, mas o pacote webrtcvad não está instalado. Usando VAD por energia.")
+    return EnergyVAD(energy_threshold, noise_estimator=noise_estimator)
+
+
+class Endpointer:
+    """
+    Decide o início e o fim de um comando a partir das decisões do VAD.
+
+    O silêncio exigido para encerrar começa em `min_silence` e cresce com as
+    pausas observadas entre as palavras do próprio comando (até `max_silence`),
+    o que encerra rápido quem fala de forma contínua sem cortar quem fala devagar.
+    """
+
+    def __init__(self, vad, frame_duration: float, min_silence: float = 0.5, max_silence: float = 1.5,
+                 pause_factor: float = 2.0, min_speech: float = 0.1):
+        """
+        Inicializa o endpointer.
+
+        Args:
+            vad: Objeto com `is_speech(frame) -> bool`
+            frame_duration (float): Duração de um frame em segundos
+            min_silence (float): Silêncio mínimo para encerrar o comando
+            max_silence (float): Silêncio máximo exigido (o antigo `pause_threshold`)
+            pause_factor (float): Multiplicador da maior pausa entre palavras já observada
+            min_speech (float): Fala contínua necessária para considerar o início do comando
+        """
+        self.vad = vad
+        self.frame_duration = frame_duration
+        self.min_silence = min_silence
+        self.max_silence = max_silence
+        self.pause_factor = pause_factor
+        self.min_speech_frames = max(1, int(round(min_speech / frame_duration)))
+
+        # Tempo de silêncio gasto até decidir o fim dos últimos comandos (latência de endpoint)
+        self.latencies = deque(maxlen=200)
+        self.reset()
+
+    def reset(self):
+        """Prepara para um novo comando."""
+        self.started = False
+        self.ended = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._longest_pause = 0
+
+    @property
+    def required_silence(self) -> float:
+        """Silêncio exigido agora para encerrar o comando."""
+        adaptive = self._longest_pause * self.frame_duration * self.pause_factor
+        return min(self.max_silence, max(self.min_silence, adaptive))
+
+    def process(self, frame: bytes) -> str:
+        """
+        Processa um frame.
+
+        Returns:
+            str: "silence" (antes da fala), "start" (início confirmado), "speech",
+                "pause" (silêncio dentro do comando) ou "end" (fim do comando)
+        """
+        if self.ended:
+            return "end"
+
+        speech = self.vad.is_speech(frame)
+
+        if not self.started:
+            self._speech_run = self._speech_run + 1 if speech else 0
+            if self._speech_run >= self.min_speech_frames:
+                self.started = True
+                return "start"
+            return "silence"
+
+        if speech:
+            if self._silence_run > self._longest_pause:
+                self._longest_pause = self._silence_run
+            self._silence_run = 0
+            return "speech"
+
+        self._silence_run += 1
+        if self._silence_run * self.frame_duration >= self.required_silence:
+            self.ended = True
+            self.latencies.append(self._silence_run * self.frame_duration)
+            return "end"
+        return "pause"
+
+    def get_stats(self) -> Dict[str, float]:
+        """Estatísticas da latência de endpoint (silêncio esperado após a última fala)."""
+        if not self.latencies:
+            return {"utterances": 0, "last": 0.0, "mean": 0.0, "max": 0.0}
+        return {
+            "utterances": len(self.latencies),
+            "last": round(self.latencies[-1], 3),
+            "mean": round(sum(self.latencies) / len(self.latencies), 3),
+            "max": round(max(self.latencies), 3),
+        }
@@ -0,0 +1,189 @@
+"""
+Wake Words - Detecção de Várias Palavras-Chave para Kamila
+Carrega várias palavras-chave do Porcupine (ex.: "Kamila" e a palavra de
+emergência "socorro"), inclusive de modelos de idioma diferentes, e informa
+qual delas foi detectada para que cada uma tenha o próprio tratamento.
+O ScriptedWakeDetector substitui o Porcupine em testes e benchmarks.
+"""
+
+import os
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .audio_frames import FrameProcessor
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pvporcupine import create as create_porcupine
+    PORCUPINE_AVAILABLE = True
+except ImportError:
+    create_porcupine = None
+    PORCUPINE_AVAILABLE = False
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'porcupine_models', 'porcupine_params_pt.pv')
+DEFAULT_KEYWORD_PATH = os.path.join(PROJECT_ROOT, 'models', 'wake_words', 'camila_pt_windows_v3_0_0.ppn')
+
+
+def _resolve(path: str) -> str:
+    return path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path)
+
+
+def parse_keywords(value: Optional[str], default_name: str = "kamila") -> List[Tuple[str, str, str]]:
+    """
+    Interpreta `PORCUPINE_KEYWORDS`.
+
+    Formato: entradas separadas por vírgula, cada uma `nome=arquivo.ppn`, com
+    `@modelo.pv` opcional para palavras de outro idioma. Sem nome, usa o início
+    do nome do arquivo (`socorro_pt_windows.ppn` -> "socorro"). Caminhos
+    relativos partem da raiz do projeto.
+
+    Returns:
+        list: Tuplas (nome, caminho do .ppn, caminho do .pv)
+    """
+    if not value or not value.strip():
+        return [(default_name, DEFAULT_KEYWORD_PATH, DEFAULT_MODEL_PATH)]
+
+    keywords = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, path = entry.rpartition("=")
+        keyword_path, _, model_path = path.partition("@")
+        keyword_path = _resolve(keyword_path.strip())
+        model_path = _resolve(model_path.strip()) if model_path.strip() else DEFAULT_MODEL_PATH
+        name = name.strip().lower() or os.path.basename(keyword_path).split("_")[0].split(".")[0].lower()
+        keywords.append((name, keyword_path, model_path))
+    return keywords
+
+
+class WakeWordDetector:
+    """
+    Uma ou mais instâncias do Porcupine (uma por modelo de idioma) sobre o mesmo frame.
+
+    Todas as instâncias usam a mesma taxa de amostragem e o mesmo tamanho de
+    frame, então cada frame lido do microfone é entregue a todas.
+    """
+
+    def __init__(self, engines: List[Tuple[object, List[str]]]):
+        """
+        Inicializa o detector.
+
+        Args:
+            engines (list): Pares (instância do Porcupine, nomes das palavras na ordem dos .ppn)
+        """
+        if not engines:
+            raise ValueError("Nenhuma palavra-chave carregada")
+        self.engines = [(engine, FrameProcessor(engine), names) for engine, names in engines]
+        first = engines[0][0]
+        self.sample_rate = first.sample_rate
+        self.frame_length = first.frame_length
+
+    @property
+    def porcupine(self):
+        """Primeira instância do Porcupine (a da wake word principal)."""
+        return self.engines[0][0]
+
+    @property
+    def keywords(self) -> List[str]:
+        return [name for _, _, names in self.engines for name in names]
+
+    def process(self, pcm) -> Optional[str]:
+        """Processa um frame; retorna o nome da palavra detectada ou None."""
+        for _, frames, names in self.engines:
+            index = frames.process(pcm)
+            if index >= 0:
+                return names[index]
+        return None
+
+    def delete(self):
+        for engine, _, _ in self.engines:
+            engine.delete()
+
+
+class ScriptedWakeDetector:
+    """
+    Detector de substituição (testes e benchmarks, sem Porcupine nem chave de acesso).
+
+    Dispara a palavra-chave indicada quando o frame de índice correspondente é
+    processado (os índices contam a partir do primeiro frame recebido), com a
+    mesma interface do WakeWordDetector.
+    """
+
+    porcupine = None
+
+    def __init__(self, detections: Dict[int, str], sample_rate: int = 16000, frame_length: int = 512):
+        """
+        Inicializa o detector.
+
+        Args:
+            detections (dict): Índice do frame -> nome da palavra detectada nele
+            sample_rate (int): Taxa de amostragem esperada da fonte de áudio
+            frame_length (int): Amostras por frame esperadas da fonte de áudio
+        """
+        self.detections = dict(detections)
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.frames = 0  # Frames processados até agora
+
+    @classmethod
+    def at_times(cls, detections: List[Tuple[float, str]], sample_rate: int = 16000,
+                 frame_length: int = 512) -> "ScriptedWakeDetector":
+        """Cria o detector a partir de instantes em segundos de áudio: [(1.8, "kamila"), ...]."""
+        frame_duration = frame_length / sample_rate
+        frames = {int(round(seconds / frame_duration)): name for seconds, name in detections}
+        return cls(frames, sample_rate, frame_length)
+
+    @property
+    def keywords(self) -> List[str]:
+        return sorted(set(self.detections.values()))
+
+    def process(self, pcm) -> Optional[str]:
+        index = self.frames
+        self.frames += 1
+        return self.detections.get(index)
+
+    def delete(self):
+        pass
+
+
+def create_wake_word_detector(access_key: str, keywords: List[Tuple[str, str, str]],
+                              create: Optional[Callable] = None) -> Optional[WakeWordDetector]:
+    """
+    Cria o detector com as palavras-chave cujos arquivos existem.
+
+    Palavras com arquivos ausentes são ignoradas (com erro no log); retorna
+    None se nenhuma puder ser carregada.
+    """
+    create = create or create_porcupine
+    if create is None:
+        logger.error("pvporcupine não instalado.")
+        return None
+
+    by_model: Dict[str, List[Tuple[str, str]]] = {}
+    for name, keyword_path, model_path in keywords:
+        if not os.path.exists(keyword_path) or not os.path.exists(model_path):
+            logger.error(f"Arquivos do Porcupine para '{name}' não encontrados ({keyword_path}, {model_path})")
+            continue
+        by_model.setdefault(model_path, []).append((name, keyword_path))
+
+    engines = []
+    for model_path, entries in by_model.items():
+        try:
+            engine = create(
+                access_key=access_key,
+                keyword_paths=[path for _, path in entries],
+                model_path=model_path
+            )
+        except Exception as e:
+            logger.error(f"Erro ao carregar {[name for name, _ in entries]} no Porcupine: {e}")
+            continue
+        engines.append((engine, [name for name, _ in entries]))
+
+    if not engines:
+        return None
+    detector = WakeWordDetector(engines)
+    logger.info(f"Porcupine configurado com as palavras-chave: {', '.join(detector.keywords)}")
+    return detector
@@ -13,8 +13,16 @@ from datetime import datetime
 from typing import Optional, Callable, Tuple
 import os
 
+from .tts_engine import PRIORITY_EMERGENCY, PRIORITY_HIGH
+
 logger = logging.getLogger(__name__)
 
+# Alertas de voz (pré-renderizados no cache de áudio do TTS para tocarem na hora)
+SEIZURE_ALERT = "Atenção! Detectei uma possível convulsão! Pedindo ajuda!"
+FALL_ALERT = "Atenção! Detectei uma possível queda! Pedindo ajuda!"
+BLINK_ALERT = "Estou detectando muitas piscadas. Você está bem?"
+ALERT_PHRASES = (SEIZURE_ALERT, FALL_ALERT, BLINK_ALERT)
+
 # Tentar importar MediaPipe para detecção facial avançada
 try:
     import mediapipe as mp
@@ -36,6 +44,8 @@ class WebcamMonitor:
         logger.info("🚨 Inicializando Webcam Monitor...")
 
         self.tts_engine = tts_engine
+        if hasattr(tts_engine, "warm_cache"):
+            tts_engine.warm_cache(ALERT_PHRASES)
         self.is_monitoring = False
         self.monitor_thread = None
         self.cap = None
@@ -78,9 +88,13 @@ class WebcamMonitor:
 
         logger.info("✅ Webcam Monitor inicializado!")
 
-    def _speak_async(self, text):
-        """Executa a fala em uma thread separada para não bloquear o monitoramento."""
-        if self.tts_engine:
+    def _speak_async(self, text, priority: int = PRIORITY_EMERGENCY):
+        """Coloca a fala na fila do TTS sem bloquear o monitoramento (alertas de emergência interrompem a fala atual)."""
+        if not self.tts_engine:
+            return
+        if hasattr(self.tts_engine, "submit"):
+            self.tts_engine.submit(text, priority=priority, cache=True)
+        else:
             threading.Thread(target=self.tts_engine.speak, args=(text,), daemon=True).start()
 
     def start_monitoring(self, alert_callback: Optional[Callable] = None):
@@ -331,7 +345,7 @@ class WebcamMonitor:
         self.last_alert_time = current_time
         self.seizure_detected = True
         logger.warning("🚨 CONVULSÃO DETECTADA!")
-        self._speak_async("Atenção! Detectei uma possível convulsão! Pedindo ajuda!")
+        self._speak_async(SEIZURE_ALERT)
         if self.alert_callback:
             self.alert_callback("seizure", "Detectei uma possível convulsão!")
 
@@ -344,7 +358,7 @@ class WebcamMonitor:
         self.last_alert_time = current_time
         self.fall_detected = True
         logger.warning("🚨 QUEDA DETECTADA!")
-        self._speak_async("Atenção! Detectei uma possível queda! Pedindo ajuda!")
+        self._speak_async(FALL_ALERT)
         if self.alert_callback:
             self.alert_callback("fall", "Detectei uma possível queda!")
 
@@ -357,7 +371,7 @@ class WebcamMonitor:
 
         self.last_alert_time = current_time
         logger.warning(f"🚨 PISCADAS EXCESSIVAS: {count}/s")
-        self._speak_async(f"Estou detectando muitas piscadas. Você está bem?")
+        self._speak_async(BLINK_ALERT, priority=PRIORITY_HIGH)
         if self.alert_callback:
             self.alert_callback("blink_rate", f"Taxa de piscadas elevada: {count}/s")
 
@@ -4,6 +4,7 @@ Versão com Arquitetura de Memória Inteligente (Curto e Longo Prazo).
 """
 import os
 import sys
+import functools
 import time
 import logging
 import threading
@@ -16,8 +17,9 @@ sys.path.insert(0, project_root)
 sys.path.insert(0, os.path.join(project_root, '.kamila'))
 
 from core.stt_engine import STTEngine
-from core.tts_engine import TTSEngine
+from core.tts_engine import PRIORITY_EMERGENCY, TTSEngine
 from core.memory_manager import MemoryManager
+from core.speech_pipeline import SpeechPipeline
 from kamila_ia_models.llm_interface import LLMInterface
 from flask import Flask, request
 
@@ -29,6 +31,16 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 assistant = None
 
+# Palavra-chave do Porcupine que aciona o protocolo de saúde sem passar pelo STT
+EMERGENCY_KEYWORD = "socorro"
+
+# Falas fixas (pré-renderizadas no cache de áudio do TTS ao iniciar)
+ONLINE_MESSAGE = "Sistemas online. Aguardando ativação."
+NO_COMMAND_MESSAGE = "Acho que não ouvi nada. Se precisar de mim, é só chamar!"
+GREETING_MESSAGE = "Olá! Estou ouvindo."
+WELCOME_BACK_MESSAGE = "Bem-vindo de volta!"
+GOODBYE_MESSAGE = "Até logo."
+
 
 class KamilaAssistant:
     def __init__(self):
@@ -43,19 +55,40 @@ class KamilaAssistant:
             # Componentes de Voz e Ação
             self.stt_engine = STTEngine(wake_word=self.wake_word)
             self.tts_engine = TTSEngine()
+            self.speech = SpeechPipeline(self.tts_engine)
 
             # --- INTEGRAÇÃO DA NOVA MEMÓRIA ---
             self.llm_interface = LLMInterface()
             self.memory = MemoryManager(self.llm_interface) 
 
+            # Ações (atalho da palavra de emergência)
+            try:
+                from core.actions import ActionManager
+                self.actions = ActionManager(tts_engine=self.tts_engine, memory_manager=self.memory)
+            except Exception as e:
+                logger.warning(f"Action Manager indisponível: {e}")
+                self.actions = None
+
         except ValueError as e:
             logger.error(f"ERRO DE CONFIGURAÇÃO: {e}. Verifique o arquivo .env.")
             sys.exit(1)
 
         self.is_awake = False
         self._running = True
+        self.warm_tts_cache()
         logger.info("Kamila inicializada com sucesso!")
 
+    def warm_tts_cache(self):
+        """Pré-renderiza as falas fixas no cache de áudio do TTS (em segundo plano)."""
+        phrases = [ONLINE_MESSAGE, NO_COMMAND_MESSAGE, GREETING_MESSAGE, WELCOME_BACK_MESSAGE, GOODBYE_MESSAGE]
+        user_name = self.memory.user_name
+        if user_name != "usuário":
+            phrases += [f"Olá, {user_name}! Estou ouvindo.", f"Bem-vindo de volta, {user_name}!"]
+        if self.actions:
+            from core.actions import CANNED_RESPONSES
+            phrases += list(CANNED_RESPONSES)
+        self.tts_engine.warm_cache(phrases)
+
     def check_speak_queue(self):
         """Processa a fila de mensagens para falar, uma por uma."""
         if not self.speak_queue.empty():
@@ -69,10 +102,21 @@ class KamilaAssistant:
     def start(self):
         """Inicia o loop principal de escuta e fala da Kamila."""
         logger.info("Iniciando o loop principal da Kamila.")
-        self.speak_queue.put("Sistemas online. Aguardando ativação.")
+        self.speak_queue.put(ONLINE_MESSAGE)
+
+        # Barge-in: a wake word (ou, com BARGE_IN=vad, a voz do usuário) interrompe a fala da Kamila.
+        # Só a fala menos urgente que uma emergência é descartada: alertas de convulsão/queda continuam
+        self.stt_engine.enable_barge_in(
+            functools.partial(self.tts_engine.interrupt, PRIORITY_EMERGENCY),
+            is_speaking=lambda: self.tts_engine.speaking,
+            on_speech=self.barge_in
+        )
 
         # Inicia a escuta da wake word em background (event-driven)
-        self.stt_engine.start_listening(callback=self.wake_up)
+        self.stt_engine.start_listening(
+            callback=self.wake_up,
+            keyword_callbacks={EMERGENCY_KEYWORD: self.emergency}
+        )
 
         try:
             while self._running:
@@ -88,20 +132,41 @@ class KamilaAssistant:
             
     def wake_up(self):
         """Acorda a assistente, cumprimenta, ouve um comando, processa e volta a dormir."""
-        # Nota: Este método é chamado pela thread de STT quando a wake word é detectada.
-        # A thread de STT está bloqueada esperando este método retornar, o que é correto.
+        # Nota: Este método roda em uma thread de callback do STT; a detecção da wake word
+        # continua ativa, então o usuário pode interromper a resposta dizendo "Kamila" de novo.
         self.is_awake = True
         self.greet_user()
+        self.listen_and_process(timeout=10) # Tempo generoso para o usuário falar
+
+    def barge_in(self):
+        """O usuário começou a falar durante a resposta: a fala já foi interrompida, só ouve o comando."""
+        self.is_awake = True
+        command = self.stt_engine.listen_for_command(timeout=3)
+        if command:
+            self.process_command(command)
+        self.go_to_sleep()
 
-        command = self.stt_engine.listen_for_command(timeout=10) # Tempo generoso para o usuário falar
+    def listen_and_process(self, timeout):
+        """Ouve um comando, processa e volta a dormir."""
+        command = self.stt_engine.listen_for_command(timeout=timeout)
         if command:
             self.process_command(command)
         else:
             logger.info("Nenhum comando recebido após ativação.")
-            self.speak_queue.put("Acho que não ouvi nada. Se precisar de mim, é só chamar!")
+            self.speak_queue.put(NO_COMMAND_MESSAGE)
         
         self.go_to_sleep()
 
+    def emergency(self):
+        """Palavra de emergência: ativa o protocolo de saúde direto, sem reconhecimento de fala."""
+        logger.warning("Palavra de emergência detectada! Ativando o protocolo de saúde.")
+        if self.actions:
+            response = self.actions.execute_action("health_protocol", EMERGENCY_KEYWORD)
+        else:
+            response = "Estou aqui com você. Respira fundo, vai ficar tudo bem."
+        # Direto para a thread de fala: não espera a fila comum e interrompe a conversa em andamento
+        self.tts_engine.submit(response, priority=PRIORITY_EMERGENCY)
+
     def go_to_sleep(self):
         """Volta para o modo de escuta passiva."""
         self.is_awake = False
@@ -110,30 +175,31 @@ class KamilaAssistant:
     def greet_user(self):
         """Cumprimenta o usuário usando o nome guardado na memória."""
         user_name = self.memory.user_name
-        greeting = f"Olá, {user_name}! Estou ouvindo." if user_name != "usuário" else "Olá! Estou ouvindo."
+        greeting = f"Olá, {user_name}! Estou ouvindo." if user_name != "usuário" else GREETING_MESSAGE
         self.speak_queue.put(greeting)
         
     def greet_on_unlock(self):
         """Saudação especial (via API) para quando o PC é desbloqueado."""
         print("\n!!! GATILHO DE SAUDAÇÃO RECEBIDO !!!\n")
         user_name = self.memory.user_name
-        greeting = f"Bem-vindo de volta, {user_name}!" if user_name != "usuário" else "Bem-vindo de volta!"
+        greeting = f"Bem-vindo de volta, {user_name}!" if user_name != "usuário" else WELCOME_BACK_MESSAGE
         self.speak_queue.put(greeting)
 
     def process_command(self, command):
-        """Processa um comando de voz usando o novo MemoryManager."""
+        """Processa um comando de voz usando o novo MemoryManager, falando cada frase assim que é gerada."""
         logger.info(f"Processando comando com memória inteligente: '{command}'")
-        
-        assistant_response = self.memory.process_interaction(command)
-        
-        self.speak_queue.put(assistant_response)
+        self.speech.speak_stream(self.memory.process_interaction_stream(command))
 
     def shutdown(self):
         """Encerra a assistente de forma segura."""
         logger.info("Encerrando Kamila...")
         self._running = False
         self.stt_engine.stop_listening()
-        self.speak_queue.put("Até logo.")
+        stats = self.speech.get_stats()
+        if stats["responses"]:
+            logger.info(f"Tempo até o primeiro áudio: média={stats['mean']}s, máximo={stats['max']}s "
+                        f"({stats['responses']} respostas)")
+        self.speak_queue.put(GOODBYE_MESSAGE)
         # Espera um pouco para a última mensagem ser processada e falada
         time.sleep(3)
         self.check_speak_queue()
@@ -2,7 +2,7 @@
 
 import os
 import google.generativeai as genai
-from typing import List
+from typing import Iterator, List
 
 class LLMInterface:
     """
@@ -43,6 +43,24 @@ class LLMInterface:
             print(f"Erro ao gerar resposta do LLM: {e}")
             return "Desculpe, tive um problema para pensar na resposta."
 
+    def generate_response_stream(self, prompt: str) -> Iterator[str]:
+        """
+        Gera a resposta em pedaços (streaming), à medida que o modelo produz o texto.
+        
+        Args:
+            prompt (str): O prompt completo a ser enviado para o modelo.
+            
+        Yields:
+            str: Pedaços consecutivos da resposta.
+        """
+        try:
+            for chunk in self.text_model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            print(f"Erro ao gerar resposta do LLM (stream): {e}")
+            yield "Desculpe, tive um problema para pensar na resposta."
+
     def create_embedding(self, text: str) -> List[float]:
         """
         Cria um embedding vetorial para um dado texto.
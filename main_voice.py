@@ -6,6 +6,7 @@ Prioridade: OUVIR -> PENSAR -> FALAR.
 
 import os
 import sys
+import functools
 import time
 import logging
 import threading
@@ -38,7 +39,7 @@ def main():
     try:
         from kamila_ia_models.llm_interface import LLMInterface
         from core.memory_manager import MemoryManager
-        from core.tts_engine import TTSEngine
+        from core.tts_engine import PRIORITY_EMERGENCY, TTSEngine
     except ImportError as e:
         logger.error(f"Erro ao importar módulos: {e}")
         return
@@ -49,14 +50,81 @@ def main():
         llm_interface = LLMInterface()
         memory_manager = MemoryManager(llm_interface)
         tts = TTSEngine() # Motor de voz
+    except Exception as e:
+        logger.error(f"Falha ao iniciar: {e}")
+        return
+
+    # Wake word local (Porcupine): só o áudio após a ativação vai para o reconhecimento
+    stt = create_wake_word_gate()
+    if stt is not None:
+        run_gated(stt, memory_manager, tts)
+    else:
+        logger.warning("Wake word local indisponível. Usando a escuta ambiente (uma transcrição por frase).")
+        run_ambient(memory_manager, tts)
+
+def create_wake_word_gate():
+    """Cria o STTEngine com o Porcupine; retorna None se a wake word local não estiver disponível."""
+    try:
+        from core.stt_engine import STTEngine
+        stt = STTEngine(wake_word="kamila")
+    except Exception as e:
+        logger.warning(f"STTEngine indisponível: {e}")
+        return None
+
+    if not stt.porcupine or not stt.microphone:
+        stt.cleanup()
+        return None
+    return stt
+
+def strip_wake_word(text):
+    """Remove a wake word do texto transcrito."""
+    return text.replace("kamila", "").replace("camila", "").strip()
+
+def run_gated(stt, memory_manager, tts):
+    """Escuta com a wake word local: nada sai do dispositivo até o Porcupine detectar 'Kamila'."""
+    listen = lambda timeout=5: stt.listen_for_command(timeout=timeout)
+
+    def on_wake():
+        logger.info("Wake Word detectada (local).")
+        # O comando pode vir na mesma frase da wake word ("Kamila, que horas são?")
+        command = strip_wake_word(listen(timeout=3) or "")
+        if not command:
+            tts.speak("Sim?")
+            print("👂 Aguardando comando...", end="\r")
+            command = strip_wake_word(listen(timeout=5) or "")
+        if command:
+            handle_command(command, memory_manager, tts, listen)
+        logger.debug(f"Limiar de energia atual: {stt.current_energy_threshold:.0f}")
+        print("\n👂 Aguardando 'Kamila'...", end="\r")
+
+    tts.speak("Estou ouvindo. Pode me chamar.")
+    # Dizer "Kamila" durante uma resposta interrompe a fala (barge-in); alertas de emergência continuam
+    if hasattr(tts, "interrupt"):
+        stt.enable_barge_in(functools.partial(tts.interrupt, PRIORITY_EMERGENCY))
+    stt.start_listening(callback=on_wake)
+    print("\n👂 Aguardando 'Kamila'...", end="\r")
+    try:
+        while stt.listening:
+            time.sleep(0.5)
+        logger.error("A escuta da wake word foi encerrada.")
+    except KeyboardInterrupt:
+        print("\nEncerrando...")
+        tts.speak("Até logo.")
+    finally:
+        stt.cleanup()
+
+def run_ambient(memory_manager, tts):
+    """Escuta ambiente (sem wake word local): cada frase é transcrita para procurar 'Kamila'."""
+    try:
         recognizer = sr.Recognizer()
         mic = sr.Microphone()
         
-        # Ajuste inicial de ruído
+        # Ajuste inicial de ruído (ponto de partida; o limiar continua acompanhando o ambiente)
         with mic as source:
             logger.info("Calibrando microfone (fique em silêncio)...")
             recognizer.adjust_for_ambient_noise(source, duration=2)
             logger.info("Calibrado.")
+        recognizer.dynamic_energy_threshold = True
             
         tts.speak("Estou ouvindo. Pode me chamar.")
         
@@ -64,6 +132,8 @@ def main():
         logger.error(f"Falha ao iniciar: {e}")
         return
 
+    listen = lambda timeout=5: listen_for_answer(recognizer, mic, timeout)
+
     # Loop de Escuta Contínua
     while True:
         try:
@@ -98,7 +168,7 @@ def main():
                     logger.info(f"Wake Word detectada em: '{text}'")
                     
                     # Extrair comando (remove a wake word para processar o resto)
-                    command = text.replace("kamila", "").replace("camila", "").strip()
+                    command = strip_wake_word(text)
                     
                     # Feedback imediato
                     if not command:
@@ -116,34 +186,7 @@ def main():
                                 command = recognizer.recognize_google(audio_cmd, language='pt-BR')
                     
                     if command:
-                        logger.info(f"Processando comando: {command}")
-                        
-                        # Processar Fluxos Específicos por Regex (Mais rápido que LLM)
-                        response = None
-                        
-                        # 1. Diário
-                        if "registra meu dia" in command or "registrar meu dia" in command:
-                            log_diary(memory_manager, tts, recognizer, mic)
-                            continue
-                            
-                        # 2. Hábitos
-                        elif "novo hábito" in command:
-                             habit_name = command.split("hábito", 1)[1].strip()
-                             memory_manager.store.add_memory(f"Novo hábito criado: {habit_name}", {"type": "habit", "status": "active"})
-                             response = f"Hábito {habit_name} criado."
-                        
-                        elif "fiz " in command and "hábito" in command:
-                             # Ex: "fiz hábito beber água" ou "fiz o hábito de..."
-                             response = "Registrado. Continue consistente."
-                             memory_manager.store.add_memory(f"Hábito realizado: {command}", {"type": "habit_log"})
-
-                        # 3. Brain (LLM) se não for comando simples
-                        if not response:
-                            response = memory_manager.process_interaction(command)
-
-                        # RESPOSTA FINAL
-                        print(f"👩‍💻 Kamila: {response}")
-                        tts.speak(response)
+                        handle_command(command, memory_manager, tts, listen)
 
             except sr.UnknownValueError:
                 # Não entendeu (silêncio ou ruído) -> Ignora
@@ -159,14 +202,46 @@ def main():
             tts.speak("Até logo.")
             break
 
-def log_diary(memory_manager, tts, recognizer, mic):
+def handle_command(command, memory_manager, tts, listen):
+    """Processa um comando já transcrito e fala a resposta."""
+    logger.info(f"Processando comando: {command}")
+    
+    # Processar Fluxos Específicos por Regex (Mais rápido que LLM)
+    response = None
+    
+    # 1. Diário
+    if "registra meu dia" in command or "registrar meu dia" in command:
+        log_diary(memory_manager, tts, listen)
+        return
+        
+    # 2. Hábitos
+    elif "novo hábito" in command:
+         habit_name = command.split("hábito", 1)[1].strip()
+         memory_manager.store.add_memory(f"Novo hábito criado: {habit_name}", {"type": "habit", "status": "active"})
+         response = f"Hábito {habit_name} criado."
+    
+    elif "fiz " in command and "hábito" in command:
+         # Ex: "fiz hábito beber água" ou "fiz o hábito de..."
+         response = "Registrado. Continue consistente."
+         memory_manager.store.add_memory(f"Hábito realizado: {command}", {"type": "habit_log"})
+
+    # 3. Brain (LLM) se não for comando simples
+    if not response:
+        response = memory_manager.process_interaction(command)
+
+    # RESPOSTA FINAL
+    print(f"👩‍💻 Kamila: {response}")
+    tts.speak(response)
+
+def log_diary(memory_manager, tts, listen):
     """Fluxo de diário apenas por VOZ."""
     msg = "Vamos lá. O que você fez de importante hoje?"
     print(f"Kamila: {msg}")
     tts.speak(msg)
     
     # Ouvir resposta
-    answer = listen_for_answer(recognizer, mic)
+    print("👂 (Ouvindo resposta...)", end="\r")
+    answer = listen(timeout=5)
     if not answer:
         tts.speak("Não ouvi nada. Podemos tentar depois.")
         return
@@ -179,12 +254,11 @@ def log_diary(memory_manager, tts, recognizer, mic):
     print(f"Kamila: {feedback}")
     tts.speak(feedback)
 
-def listen_for_answer(recognizer, mic):
+def listen_for_answer(recognizer, mic, timeout=5):
     """Auxiliar para ouvir uma resposta."""
     try:
         with mic as source:
-            print("👂 (Ouvindo resposta...)", end="\r")
-            audio = recognizer.listen(source, timeout=5, phrase_time_limit=15)
+            audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=15)
         text = recognizer.recognize_google(audio, language='pt-BR')
         return text
     except:
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark da Decodificação de Frames da Wake Word
+Compara o custo de CPU por frame do caminho antigo (struct.unpack_from + conversão
+elemento a elemento dentro do Porcupine.process) com o FrameProcessor (buffer
+ctypes reutilizado, uma cópia por frame), simulando horas de escuta contínua.
+
+Uso:
+    python testes/benchmark_frame_decode.py --hours 1
+"""
+
+import os
+import sys
+import time
+import ctypes
+import struct
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.audio_frames import FrameProcessor, pcm_view
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 512
+
+
+class SimulatedPorcupine:
+    """Reproduz o trabalho em Python do Porcupine.process; a inferência nativa fica de fora (igual nos dois caminhos)."""
+
+    sample_rate = SAMPLE_RATE
+    frame_length = FRAME_LENGTH
+
+    def __init__(self):
+        self._handle = object()
+
+    def _process_func(self, handle, pcm, result):
+        result._obj.value = -1
+        return 0
+
+    def process(self, pcm):
+        if len(pcm) != self.frame_length:
+            raise ValueError("Tamanho de frame inválido")
+        result = ctypes.c_int()
+        self._process_func(self._handle, (ctypes.c_short * len(pcm))(*pcm), ctypes.byref(result))
+        return result.value
+
+
+def run(name, step, frames, data):
+    start = time.process_time()
+    for _ in range(frames):
+        step(data)
+    elapsed = time.process_time() - start
+    per_frame_us = elapsed / frames * 1e6
+    # Percentual de um núcleo ocupado só com este trabalho a ~31 frames/s
+    load = per_frame_us * (SAMPLE_RATE / FRAME_LENGTH) / 1e6 * 100
+    print(f"   {name:<38} {per_frame_us:>8.2f} µs/frame  {load:>6.3f}% de um núcleo  ({elapsed:.2f}s de CPU)")
+    return per_frame_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo de CPU da decodificação de frames da wake word")
+    parser.add_argument("--hours", type=float, default=0.25, help="Tempo de escuta simulado")
+    args = parser.parse_args()
+
+    frames = int(args.hours * 3600 * SAMPLE_RATE / FRAME_LENGTH)
+    data = os.urandom(FRAME_LENGTH * 2)
+    porcupine = SimulatedPorcupine()
+    processor = FrameProcessor(porcupine)
+    fmt = "h" * FRAME_LENGTH
+
+    print("🎙️ BENCHMARK DE FRAMES DA WAKE WORD")
+    print("=" * 60)
+    print(f"Frames simulados: {frames} ({args.hours}h de escuta)")
+
+    legacy = run("struct.unpack_from + process()", lambda d: porcupine.process(struct.unpack_from(fmt, d)), frames, data)
+    run("memoryview + process()", lambda d: porcupine.process(pcm_view(d)), frames, data)
+    if NUMPY_AVAILABLE:
+        run("numpy.frombuffer + process()", lambda d: porcupine.process(np.frombuffer(d, dtype=np.int16)), frames, data)
+    current = run("FrameProcessor (buffer reutilizado)", processor.process, frames, data)
+
+    print("=" * 60)
+    saved = (legacy - current) * frames / 1e6
+    print(f"✅ Economia: {legacy / current:.1f}x por frame, {saved:.2f}s de CPU a cada {args.hours}h")
+
+
+if __name__ == "__main__":
+    main()
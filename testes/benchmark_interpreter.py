@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Command Interpreter
+Mede latência (p50/p99), vazão e acurácia por intenção sobre um corpus rotulado
+de frases em português com ruído típico de reconhecimento de voz.
+
+Uso:
+    python testes/benchmark_interpreter.py --output resultado.json
+    python testes/benchmark_interpreter.py --compare resultado.json
+    python testes/benchmark_interpreter.py --no-index --no-fuzzy
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import subprocess
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.interpreter import CommandInterpreter
+from core.intent_matcher import IntentMatcher, expand_pattern
+
+# Valores usados no lugar dos trechos livres dos padrões (ex.: "abrir (.*)")
+SLOT_VALUES = [
+    "navegador", "bloco de notas", "spotify", "calculadora", "explorador de arquivos",
+    "botão enviar", "receitas de bolo", "notícias de hoje", "o mouse para a direita"
+]
+
+WAKE_PREFIXES = ["kamila ", "kamila, ", "camila ", "ei kamila "]
+FILLERS = ["por favor ", "você pode ", "me diz ", "me fala "]
+
+# Frases fora do domínio (devem ir para o LLM: rótulo None)
+NEGATIVE_STARTS = [
+    "qual é a capital de", "me conta uma curiosidade sobre", "quem inventou",
+    "quanto custa", "como se escreve", "o que significa", "quem ganhou o jogo do",
+    "me explica a história de", "qual a distância até", "traduz para o inglês"
+]
+NEGATIVE_TOPICS = [
+    "frança", "avião", "dinossauros", "fotossíntese", "palmeiras", "saudade",
+    "lua", "japão", "bicicleta", "chocolate", "internet", "vulcões"
+]
+
+NOISE_TYPES = ["clean", "no_accents", "wake_word", "filler", "typo", "double_typo", "wake_no_accents"]
+NEGATIVE = "__none__"
+
+
+def strip_accents(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def typo(text: str, rng: random.Random) -> str:
+    """Aplica um erro de caractere (troca, remoção ou transposição) em uma palavra longa."""
+    words = text.split()
+    positions = [i for i, word in enumerate(words) if len(word) >= 4]
+    if not positions:
+        return text
+
+    index = rng.choice(positions)
+    word = words[index]
+    pos = rng.randrange(1, len(word) - 1)
+    operation = rng.choice(["replace", "delete", "transpose"])
+    if operation == "replace":
+        word = word[:pos] + rng.choice("aeioulrsnm") + word[pos + 1:]
+    elif operation == "delete":
+        word = word[:pos] + word[pos + 1:]
+    else:
+        word = word[:pos - 1] + word[pos] + word[pos - 1] + word[pos + 1:]
+    words[index] = word
+    return " ".join(words)
+
+
+def clean_phrases(intents: Dict[str, Dict[str, Any]], limit: int = 64) -> Dict[str, List[str]]:
+    """Expande os padrões de cada intenção em frases de exemplo sem ambiguidade entre intenções."""
+    slots = "(" + "|".join(SLOT_VALUES) + ")"
+    phrases = {}
+    owners = defaultdict(set)
+    for name, data in intents.items():
+        examples = set()
+        for pattern in data["patterns"]:
+            source = pattern.replace("(.*)", slots).replace(".*", "( é a | )")
+            examples.update(expand_pattern(source, limit=limit))
+        phrases[name] = sorted(examples)
+        for example in examples:
+            owners[example].add(name)
+
+    return {
+        name: [example for example in examples if len(owners[example]) == 1]
+        for name, examples in phrases.items()
+    }
+
+
+def build_corpus(intents: Dict[str, Dict[str, Any]], seed: int = 42, negatives: int = 400) -> List[Dict[str, str]]:
+    """
+    Gera o corpus rotulado de forma determinística.
+
+    Returns:
+        List[Dict]: Itens {"text", "intent", "noise"} (intent = "__none__" para frases fora do domínio)
+    """
+    rng = random.Random(seed)
+    corpus = []
+
+    for name, examples in clean_phrases(intents).items():
+        for example in examples:
+            variants = {
+                "clean": example,
+                "no_accents": strip_accents(example),
+                "wake_word": rng.choice(WAKE_PREFIXES) + example,
+                "filler": rng.choice(FILLERS) + example,
+                "typo": typo(example, rng),
+                "double_typo": typo(typo(example, rng), rng),
+                "wake_no_accents": strip_accents(rng.choice(WAKE_PREFIXES) + example),
+            }
+            for noise in NOISE_TYPES:
+                corpus.append({"text": variants[noise], "intent": name, "noise": noise})
+
+    combinations = [f"{start} {topic}" for start in NEGATIVE_STARTS for topic in NEGATIVE_TOPICS]
+    for text in rng.sample(combinations, min(negatives, len(combinations))):
+        corpus.append({"text": text, "intent": NEGATIVE, "noise": "negative"})
+        corpus.append({"text": strip_accents(text), "intent": NEGATIVE, "noise": "negative"})
+
+    rng.shuffle(corpus)
+    return corpus
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def make_interpreter(use_index: bool = True, fuzzy: bool = True) -> CommandInterpreter:
+    """Cria um interpretador sem cache de intenções (mede o caminho completo de cada comando)."""
+    interpreter = CommandInterpreter(cache_size=0, fuzzy_matching=fuzzy)
+    if not use_index:
+        interpreter._catalog.matcher = IntentMatcher(interpreter.intents, use_index=False)
+    return interpreter
+
+
+def run_benchmark(corpus: List[Dict[str, str]], use_index: bool = True, fuzzy: bool = True,
+                  repeat: int = 3, seed: int = 42) -> Dict[str, Any]:
+    """Executa o benchmark e retorna o relatório (serializável em JSON)."""
+    interpreter = make_interpreter(use_index, fuzzy)
+    texts = [item["text"] for item in corpus]
+
+    # Aquecimento (compilação preguiçosa, caches do módulo re)
+    for text in texts[:200]:
+        interpreter.interpret_command(text)
+
+    latencies = []
+    predictions = []
+    for round_index in range(repeat):
+        for text in texts:
+            start = time.perf_counter_ns()
+            intent = interpreter.interpret_command(text)
+            latencies.append((time.perf_counter_ns() - start) / 1000.0)
+            if round_index == 0:
+                predictions.append(intent or NEGATIVE)
+
+    start = time.perf_counter()
+    interpreter.interpret_batch(texts)
+    batch_seconds = time.perf_counter() - start
+
+    confusion: Dict[str, Counter] = defaultdict(Counter)
+    by_noise: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for item, predicted in zip(corpus, predictions):
+        confusion[item["intent"]][predicted] += 1
+        by_noise[item["noise"]][0] += predicted == item["intent"]
+        by_noise[item["noise"]][1] += 1
+
+    predicted_totals = Counter(predictions)
+    per_intent = {}
+    for intent in sorted(confusion):
+        support = sum(confusion[intent].values())
+        correct = confusion[intent][intent]
+        per_intent[intent] = {
+            "support": support,
+            "recall": round(correct / support, 4),
+            "precision": round(correct / predicted_totals[intent], 4) if predicted_totals[intent] else 0.0,
+        }
+
+    correct = sum(confusion[intent][intent] for intent in confusion)
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "seed": seed,
+            "corpus_size": len(corpus),
+            "repeat": repeat,
+            "config": {"use_index": use_index, "fuzzy_matching": fuzzy},
+        },
+        "latency_us": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p90": round(percentile(latencies, 0.90), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "mean": round(sum(latencies) / len(latencies), 2),
+            "max": round(max(latencies), 2),
+        },
+        "throughput": {
+            "commands_per_s": round(len(latencies) / (sum(latencies) / 1e6), 1),
+            "batch_commands_per_s": round(len(texts) / batch_seconds, 1),
+        },
+        "accuracy": {
+            "overall": round(correct / len(corpus), 4),
+            "by_noise": {noise: round(hits / total, 4) for noise, (hits, total) in sorted(by_noise.items())},
+        },
+        "per_intent": per_intent,
+        "confusion": {intent: dict(row) for intent, row in sorted(confusion.items())},
+    }
+
+
+def profile_pass(corpus: List[Dict[str, str]], path: str, use_index: bool = True, fuzzy: bool = True) -> Dict[str, Any]:
+    """Interpreta o corpus com o profiling por padrão ativo e grava o relatório."""
+    interpreter = make_interpreter(use_index, fuzzy)
+    interpreter.enable_profiling()
+    for item in corpus:
+        interpreter.interpret_command(item["text"])
+
+    report = interpreter.export_profiling_report(path)
+    print(f"\n🔬 Padrões mais caros (tempo total):")
+    for row in report["patterns"][:5]:
+        print(f"   {row['total_us']:>10.0f} µs  máx {row['max_us']:>7.1f} µs  {row['intent']}: {row['pattern']}")
+    print(f"   Padrões sem nenhuma correspondência: {len(report['dead_patterns'])}")
+    print(f"💾 Profiling salvo em {path}")
+    return report
+
+
+def print_report(report: Dict[str, Any], top: int = 10):
+    meta, latency, throughput, accuracy = (
+        report["meta"], report["latency_us"], report["throughput"], report["accuracy"]
+    )
+    print("🧠 BENCHMARK DO COMMAND INTERPRETER")
+    print("=" * 60)
+    print(f"Corpus: {meta['corpus_size']} frases x {meta['repeat']} rodadas | config: {meta['config']}")
+    print(f"Latência (µs): p50={latency['p50']}  p90={latency['p90']}  p99={latency['p99']}  máx={latency['max']}")
+    print(f"Vazão: {throughput['commands_per_s']:.0f} comandos/s | lote: {throughput['batch_commands_per_s']:.0f} comandos/s")
+    print(f"Acurácia geral: {accuracy['overall']:.2%}")
+    for noise, value in accuracy["by_noise"].items():
+        print(f"   {noise:<16} {value:.2%}")
+
+    confusions = [
+        (count, expected, predicted)
+        for expected, row in report["confusion"].items()
+        for predicted, count in row.items() if predicted != expected
+    ]
+    if confusions:
+        print(f"\n📉 Principais confusões (esperada → prevista):")
+        for count, expected, predicted in sorted(confusions, reverse=True)[:top]:
+            print(f"   {count:>4}  {expected} → {predicted}")
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any],
+                    tolerance: float = 0.10, accuracy_tolerance: float = 0.005) -> bool:
+    """Compara com um resultado anterior; retorna False se houver regressão."""
+    print(f"\n📊 Comparação com {baseline['meta'].get('revision') or 'resultado anterior'}:")
+    ok = True
+
+    for metric in ("p50", "p99"):
+        before, after = baseline["latency_us"][metric], current["latency_us"][metric]
+        change = (after - before) / before if before else 0.0
+        regression = change > tolerance
+        ok &= not regression
+        print(f"   latência {metric}: {before} → {after} µs ({change:+.1%}){'  ❌' if regression else ''}")
+
+    before, after = baseline["accuracy"]["overall"], current["accuracy"]["overall"]
+    regression = before - after > accuracy_tolerance
+    ok &= not regression
+    print(f"   acurácia: {before:.2%} → {after:.2%}{'  ❌' if regression else ''}")
+
+    for intent, stats in current["per_intent"].items():
+        previous = baseline["per_intent"].get(intent)
+        if previous and previous["recall"] - stats["recall"] > accuracy_tolerance:
+            print(f"   ⚠️  recall de {intent}: {previous['recall']:.2%} → {stats['recall']:.2%}")
+
+    print("✅ Sem regressões" if ok else "❌ Regressão detectada")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de latência e acurácia do Command Interpreter")
+    parser.add_argument("--seed", type=int, default=42, help="Semente do corpus gerado")
+    parser.add_argument("--repeat", type=int, default=3, help="Rodadas de medição sobre o corpus")
+    parser.add_argument("--corpus", help="Carrega o corpus de um arquivo JSONL em vez de gerá-lo")
+    parser.add_argument("--save-corpus", help="Grava o corpus gerado em JSONL")
+    parser.add_argument("--output", help="Grava o relatório em JSON")
+    parser.add_argument("--compare", help="Relatório JSON anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Piora de latência tolerada (fração)")
+    parser.add_argument("--no-index", action="store_true", help="Desativa o pré-filtro por palavras-chave")
+    parser.add_argument("--no-fuzzy", action="store_true", help="Desativa a correspondência aproximada")
+    parser.add_argument("--profile", help="Grava o relatório de profiling por padrão (uma rodada extra) em JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            corpus = [json.loads(line) for line in f if line.strip()]
+    else:
+        corpus = build_corpus(make_interpreter().intents, seed=args.seed)
+
+    if args.save_corpus:
+        with open(args.save_corpus, "w", encoding="utf-8") as f:
+            for item in corpus:
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+
+    report = run_benchmark(corpus, use_index=not args.no_index, fuzzy=not args.no_fuzzy,
+                           repeat=args.repeat, seed=args.seed)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Relatório salvo em {args.output}")
+
+    if args.profile:
+        profile_pass(corpus, args.profile, use_index=not args.no_index, fuzzy=not args.no_fuzzy)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare_reports(report, baseline, tolerance=args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Pipeline de Voz com Áudio Gravado
+Reproduz arquivos WAV/MP3 no STTEngine (FileAudioSource no lugar do microfone)
+e mede a latência de detecção da wake word, os falsos aceites e a latência do
+fim da fala até a transcrição, sem hardware de áudio.
+
+Cada arquivo do corpus precisa de um rótulo ao lado (`<arquivo>.json`):
+
+    {"wake": [{"start": 1.2, "end": 1.8, "command": "que horas são"}]}
+
+`start`/`end` delimitam a wake word (segundos de áudio) e `command` é o texto
+esperado depois dela. `{"wake": []}` marca um arquivo sem wake word (só conta
+para falsos aceites). Arquivos sem rótulo são ignorados.
+
+Com `--detector scripted`, a wake word "dispara" no fim de cada rótulo, sem
+Porcupine nem PICOVOICE_ACCESS_KEY (mede só o fim de fala e o reconhecimento);
+com `--backend scripted`, também não há rede nem modelo de STT.
+
+Uso:
+    python testes/benchmark_stt_replay.py --corpus audio/samples
+    python testes/benchmark_stt_replay.py --corpus gravacoes --realtime --backend google
+    python testes/benchmark_stt_replay.py --backend scripted --output resultado.json
+    python testes/benchmark_stt_replay.py --backend scripted --detector scripted
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.audio_stream import FileAudioSource
+from core.stt_backends import ScriptedBackend, ScriptedSession
+from core.wake_words import ScriptedWakeDetector
+
+AUDIO_EXTENSIONS = (".wav", ".mp3")
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'audio', 'samples')
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def latency_summary(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(percentile(values, 0.50), 3),
+        "p95": round(percentile(values, 0.95), 3),
+        "max": round(max(values), 3),
+    }
+
+
+def normalize(text: Optional[str]) -> str:
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join("".join(c if c.isalnum() else " " for c in text).split())
+
+
+def load_corpus(directory: str) -> List[Dict[str, Any]]:
+    """Arquivos de áudio rotulados do diretório (os sem `<arquivo>.json` são ignorados)."""
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(AUDIO_EXTENSIONS):
+            continue
+        path = os.path.join(directory, name)
+        label_path = path + ".json"
+        if not os.path.exists(label_path):
+            print(f"   ⚠️  {name}: sem rótulo ({name}.json), ignorado")
+            continue
+        with open(label_path, encoding="utf-8") as f:
+            labels = json.load(f)
+        corpus.append({"path": path, "wake": labels.get("wake", [])})
+    return corpus
+
+
+def match_detection(detected: float, labels: List[Dict[str, Any]], matched: set,
+                    tolerance: float = 1.0) -> Optional[int]:
+    """Índice do rótulo de wake word (ainda não encontrado) que explica a detecção, ou None (falso aceite)."""
+    for index, label in enumerate(labels):
+        if index in matched:
+            continue
+        start = label.get("start", label["end"] - 2.0)
+        if start <= detected <= label["end"] + tolerance:
+            return index
+    return None
+
+
+def run_file(item: Dict[str, Any], backend: str, realtime: bool, tolerance: float,
+             timeout: float = 5.0, phrase_time_limit: float = 15.0, detector: str = "porcupine") -> Dict[str, Any]:
+    """Reproduz um arquivo no STTEngine e registra cada ativação."""
+    from core.stt_engine import STTEngine, WaitTimeoutError
+
+    source = FileAudioSource(item["path"], realtime=realtime)
+    wake_detector = None
+    if detector == "scripted":
+        wake_detector = ScriptedWakeDetector.at_times(
+            [(label["end"], "kamila") for label in item["wake"]], source.sample_rate, source.frame_length
+        )
+    # Com o backend "scripted" a transcrição vem do rótulo: o motor não precisa de reconhecedor
+    stt = STTEngine(backend=ScriptedBackend([]) if backend == "scripted" else None,
+                    audio_source=source, wake_detector=wake_detector)
+    if not stt.wake_detector:
+        stt.cleanup()
+        raise RuntimeError("Porcupine indisponível (PICOVOICE_ACCESS_KEY e modelos são necessários; "
+                           "ou use --detector scripted)")
+
+    labels = item["wake"]
+    matched = set()
+    events = []
+
+    def on_wake():
+        # Instante (segundos de áudio) em que o detector disparou
+        detected = stt.last_wake_time
+        label = match_detection(detected, labels, matched, tolerance)
+        event = {"detected": round(detected, 3), "label": label}
+        if label is not None:
+            matched.add(label)
+            event["latency"] = round(detected - labels[label]["end"], 3)
+
+        if backend == "scripted":
+            # Transcrição "perfeita": isola a latência do áudio e do fim de fala
+            text = labels[label].get("command") if label is not None else None
+            session = ScriptedSession(text, frames_per_word=5)
+        else:
+            session = stt.backend.open_session(source.sample_rate, source.sample_width)
+
+        try:
+            for frame in stt.command_frames(timeout, phrase_time_limit):
+                session.feed(frame)
+        except WaitTimeoutError:
+            events.append(event)
+            return
+
+        audio_end = time.perf_counter()
+        transcript = session.finish()
+        recognition = time.perf_counter() - audio_end
+        endpoint = stt.endpointer.latencies[-1] if stt.endpointer.ended else 0.0
+
+        event["transcript"] = transcript
+        event["recognition"] = round(recognition, 3)
+        # Da última fala do usuário até o texto: silêncio aguardado + reconhecimento
+        event["capture_to_transcript"] = round(endpoint + recognition, 3)
+        if label is not None and "command" in labels[label]:
+            event["correct"] = normalize(transcript) == normalize(labels[label]["command"])
+        events.append(event)
+
+    started = time.perf_counter()
+    stt.start_listening(callback=on_wake)
+    while stt.listening:
+        time.sleep(0.05)
+    # Os callbacks rodam fora da thread de detecção; o último comando pode ainda estar terminando
+    stt.wait_for_callbacks(timeout=timeout + phrase_time_limit)
+    wall = time.perf_counter() - started
+    stt.cleanup()
+
+    return {
+        "file": os.path.basename(item["path"]),
+        "audio_seconds": round(source.duration, 2),
+        "wall_seconds": round(wall, 2),
+        "labels": len(labels),
+        "events": events,
+    }
+
+
+def summarize(results: List[Dict[str, Any]], config: Dict[str, Any]) -> Dict[str, Any]:
+    """Agrega os resultados por arquivo em um relatório (serializável em JSON)."""
+    events = [event for result in results for event in result["events"]]
+    hits = [event for event in events if event["label"] is not None]
+    false_accepts = len(events) - len(hits)
+    labels = sum(result["labels"] for result in results)
+    hours = sum(result["audio_seconds"] for result in results) / 3600
+    judged = [event for event in hits if "correct" in event]
+
+    return {
+        "meta": {**config, "files": len(results), "audio_hours": round(hours, 4),
+                 "wall_seconds": round(sum(result["wall_seconds"] for result in results), 2)},
+        "wake_word": {
+            "labels": labels,
+            "detected": len(hits),
+            "missed": labels - len(hits),
+            "false_reject_rate": round((labels - len(hits)) / labels, 4) if labels else 0.0,
+            "false_accepts": false_accepts,
+            "false_accepts_per_hour": round(false_accepts / hours, 2) if hours else 0.0,
+            "latency_s": latency_summary([event["latency"] for event in hits]),
+        },
+        "capture_to_transcript_s": latency_summary(
+            [event["capture_to_transcript"] for event in hits if "capture_to_transcript" in event]
+        ),
+        "recognition_s": latency_summary([event["recognition"] for event in events if "recognition" in event]),
+        "command_accuracy": round(sum(event["correct"] for event in judged) / len(judged), 4) if judged else None,
+        "files": results,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    meta, wake = report["meta"], report["wake_word"]
+    print("=" * 60)
+    print("🎙️ BENCHMARK DO PIPELINE DE VOZ (ÁUDIO GRAVADO)")
+    print("=" * 60)
+    print(f"Arquivos: {meta['files']} | áudio: {meta['audio_hours'] * 60:.1f} min | "
+          f"tempo real: {meta['realtime']} | backend: {meta['backend']}")
+    print(f"Wake word: {wake['detected']}/{wake['labels']} detectadas "
+          f"(falsa rejeição {wake['false_reject_rate']:.2%}), "
+          f"{wake['false_accepts']} falsos aceites ({wake['false_accepts_per_hour']}/h)")
+    latency = wake["latency_s"]
+    print(f"Latência da wake word (s): média={latency['mean']}  p50={latency['p50']}  p95={latency['p95']}")
+    latency = report["capture_to_transcript_s"]
+    print(f"Fim da fala → texto (s):   média={latency['mean']}  p50={latency['p50']}  p95={latency['p95']}")
+    if report["command_accuracy"] is not None:
+        print(f"Comandos transcritos corretamente: {report['command_accuracy']:.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do STTEngine com áudio gravado")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Diretório com os áudios rotulados")
+    parser.add_argument("--realtime", action="store_true", help="Reproduz no ritmo do áudio (padrão: o mais rápido possível)")
+    parser.add_argument("--backend", default="scripted", choices=["scripted", "auto", "vosk", "google"],
+                        help="Reconhecedor (scripted = texto do rótulo, sem rede)")
+    parser.add_argument("--detector", default="porcupine", choices=["porcupine", "scripted"],
+                        help="Wake word (scripted = dispara no fim de cada rótulo, sem Porcupine)")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="Atraso máximo de detecção aceito (s)")
+    parser.add_argument("--output", help="Grava o relatório em JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    if args.backend != "scripted":
+        os.environ["STT_BACKEND"] = args.backend
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"❌ Nenhum áudio rotulado em {args.corpus}")
+        return 1
+
+    results = []
+    for item in corpus:
+        try:
+            results.append(run_file(item, args.backend, args.realtime, args.tolerance, detector=args.detector))
+        except Exception as e:
+            print(f"❌ {os.path.basename(item['path'])}: {e}")
+            return 1
+
+    report = summarize(results, {"realtime": args.realtime, "backend": args.backend, "detector": args.detector,
+                                 "tolerance": args.tolerance})
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Relatório salvo em {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
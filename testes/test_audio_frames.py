@@ -0,0 +1,83 @@
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core import audio_frames
+from core.audio_frames import FrameProcessor, frame_rms, pcm_view, zero_crossing_rate
+
+FRAME_LENGTH = 512
+
+
+class FakePorcupine:
+    """Detecta a 'palavra' quando a primeira amostra é 1234."""
+
+    frame_length = FRAME_LENGTH
+
+    def __init__(self):
+        self.public_calls = 0
+        self.frames = []
+
+    def process(self, pcm):
+        self.public_calls += 1
+        if len(pcm) != self.frame_length:
+            raise ValueError("Tamanho de frame inválido")
+        self.frames.append(list(pcm))
+        return 0 if pcm[0] == 1234 else -1
+
+
+class NativePorcupine(FakePorcupine):
+    def __init__(self, status=0):
+        super().__init__()
+        self._handle = object()
+        self.status = status
+
+    def _process_func(self, handle, pcm, result):
+        self.frames.append(list(pcm))
+        result._obj.value = 0 if pcm[0] == 1234 else -1
+        return self.status
+
+
+def frame(*samples):
+    values = list(samples) + [0] * (FRAME_LENGTH - len(samples))
+    return struct.pack("h" * FRAME_LENGTH, *values)
+
+
+def test_pcm_view_matches_struct_decoding():
+    data = frame(1, -2, 32767, -32768)
+    assert list(pcm_view(data)) == list(struct.unpack_from("h" * FRAME_LENGTH, data))
+
+
+def test_public_process_receives_same_samples():
+    porcupine = FakePorcupine()
+    processor = FrameProcessor(porcupine)
+
+    assert processor.process(frame(1234, 5)) == 0
+    assert processor.process(frame(7)) == -1
+    assert porcupine.frames[0][:2] == [1234, 5]
+
+
+def test_native_path_reuses_buffer():
+    porcupine = NativePorcupine()
+    processor = FrameProcessor(porcupine)
+    buffer = processor._buffer
+
+    assert processor.process(frame(7, -3)) == -1
+    assert processor.process(frame(1234)) == 0
+    assert porcupine.public_calls == 0
+    assert porcupine.frames[0][:2] == [7, -3]
+    assert processor._buffer is buffer
+
+
+def test_native_error_falls_back_to_public_process():
+    porcupine = NativePorcupine(status=3)
+    assert FrameProcessor(porcupine).process(frame(1234)) == 0
+    assert porcupine.public_calls == 1
+
+
+def test_vectorized_energy_and_zcr_match_reference():
+    frames = [os.urandom(FRAME_LENGTH * 2), b"", struct.pack("h", -5), struct.pack("hh", 32767, -32768) * 256]
+    for data in frames:
+        assert abs(frame_rms(data) - audio_frames._frame_rms_python(data)) < 1e-6
+        assert abs(zero_crossing_rate(data) - audio_frames._zero_crossing_rate_python(data)) < 1e-9
@@ -0,0 +1,188 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+import core.audio_stream
+from core.audio_stream import AsyncRingReader, AudioCapture, AudioRingBuffer, FileAudioSource
+
+
+def frame(number):
+    return number.to_bytes(2, "little") * 4
+
+
+def test_readers_have_independent_cursors():
+    ring = AudioRingBuffer(capacity=8)
+    wake = ring.reader()
+    for number in range(3):
+        ring.write(frame(number))
+
+    command = ring.reader(preroll=2)
+    assert [wake.read(0) for _ in range(3)] == [frame(0), frame(1), frame(2)]
+    assert [command.read(0) for _ in range(2)] == [frame(1), frame(2)]
+    assert wake.read(timeout=0.01) is None
+
+
+def test_slow_reader_skips_overwritten_frames():
+    ring = AudioRingBuffer(capacity=4)
+    reader = ring.reader()
+    for number in range(10):
+        ring.write(frame(number))
+
+    assert reader.read(0) == frame(7)
+    assert reader.overruns == 7
+    assert reader.pending == 2
+
+
+def test_reader_wakes_up_on_new_frame_and_on_close():
+    ring = AudioRingBuffer(capacity=4)
+    reader = ring.reader()
+    threading.Timer(0.05, ring.write, args=(frame(1),)).start()
+    assert reader.read(timeout=2.0) == frame(1)
+
+    threading.Timer(0.05, ring.close).start()
+    start = time.perf_counter()
+    assert reader.read(timeout=2.0) is None
+    assert time.perf_counter() - start < 1.0
+
+
+def test_preroll_is_measured_in_frames():
+    capture = AudioCapture(sample_rate=16000, frame_length=512, buffer_seconds=2.0)
+    for number in range(40):
+        capture.ring.write(frame(number))
+
+    assert capture.frames_for(0.32) == 10
+    reader = capture.reader(preroll_seconds=0.32)
+    assert reader.read(0) == frame(30)
+    reader.skip_to_live()
+    assert reader.pending == 0
+
+
+class FakeStream:
+    def __init__(self):
+        self.active = True
+        self.closed = False
+
+    def is_active(self):
+        if self.closed:
+            raise OSError("Stream closed")
+        return self.active
+
+    def start_stream(self):
+        pass
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakePyAudio:
+    paInt16 = 8
+    paContinue = 0
+
+    def __init__(self):
+        self.streams = []
+
+    def PyAudio(self):
+        return self
+
+    def open(self, **kwargs):
+        self.streams.append(FakeStream())
+        return self.streams[-1]
+
+    def terminate(self):
+        pass
+
+
+def test_capture_restart_reopens_the_stream_and_keeps_the_buffer(monkeypatch):
+    fake = FakePyAudio()
+    monkeypatch.setattr(core.audio_stream, "pyaudio", fake, raising=False)
+    monkeypatch.setattr(core.audio_stream, "PYAUDIO_AVAILABLE", True)
+    capture = AudioCapture(frame_length=4)
+    capture.start()
+    reader = capture.reader()
+    capture.ring.write(frame(1))
+
+    fake.streams[0].active = False  # Dispositivo desconectado
+    assert not capture.running
+    capture.restart()
+
+    assert fake.streams[0].closed and capture.running
+    capture.ring.write(frame(2))
+    assert [reader.read(0), reader.read(0)] == [frame(1), frame(2)]
+    capture.stop()
+    assert not capture.running and capture.ring.closed
+
+
+def write_wav(path, frames, frame_length=4):
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"".join(number.to_bytes(2, "little") * frame_length for number in range(1, frames + 1)))
+
+
+def test_file_source_replays_every_frame_in_fast_mode(tmp_path):
+    path = tmp_path / "comando.wav"
+    write_wav(path, frames=50)
+    source = FileAudioSource(str(path), frame_length=4, realtime=False, pad_seconds=0.0, buffer_seconds=0.001)
+    reader = source.reader()
+    source.start()
+
+    frames = []
+    while True:
+        pcm = reader.read(timeout=1.0)
+        if pcm is None:
+            break
+        frames.append(pcm)
+        # Leitor lento: a reprodução rápida espera em vez de sobrescrever o buffer
+        time.sleep(0.001)
+
+    assert frames == [frame(number) for number in range(1, 51)]
+    assert reader.overruns == 0
+    assert source.finished.is_set() and not source.running
+
+
+def test_file_source_pads_with_silence_and_paces_in_realtime(tmp_path):
+    path = tmp_path / "comando.wav"
+    write_wav(path, frames=1, frame_length=160)
+    source = FileAudioSource(str(path), frame_length=160, realtime=True, pad_seconds=0.05)
+    assert source.duration == 0.06
+
+    reader = source.reader()
+    start = time.perf_counter()
+    source.start()
+    frames = []
+    while (pcm := reader.read(timeout=1.0)) is not None:
+        frames.append(pcm)
+
+    assert len(frames) == 6 and frames[-1] == b"\x00" * 320
+    assert time.perf_counter() - start >= 0.05
+
+
+def test_async_reader_is_woken_by_the_capture_thread():
+    ring = AudioRingBuffer(capacity=8)
+
+    def produce():
+        for number in range(3):
+            time.sleep(0.01)
+            ring.write(frame(number))
+        ring.close()
+
+    async def consume():
+        reader = AsyncRingReader(ring.reader())
+        threading.Thread(target=produce).start()
+        frames = []
+        while (pcm := await reader.read()) is not None:
+            frames.append(pcm)
+        reader.close()
+        return frames
+
+    assert asyncio.run(consume()) == [frame(0), frame(1), frame(2)]
+    assert ring._listeners == []
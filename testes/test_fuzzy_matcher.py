@@ -0,0 +1,58 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.interpreter import CommandInterpreter
+from core.fuzzy_matcher import FuzzyIntentIndex, bounded_levenshtein, fold_text
+from core.intent_matcher import expand_pattern
+
+
+@pytest.fixture
+def interpreter():
+    return CommandInterpreter()
+
+
+@pytest.mark.parametrize("command, expected_intent", [
+    ("diminui o brilio", "dim_lights"),
+    ("camila status monitoramento", "monitoring_status"),
+    ("tocar musica", "music"),
+    ("comando inexistente", None),
+])
+def test_stt_near_misses_stay_local(interpreter, command, expected_intent):
+    assert interpreter.interpret_command(command) == expected_intent
+
+
+def test_regex_confidence_takes_priority(interpreter):
+    assert interpreter._find_best_intent("que horas são") == ("time", 1.0)
+
+
+def test_fuzzy_matching_can_be_disabled():
+    interpreter = CommandInterpreter(fuzzy_matching=False)
+    assert interpreter.interpret_command("diminui o brilio") is None
+
+
+def test_custom_intent_examples_are_indexed(interpreter):
+    interpreter.add_custom_intent("coffee", [r"(preparar|fazer) (o café|um café)"], ["Preparando café."])
+    assert interpreter.interpret_command("prepara o cafe") == "coffee"
+
+
+def test_expand_pattern():
+    assert expand_pattern(r"(diminuir|baixar) (brilho|luz)") == [
+        "baixar brilho", "baixar luz", "diminuir brilho", "diminuir luz"
+    ]
+    assert expand_pattern(r"(?:abrir|abre)\s+(.*)") == []
+
+
+def test_index_helpers():
+    assert fold_text("Kamila, Música") == "kamila, musica"
+    assert fold_text("kamila musica") == "musica"
+    assert bounded_levenshtein("brilho", "brilio", 2) == 1
+    assert bounded_levenshtein("brilho", "volume", 2) == 3
+
+    index = FuzzyIntentIndex(min_similarity=0.8)
+    index.add("dim_lights", ["diminuir brilho"])
+    assert index.match("diminuir brilio")[0] == "dim_lights"
+    assert index.match("tocar música") == (None, 0.0)
@@ -0,0 +1,121 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.hedging import hedged_call
+
+
+class KeyRejected(Exception):
+    pass
+
+
+class NotUnderstood(Exception):
+    pass
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def delayed(value, seconds, calls=None):
+    def call():
+        if calls is not None:
+            calls.append(value)
+        time.sleep(seconds)
+        if isinstance(value, Exception):
+            raise value
+        return value
+    return call
+
+
+def test_fast_primary_never_fires_fallback(executor):
+    calls = []
+    result = hedged_call(delayed("com chave", 0.01, calls), delayed("sem chave", 0, calls), executor, 0.5)
+    assert result == ("com chave", 0)
+    assert calls == ["com chave"]
+
+
+def test_slow_primary_is_hedged(executor):
+    start = time.perf_counter()
+    result = hedged_call(delayed("com chave", 1.0), delayed("sem chave", 0.05), executor, 0.1)
+    assert result == ("sem chave", 1)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_rejected_key_falls_back_without_waiting_for_delay(executor):
+    start = time.perf_counter()
+    result = hedged_call(delayed(KeyRejected("401"), 0), delayed("sem chave", 0), executor, 5.0,
+                         hedge_on=(KeyRejected,))
+    assert result == ("sem chave", 1)
+    assert time.perf_counter() - start < 1.0
+
+
+def test_non_hedged_error_is_raised(executor):
+    calls = []
+    with pytest.raises(NotUnderstood):
+        hedged_call(delayed(NotUnderstood(), 0, calls), delayed("sem chave", 0, calls), executor, 1.0,
+                    hedge_on=(KeyRejected,))
+    assert len(calls) == 1
+
+
+def test_all_failures_raise_last_error(executor):
+    with pytest.raises(NotUnderstood):
+        hedged_call(delayed(KeyRejected(), 0), delayed(NotUnderstood(), 0.01), executor, 1.0,
+                    hedge_on=(KeyRejected,))
+
+
+def test_serial_mode_waits_for_primary(executor):
+    started = threading.Event()
+    result = hedged_call(delayed("com chave", 0.2), lambda: started.set(), executor, None)
+    assert result == ("com chave", 0)
+    assert not started.is_set()
+
+
+def test_blocking_callers_in_a_full_pool_still_complete(executor):
+    # Como no STTEngine: vários `session.finish` ocupam o pool de reconhecimento e
+    # cada um espera as requisições redundantes, que rodam no pool de hedging
+    recognition_pool = ThreadPoolExecutor(max_workers=2)
+
+    def finish(i):
+        return hedged_call(delayed(f"com chave {i}", 0.2), delayed(f"sem chave {i}", 0.01), executor, 0.05)
+
+    try:
+        futures = [recognition_pool.submit(finish, i) for i in range(4)]
+        assert [future.result(timeout=2) for future in futures] == [(f"sem chave {i}", 1) for i in range(4)]
+    finally:
+        recognition_pool.shutdown(wait=False)
+
+
+def test_primary_finishing_right_after_the_delay_is_not_lost(executor):
+    release = threading.Event()
+
+    class PrimaryWinsTheRace:
+        """A principal termina bem na hora em que a alternativa é disparada."""
+
+        def __init__(self):
+            self.futures = []
+
+        def submit(self, fn):
+            if self.futures:
+                release.set()
+                self.futures[0].result(timeout=2)
+            self.futures.append(executor.submit(fn))
+            return self.futures[-1]
+
+    def slow_primary():
+        release.wait(timeout=2)
+        return "com chave"
+
+    def failing_fallback():
+        raise RuntimeError("sem chave falhou")
+
+    assert hedged_call(slow_primary, failing_fallback, PrimaryWinsTheRace(), 0.05) == ("com chave", 0)
@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.interpreter import CommandInterpreter
+from core.intent_cache import IntentCache
+
+
+@pytest.fixture
+def interpreter():
+    return CommandInterpreter()
+
+
+def test_repeated_command_skips_matching(interpreter, monkeypatch):
+    assert interpreter.interpret_command("que horas são") == "time"
+
+    def fail(command):
+        raise AssertionError("o cache deveria evitar a avaliação dos padrões")
+
+    monkeypatch.setattr(interpreter, "_find_best_intent", fail)
+    assert interpreter.interpret_command("Que horas são?") == "time"
+
+    stats = interpreter.get_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_catalog_changes_invalidate_cache(interpreter):
+    interpreter.interpret_command("preparar café")
+    interpreter.add_custom_intent("coffee", [r"preparar café"], ["Preparando café."])
+    assert interpreter.interpret_command("preparar café") == "coffee"
+
+    interpreter.set_confidence_threshold(0.5)
+    assert interpreter.get_cache_stats()["size"] == 0
+
+
+def test_lru_eviction_and_ttl():
+    cache = IntentCache(max_size=2, ttl=0.05)
+    cache.put("a", ("time", 1.0))
+    cache.put("b", ("date", 1.0))
+    cache.get("a")
+    cache.put("c", ("music", 1.0))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ("time", 1.0)
+
+    time.sleep(0.06)
+    assert cache.get("a") is None
@@ -0,0 +1,124 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.interpreter import CommandInterpreter
+from core import intent_catalog
+from core.intent_catalog import CatalogWatcher, load_compiled_catalog, read_catalog_file
+
+CATALOG = {
+    "greeting": {
+        "patterns": [r"(olá|oi) kamila"],
+        "responses": ["Olá!"],
+        "context": "social"
+    },
+    "time": {
+        "patterns": [r"que horas (são|é)"],
+        "responses": ["Agora são {time}."],
+        "context": "information"
+    }
+}
+
+
+def write_catalog(path, intents):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(intents, f, ensure_ascii=False)
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    path = tmp_path / "intents.json"
+    write_catalog(path, CATALOG)
+    return str(path)
+
+
+def make_interpreter(catalog_file, tmp_path):
+    return CommandInterpreter(catalog_path=catalog_file, catalog_cache_dir=str(tmp_path / "cache"))
+
+
+def test_intents_come_from_the_data_file(catalog_file, tmp_path):
+    interpreter = make_interpreter(catalog_file, tmp_path)
+    assert interpreter.get_available_intents() == ["greeting", "time"]
+    assert interpreter.interpret_command("que horas são") == "time"
+
+
+def test_default_catalog_is_shipped():
+    intents, _ = read_catalog_file(CommandInterpreter(catalog_cache_dir=None).catalog_path)
+    assert "health_protocol" in intents and "time" in intents
+
+
+def test_compiled_catalog_is_cached_by_content(catalog_file, tmp_path):
+    builds = []
+    cache_dir = str(tmp_path / "cache")
+    interpreter = make_interpreter(catalog_file, tmp_path)
+
+    def build(intents):
+        builds.append(intents)
+        return interpreter._compile_catalog(intents)
+
+    first = load_compiled_catalog(catalog_file, build, cache_dir)
+    second = load_compiled_catalog(catalog_file, build, cache_dir)
+    assert len(builds) == 0
+    assert second.digest == first.digest
+    assert second.matcher.best("oi kamila")[0] == "greeting"
+
+    write_catalog(catalog_file, {"time": CATALOG["time"]})
+    load_compiled_catalog(catalog_file, build, cache_dir)
+    assert len(builds) == 1
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_compiler_change_or_corrupt_cache_recompiles(catalog_file, tmp_path, monkeypatch):
+    builds = []
+    cache_dir = str(tmp_path / "cache")
+    interpreter = make_interpreter(catalog_file, tmp_path)
+
+    def build(intents):
+        builds.append(intents)
+        return interpreter._compile_catalog(intents)
+
+    # Código do compilador alterado: o cache gravado com o código anterior é ignorado
+    monkeypatch.setattr(intent_catalog, "compiler_fingerprint", lambda: "0" * 64)
+    load_compiled_catalog(catalog_file, build, cache_dir)
+    assert len(builds) == 1
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Cache corrompido: recompila em vez de falhar
+    cache_file, = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, cache_file), 'wb') as f:
+        f.write(b"nao e um pickle")
+    catalog = load_compiled_catalog(catalog_file, build, cache_dir)
+    assert len(builds) == 2
+    assert catalog.matcher.best("oi kamila")[0] == "greeting"
+
+
+def test_hot_reload_swaps_catalog_and_keeps_custom_intents(catalog_file, tmp_path):
+    interpreter = make_interpreter(catalog_file, tmp_path)
+    interpreter.add_custom_intent("coffee", [r"(preparar|fazer) café"], ["Preparando café."])
+    assert interpreter.interpret_command("oi kamila") == "greeting"
+
+    watcher = CatalogWatcher(catalog_file, interpreter.reload_catalog)
+    catalog = dict(CATALOG, goodbye={"patterns": [r"tchau kamila"], "responses": ["Tchau!"]})
+    del catalog["greeting"]
+    write_catalog(catalog_file, catalog)
+    os.utime(catalog_file, ns=(0, 0))
+
+    assert watcher.check() is True
+    assert watcher.check() is False
+    assert interpreter.interpret_command("oi kamila") is None
+    assert interpreter.interpret_command("tchau kamila") == "goodbye"
+    assert interpreter.interpret_command("preparar café") == "coffee"
+
+
+def test_invalid_catalog_keeps_previous_version(catalog_file, tmp_path):
+    interpreter = make_interpreter(catalog_file, tmp_path)
+    with open(catalog_file, 'w', encoding='utf-8') as f:
+        f.write('{"time": {"responses": []}}')
+
+    with pytest.raises(ValueError):
+        interpreter.reload_catalog()
+    assert interpreter.interpret_command("que horas são") == "time"
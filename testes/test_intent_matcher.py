@@ -0,0 +1,80 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.interpreter import CommandInterpreter
+from core.intent_matcher import IntentMatcher, required_literals
+
+COMMANDS = [
+    "que horas são",
+    "qual é a hora agora",
+    "como você está",
+    "ligar luz",
+    "tocar música",
+    "diminuir volume",
+    "diminuir brilho",
+    "status do monitoramento",
+    "kamila ativa protocolo de saúde",
+    "abrir o navegador",
+    "clica em salvar",
+    "pesquisar por receitas no chrome",
+    "registrar crise",
+    "comando inexistente",
+    "",
+]
+
+
+@pytest.fixture
+def interpreter():
+    return CommandInterpreter()
+
+
+def reference_best_intent(interpreter, command):
+    """Algoritmo original: avalia cada intenção com os padrões não compilados."""
+    best_intent, best_confidence = None, 0.0
+    for name, data in interpreter.intents.items():
+        confidence = interpreter._calculate_confidence(command, data["patterns"])
+        if confidence > best_confidence:
+            best_intent, best_confidence = name, confidence
+    return best_intent, best_confidence
+
+
+@pytest.mark.parametrize("command", COMMANDS)
+def test_matcher_matches_reference(interpreter, command):
+    normalized = interpreter._normalize_command(command)
+    assert interpreter._matcher.best(normalized) == reference_best_intent(interpreter, normalized)
+
+
+def test_custom_intent_is_compiled(interpreter):
+    interpreter.add_custom_intent("coffee", [r"(preparar|fazer) o café", r"preparar café"], ["Preparando café."])
+    assert interpreter.interpret_command("preparar café") == "coffee"
+
+
+def test_invalid_pattern_is_ignored(interpreter):
+    interpreter.add_custom_intent("broken", [r"(abrir", r"fechar janela"], ["Ok."])
+    assert interpreter.interpret_command("fechar janela") == "broken"
+
+
+@pytest.mark.parametrize("command", COMMANDS)
+def test_prefilter_is_lossless(interpreter, command):
+    normalized = interpreter._normalize_command(command)
+    full_scan = IntentMatcher(interpreter.intents, use_index=False)
+    assert interpreter._matcher.best(normalized) == full_scan.best(normalized)
+
+
+def test_required_literals():
+    assert required_literals(r"qual.*hora") == [frozenset({"qual"}), frozenset({"hora"})]
+    groups = required_literals(r"(ativar|iniciar) (protocolo de saúde|modo saúde)")
+    assert "ativar protocolo de saúde" in groups[0]
+    # Curingas como `(.*)` não geram literal obrigatório
+    assert required_literals(r"(.*)") == []
+
+
+def test_prefilter_prunes_unrelated_intents(interpreter):
+    candidates = interpreter._matcher.candidate_intents("ativar protocolo de saúde")
+    assert "health_protocol" in candidates
+    assert "music" not in candidates
+    assert interpreter._matcher.candidate_intents("comando inexistente") == []
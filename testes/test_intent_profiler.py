@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.interpreter import CommandInterpreter
+
+
+@pytest.fixture
+def interpreter():
+    return CommandInterpreter(catalog_cache_dir=None)
+
+
+def test_profiling_is_opt_in(interpreter):
+    interpreter.interpret_command("que horas são")
+    assert interpreter.get_profiling_report() == {}
+    assert interpreter._matcher.profiler is None
+
+
+def test_report_counts_evaluations_matches_and_wins(interpreter):
+    interpreter.enable_profiling()
+    for command in ["que horas são", "que horas são", "comando inexistente"]:
+        interpreter.interpret_command(command)
+
+    report = interpreter.get_profiling_report()
+    rows = {row["pattern"]: row for row in report["patterns"]}
+
+    assert report["summary"]["commands"] == 2  # a repetição vem do cache
+    assert report["summary"]["unmatched"] == 1
+    assert rows["que horas"]["wins"] == 1
+    assert rows["que horas"]["matches"] == 1
+    assert rows["que horas"]["slowest_command"] == "que horas são"
+    # Padrões nunca avaliados também aparecem, para identificar padrões mortos
+    assert len(rows) == len(interpreter._matcher.patterns)
+    assert "qual.*hora" in report["dead_patterns"]
+
+
+def test_metrics_callback_and_json_export(interpreter, tmp_path):
+    events = []
+    interpreter.enable_profiling(events.append)
+    interpreter.interpret_command("que horas são")
+    interpreter.interpret_command("diminui o brilio")
+
+    assert events[0]["intent"] == "time"
+    assert events[0]["winning_pattern"] == "que horas"
+    assert events[0]["patterns_evaluated"] >= 1
+    assert events[1]["intent"] == "dim_lights" and events[1]["fuzzy"] is True
+
+    path = tmp_path / "profile.json"
+    interpreter.export_profiling_report(str(path))
+    assert json.loads(path.read_text(encoding="utf-8"))["summary"]["fuzzy_wins"] == 1
+
+    interpreter.disable_profiling()
+    interpreter.interpret_command("ligar luz")
+    assert len(events) == 2
+
+
+def test_profiling_does_not_change_results(interpreter):
+    commands = ["que horas são", "diminuir brilho", "abrir o navegador", "tchau kamila"]
+    expected = interpreter.interpret_batch(commands, with_confidence=True)
+    interpreter.enable_profiling()
+    assert interpreter.interpret_batch(commands, with_confidence=True) == expected
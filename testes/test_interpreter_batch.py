@@ -0,0 +1,86 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.interpreter import CommandInterpreter
+
+TRANSCRIPT = [
+    "Que horas são?",
+    "por favor, diminuir volume",
+    "que horas são",
+    "kamila, ativa protocolo de saúde",
+    "comando inexistente",
+    "",
+    "linha\ncom quebra",
+]
+
+
+@pytest.fixture
+def interpreter():
+    return CommandInterpreter()
+
+
+def test_batch_matches_single_interpretation(interpreter):
+    expected = [interpreter.interpret_command(command) for command in TRANSCRIPT]
+    assert interpreter.interpret_batch(TRANSCRIPT) == expected
+
+
+def test_batch_normalization_matches_single(interpreter):
+    expected = [interpreter._normalize_command(command) for command in TRANSCRIPT]
+    assert interpreter._normalize_batch(TRANSCRIPT) == expected
+
+
+def test_batch_keeps_line_breaks_inside_a_command_like_single(interpreter):
+    commands = ["por\nfavor abrir", "abrir por\nfavor", "que horas\nsão", "me\r\ndiz que horas são"]
+    expected = [interpreter._normalize_command(command) for command in commands]
+    assert interpreter._normalize_batch(commands) == expected
+    assert interpreter.interpret_batch(commands) == [interpreter.interpret_command(c) for c in commands]
+
+
+def test_batch_with_confidence(interpreter):
+    (intent, confidence), = interpreter.interpret_batch(["que horas são"], with_confidence=True)
+    assert intent == "time"
+    assert confidence == 1.0
+
+
+def test_partial_rescores_only_on_new_words(interpreter, monkeypatch):
+    calls = []
+    original = interpreter._find_best_intent
+
+    def counting(command):
+        calls.append(command)
+        return original(command)
+
+    monkeypatch.setattr(interpreter, "_find_best_intent", counting)
+
+    assert interpreter.interpret_partial("que") is None
+    assert interpreter.interpret_partial("que ho") is None
+    assert interpreter.interpret_partial("que hor") is None
+    assert calls == ["que"]
+
+    assert interpreter.interpret_partial("que horas ") == "time"
+    assert interpreter.interpret_partial("que horas s") == "time"
+    assert calls == ["que", "que horas"]
+
+    interpreter.reset_partial()
+    assert interpreter.interpret_partial("que horas", final=True) == "time"
+
+
+def test_partial_prefixes_stay_out_of_the_cache(interpreter):
+    interpreter.interpret_partial("que ")
+    interpreter.interpret_partial("que horas ")
+    assert interpreter.get_cache_stats()["size"] == 0
+
+    assert interpreter.interpret_partial("que horas são", final=True) == "time"
+    assert interpreter.get_cache_stats()["size"] == 1
+
+
+def test_partial_errors_return_none(interpreter, monkeypatch):
+    def broken(command):
+        raise ValueError("prefixo malformado")
+
+    monkeypatch.setattr(interpreter, "_find_best_intent", broken)
+    assert interpreter.interpret_partial("que horas ") is None
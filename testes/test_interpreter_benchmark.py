@@ -0,0 +1,29 @@
+import copy
+
+from benchmark_interpreter import (
+    NEGATIVE, NOISE_TYPES, build_corpus, compare_reports, make_interpreter, run_benchmark
+)
+
+
+def test_corpus_is_deterministic_and_labelled():
+    intents = make_interpreter().intents
+    corpus = build_corpus(intents, seed=7)
+
+    assert corpus == build_corpus(intents, seed=7)
+    assert len(corpus) > 2000
+    assert {item["noise"] for item in corpus} == set(NOISE_TYPES) | {"negative"}
+    assert {item["intent"] for item in corpus} == set(intents) | {NEGATIVE}
+
+
+def test_report_and_regression_check():
+    corpus = build_corpus(make_interpreter().intents, seed=7)[:150]
+    report = run_benchmark(corpus, repeat=1, seed=7)
+
+    assert report["meta"]["corpus_size"] == 150
+    assert report["latency_us"]["p50"] <= report["latency_us"]["p99"]
+    assert sum(sum(row.values()) for row in report["confusion"].values()) == 150
+    assert compare_reports(report, report) is True
+
+    worse = copy.deepcopy(report)
+    worse["accuracy"]["overall"] -= 0.05
+    assert compare_reports(worse, report) is False
@@ -0,0 +1,85 @@
+import os
+import sys
+from concurrent.futures import Future
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.speech_pipeline import SentenceChunker, SpeechPipeline
+
+
+class FakeTTS:
+    """Fila de fala falsa: registra as frases e "começa a tocar" cada uma na hora."""
+
+    def __init__(self):
+        self.spoken = []
+        self.futures = []
+
+    def submit(self, text, priority=5, on_start=None):
+        if on_start:
+            on_start()
+        self.spoken.append(text)
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+def test_chunker_splits_sentences_across_chunks():
+    chunker = SentenceChunker()
+    assert chunker.feed("Olá, Ana! Hoje o") == ["Olá, Ana!"]
+    assert chunker.feed(" Dr. Paulo ligou às 3.5") == []
+    assert chunker.feed("0h. Quer retornar") == ["Hoje o Dr. Paulo ligou às 3.50h."]
+    assert chunker.flush() == "Quer retornar"
+    assert chunker.flush() is None
+
+
+def test_chunker_cuts_long_text_without_punctuation():
+    chunker = SentenceChunker(max_chars=20)
+    sentences = chunker.feed("uma frase muito longa sem nenhuma pontuação ")
+    assert sentences and all(len(sentence) <= 20 for sentence in sentences)
+
+
+def test_first_sentence_is_spoken_while_generating():
+    tts = FakeTTS()
+    pipeline = SpeechPipeline(tts)
+    spoken_during_generation = []
+
+    def stream():
+        yield "Claro! Vou "
+        yield "te lembrar. "
+        spoken_during_generation.extend(tts.spoken)
+        yield "Tome o remédio às oito"
+
+    text = pipeline.speak_stream(stream())
+
+    assert text == "Claro! Vou te lembrar. Tome o remédio às oito"
+    assert spoken_during_generation == ["Claro!", "Vou te lembrar."]
+    assert tts.spoken[-1] == "Tome o remédio às oito"
+    assert pipeline.get_stats()["responses"] == 1
+
+
+def test_stops_speaking_after_sentence_is_flushed():
+    tts = FakeTTS()
+    pipeline = SpeechPipeline(tts)
+
+    def stream():
+        yield "Primeira frase. "
+        tts.futures[0].cancel()  # descartada por um alerta de emergência
+        yield "Segunda frase. Terceira."
+
+    assert pipeline.speak_stream(stream()) == "Primeira frase. Segunda frase. Terceira."
+    assert tts.spoken == ["Primeira frase."]
+
+
+def test_stops_speaking_after_barge_in():
+    tts = FakeTTS()
+    tts.interruptions = 0
+    pipeline = SpeechPipeline(tts)
+
+    def stream():
+        yield "Primeira frase. "
+        tts.interruptions += 1  # usuário disse "Kamila" no meio da resposta
+        yield "Segunda frase. "
+
+    pipeline.speak_stream(stream())
+    assert tts.spoken == ["Primeira frase."]
+
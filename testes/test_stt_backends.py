@@ -0,0 +1,105 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.stt_backends import FallbackBackend, RecognitionSession, STTBackend, ScriptedBackend, stream_session
+
+FRAME = b"\x00\x00" * 512
+
+
+class EchoBackend(STTBackend):
+    """Backend sem streaming: 'transcreve' a quantidade de áudio recebida."""
+
+    def recognize(self, pcm, sample_rate, sample_width=2):
+        return f"{len(pcm) // (512 * sample_width)} frames"
+
+
+class ConfidentSession(RecognitionSession):
+    def __init__(self, text, confidence):
+        self.text = text
+        self.result_confidence = confidence
+
+    def feed(self, frame):
+        return self.text
+
+    def finish(self):
+        self.confidence = self.result_confidence
+        return self.text
+
+
+class LocalBackend(STTBackend):
+    """Backend local falso que informa a confiança do resultado."""
+
+    name = "local"
+    streaming = True
+
+    def __init__(self, text, confidence):
+        self.text = text
+        self.confidence = confidence
+
+    def recognize(self, pcm, sample_rate, sample_width=2):
+        return self.text
+
+    def open_session(self, sample_rate, sample_width=2):
+        return ConfidentSession(self.text, self.confidence)
+
+
+def test_streaming_backend_emits_partials_then_final():
+    backend = ScriptedBackend(["que horas são"], frames_per_word=2)
+    transcripts = list(stream_session(backend.open_session(16000), [FRAME] * 7))
+
+    assert [t.text for t in transcripts] == ["que", "que horas", "que horas são", "que horas são"]
+    assert [t.is_final for t in transcripts] == [False, False, False, True]
+    assert transcripts[0].elapsed <= transcripts[-1].elapsed
+
+
+def test_buffered_backend_only_emits_final():
+    transcripts = list(stream_session(EchoBackend().open_session(16000), [FRAME] * 3))
+    assert len(transcripts) == 1
+    assert transcripts[0].is_final and transcripts[0].text == "3 frames"
+
+
+def test_unrecognized_audio_yields_nothing():
+    backend = ScriptedBackend([None, "ligar luz"])
+    assert list(stream_session(backend.open_session(16000), [FRAME] * 10)) == []
+    assert backend.recognize(FRAME, 16000) == "ligar luz"
+
+
+def test_fallback_keeps_confident_local_result():
+    online = ScriptedBackend(["resposta online"])
+    backend = FallbackBackend(LocalBackend("ligar luz", 0.9), online)
+
+    transcripts = list(stream_session(backend.open_session(16000), [FRAME] * 3))
+    assert transcripts[-1].text == "ligar luz" and transcripts[-1].is_final
+    assert online.sessions == 0
+
+
+def test_fallback_consults_online_on_low_confidence_or_empty_result():
+    online = EchoBackend()
+    backend = FallbackBackend(LocalBackend("liga lus", 0.3), online, min_confidence=0.6)
+    assert list(stream_session(backend.open_session(16000), [FRAME] * 4))[-1].text == "4 frames"
+
+    backend = FallbackBackend(LocalBackend(None, None), online)
+    assert backend.recognize(FRAME * 2, 16000) == "2 frames"
+
+
+def test_fallback_keeps_local_result_when_online_fails():
+    backend = FallbackBackend(LocalBackend("liga lus", 0.3), ScriptedBackend([None]))
+    assert backend.recognize(FRAME, 16000) == "liga lus"
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    class NoRecognize(STTBackend):
+        pass
+
+    class NoFinish(RecognitionSession):
+        def feed(self, frame):
+            return None
+
+    with pytest.raises(TypeError):
+        NoRecognize()
+    with pytest.raises(TypeError):
+        NoFinish()
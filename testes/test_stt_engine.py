@@ -0,0 +1,256 @@
+import math
+import os
+import struct
+import sys
+import threading
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.audio_stream import AudioRingBuffer, FileAudioSource
+from core.stt_backends import ScriptedBackend
+import core.stt_engine
+from core.stt_engine import COMMAND_PREROLL_SECONDS, STTEngine
+from core.wake_words import ScriptedWakeDetector
+
+FRAME_LENGTH = 512
+
+
+def frame(index, loud=False):
+    """Frame de 512 amostras com o próprio índice na primeira amostra (tom alto = fala)."""
+    samples = [int(8000 * math.sin(2 * math.pi * 440 * n / 16000)) if loud else 0 for n in range(FRAME_LENGTH)]
+    samples[0] = index
+    return struct.pack(f"<{FRAME_LENGTH}h", *samples)
+
+
+def frame_index(pcm):
+    return struct.unpack_from("<h", pcm)[0]
+
+
+def write_wav(path, speech):
+    """WAV de frames numerados; `speech` diz quais índices são fala."""
+    frames = [frame(index, loud=index in speech) for index in range(max(speech) + 40)]
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"".join(frames))
+
+
+class LiveSource:
+    """Fonte "ao vivo" controlada pelo teste: cada frame só chega quando o teste o grava."""
+
+    sample_rate = 16000
+    frame_length = FRAME_LENGTH
+    sample_width = 2
+
+    def __init__(self):
+        self.ring = AudioRingBuffer(400)
+        self.running = False
+        self.restarts = 0
+
+    @property
+    def frame_duration(self):
+        return self.frame_length / self.sample_rate
+
+    def frames_for(self, seconds):
+        return int(round(seconds / self.frame_duration))
+
+    def start(self):
+        self.running = True
+
+    def restart(self):
+        self.restarts += 1
+        self.running = True
+
+    def reader(self, preroll_seconds=0.0):
+        return self.ring.reader(self.frames_for(preroll_seconds))
+
+    def stop(self):
+        self.running = False
+        self.ring.close()
+
+    def say(self, count, loud=False):
+        """Grava `count` frames numerados (tom alto = fala)."""
+        for _ in range(count):
+            self.ring.write(frame(self.ring.position, loud))
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class RecordingBackend(ScriptedBackend):
+    """ScriptedBackend que guarda o PCM de cada comando reconhecido."""
+
+    def __init__(self, transcripts):
+        super().__init__(transcripts)
+        self.commands = []
+
+    def recognize(self, pcm, sample_rate, sample_width=2):
+        self.commands.append(pcm)
+        return super().recognize(pcm, sample_rate, sample_width)
+
+
+def test_file_source_drives_wake_word_and_command_headless(tmp_path):
+    path = tmp_path / "kamila_que_horas.wav"
+    write_wav(path, speech=range(43, 75))
+    backend = RecordingBackend(["Que horas são"])
+    stt = STTEngine(backend=backend, audio_source=FileAudioSource(str(path), realtime=False),
+                    wake_detector=ScriptedWakeDetector({40: "kamila"}))
+    commands = []
+
+    stt.start_listening(callback=lambda: commands.append(stt.listen_for_command(timeout=3)))
+    try:
+        while stt.listening:
+            time.sleep(0.05)
+        stt.wait_for_callbacks(timeout=5)
+    finally:
+        stt.cleanup()
+
+    assert commands == ["que horas são"]
+    assert stt.last_wake_time == 41 * stt.capture.frame_duration
+    # O comando começa no pre-roll antes do fim da wake word e vai até o fim de fala
+    pcm = backend.commands[0]
+    first = 41 - stt.capture.frames_for(COMMAND_PREROLL_SECONDS)
+    assert frame_index(pcm[:FRAME_LENGTH * 2]) == first
+    assert len(pcm) // (FRAME_LENGTH * 2) > 75 - first
+
+
+def test_wake_loop_restarts_a_capture_that_stops():
+    source = LiveSource()
+    stt = STTEngine(backend=ScriptedBackend([]), audio_source=source,
+                    wake_detector=ScriptedWakeDetector({12: "kamila"}))
+    wakes = []
+
+    stt.start_listening(callback=lambda: wakes.append(stt.last_wake_time))
+    try:
+        source.say(10)
+        source.running = False  # Dispositivo desconectado: nenhum frame novo
+        assert wait_until(lambda: source.restarts == 1)
+        source.say(5)
+        assert wait_until(lambda: wakes)
+        assert stt.listening and source.restarts == 1
+    finally:
+        stt.cleanup()
+
+
+def test_wake_loop_restarts_a_capture_without_new_frames(monkeypatch):
+    monkeypatch.setattr(core.stt_engine, "CAPTURE_STALL_SECONDS", 0.6)
+    source = LiveSource()
+    stt = STTEngine(backend=ScriptedBackend([]), audio_source=source, wake_detector=ScriptedWakeDetector({}))
+
+    stt.start_listening(callback=lambda: None)
+    try:
+        source.say(5)
+        # O stream continua "ativo", mas os callbacks do PortAudio pararam de chegar
+        assert wait_until(lambda: source.restarts >= 1)
+        assert stt.listening
+    finally:
+        stt.cleanup()
+
+
+def test_wake_word_during_a_command_is_part_of_it():
+    source = LiveSource()
+    backend = RecordingBackend(["kamila ligar a luz"])
+    stt = STTEngine(backend=backend, audio_source=source,
+                    wake_detector=ScriptedWakeDetector({20: "kamila", 30: "kamila"}))
+    commands, threads = [], []
+
+    def on_wake():
+        threads.append(threading.current_thread().name)
+        commands.append(stt.listen_for_command(timeout=3))
+
+    stt.start_listening(callback=on_wake)
+    try:
+        source.say(22)
+        source.say(24, loud=True)  # "kamila" de novo no frame 30, no meio do comando
+        source.say(40)
+        assert wait_until(lambda: commands)
+    finally:
+        stt.cleanup()
+
+    assert commands == ["kamila ligar a luz"]
+    # O callback roda no pool de callbacks, fora da thread de detecção
+    assert threads[0].startswith("stt-callback")
+    # A gravação começa no pre-roll antes do fim da primeira wake word
+    assert frame_index(backend.commands[0]) == 21 - source.frames_for(COMMAND_PREROLL_SECONDS)
+
+
+def test_wake_word_during_the_response_interrupts_and_takes_over_the_microphone():
+    source = LiveSource()
+    backend = RecordingBackend(["que horas são", "para"])
+    stt = STTEngine(backend=backend, audio_source=source,
+                    wake_detector=ScriptedWakeDetector({10: "kamila", 75: "kamila"}))
+    interrupts, commands, followups = [], [], []
+    responding, resume = threading.Event(), threading.Event()
+
+    def on_wake():
+        first = not commands
+        commands.append(None)
+        index = len(commands) - 1
+        commands[index] = stt.listen_for_command(timeout=3)
+        if first:
+            # "Respondendo" até a nova ativação; depois tenta ouvir uma continuação
+            responding.set()
+            resume.wait(3)
+            followups.append(stt.listen_for_command(timeout=3))
+
+    stt.enable_barge_in(lambda: interrupts.append(source.ring.position), mode="wake")
+    stt.start_listening(callback=on_wake)
+    try:
+        source.say(12)
+        source.say(15, loud=True)
+        source.say(35)
+        assert wait_until(responding.is_set)
+        assert commands == ["que horas são"] and not stt._recording
+
+        source.say(76 - source.ring.position)  # Wake word no frame 75: interrompe a resposta
+        assert wait_until(lambda: len(interrupts) == 2)
+        resume.set()
+        # O fluxo antigo foi substituído: não disputa o microfone nem libera a gravação do novo
+        assert wait_until(lambda: followups) and followups == [None]
+        assert stt._recording
+
+        source.say(15, loud=True)
+        source.say(35)
+        assert wait_until(lambda: len(commands) == 2 and commands[1] is not None)
+    finally:
+        stt.cleanup()
+
+    assert commands == ["que horas são", "para"]
+    assert len(backend.commands) == 2
+
+
+def test_speech_during_the_response_interrupts_and_is_recorded_from_its_onset():
+    source = LiveSource()
+    backend = RecordingBackend(["para"])
+    stt = STTEngine(backend=backend, audio_source=source, wake_detector=ScriptedWakeDetector({}))
+    speaking = threading.Event()
+    interrupts, commands = [], []
+
+    def interrupt():
+        interrupts.append(source.ring.position)
+        speaking.clear()
+
+    stt.enable_barge_in(interrupt, is_speaking=speaking.is_set,
+                        on_speech=lambda: commands.append(stt.listen_for_command(timeout=3)), mode="vad")
+    stt.start_listening(callback=lambda: None)
+    try:
+        source.say(20)
+        speaking.set()
+        source.say(20, loud=True)
+        source.say(40)
+        assert wait_until(lambda: commands)
+    finally:
+        stt.cleanup()
+
+    assert commands == ["para"] and len(interrupts) == 1
+    onset = 20  # Primeiro frame de fala
+    assert frame_index(backend.commands[0]) == onset - source.frames_for(COMMAND_PREROLL_SECONDS)
@@ -0,0 +1,41 @@
+import json
+
+from benchmark_stt_replay import load_corpus, match_detection, summarize
+
+
+def test_detections_are_matched_once_per_label():
+    labels = [{"start": 1.0, "end": 1.5}, {"end": 10.0}]
+    matched = set()
+
+    assert match_detection(1.7, labels, matched) == 0
+    matched.add(0)
+    assert match_detection(1.8, labels, matched) is None  # Segunda ativação na mesma wake word
+    assert match_detection(8.5, labels, matched) == 1     # Sem `start`: até 2s antes do fim
+    assert match_detection(11.5, labels, matched) is None
+
+
+def test_report_counts_false_accepts_and_accuracy():
+    results = [
+        {"file": "a.wav", "audio_seconds": 1800, "wall_seconds": 2.0, "labels": 2, "events": [
+            {"detected": 1.7, "label": 0, "latency": 0.2, "transcript": "que horas são",
+             "recognition": 0.1, "capture_to_transcript": 0.6, "correct": True},
+            {"detected": 30.0, "label": None, "transcript": None, "recognition": 0.05,
+             "capture_to_transcript": 0.55},
+        ]},
+        {"file": "ruido.wav", "audio_seconds": 1800, "wall_seconds": 2.0, "labels": 0, "events": []},
+    ]
+    report = summarize(results, {"realtime": False, "backend": "scripted"})
+
+    assert report["wake_word"]["detected"] == 1 and report["wake_word"]["missed"] == 1
+    assert report["wake_word"]["false_accepts_per_hour"] == 1.0
+    assert report["capture_to_transcript_s"]["count"] == 1
+    assert report["command_accuracy"] == 1.0
+
+
+def test_corpus_skips_unlabelled_audio(tmp_path):
+    (tmp_path / "rotulado.wav").write_bytes(b"")
+    (tmp_path / "rotulado.wav.json").write_text(json.dumps({"wake": [{"end": 1.0, "command": "oi"}]}))
+    (tmp_path / "sem_rotulo.mp3").write_bytes(b"")
+
+    corpus = load_corpus(str(tmp_path))
+    assert [item["wake"] for item in corpus] == [[{"end": 1.0, "command": "oi"}]]
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.interpreter import CommandInterpreter
+from core.suggestion_trie import SuggestionTrie
+
+
+@pytest.fixture
+def interpreter():
+    return CommandInterpreter()
+
+
+def test_completions_follow_catalog_order_then_usage():
+    trie = SuggestionTrie(top_k=3)
+    trie.insert(["diminuir", "diminuir volume", "diminuir brilho", "dia"])
+
+    assert trie.complete("dim", 3) == ["diminuir", "diminuir volume", "diminuir brilho"]
+    assert trie.complete("diminuir", 3) == ["diminuir volume", "diminuir brilho"]
+
+    trie.record_usage("diminuir brilho")
+    assert trie.complete("di", 2) == ["diminuir brilho", "diminuir"]
+    assert trie.complete("xyz") == []
+    assert trie.record_usage("desconhecido") is False
+
+
+def test_recognized_commands_rank_first(interpreter):
+    interpreter.interpret_command("diminuir volume")
+    assert interpreter.get_context_suggestions("dim")[0] == "diminuir volume"
+
+
+def test_custom_intent_updates_suggestions(interpreter):
+    interpreter.add_custom_intent("coffee", [r"(preparar|fazer) café"], ["Preparando café."])
+    assert "preparar café" in interpreter.get_context_suggestions("prep")
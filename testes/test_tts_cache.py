@@ -0,0 +1,134 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.tts_cache import TTSCache, cache_key
+from core.tts_engine import PRIORITY_EMERGENCY, TTSEngine
+
+
+def write(size):
+    def render(path):
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+    return render
+
+
+class RenderingEngine:
+    """Motor falso que conta sínteses faladas e renderizações em arquivo."""
+
+    def __init__(self):
+        self.said = []
+        self.rendered = []
+        self._pending = None
+
+    def getProperty(self, name):
+        return []
+
+    def setProperty(self, name, value):
+        pass
+
+    def connect(self, topic, callback):
+        pass
+
+    def say(self, text):
+        self._pending = ("say", text, None)
+
+    def save_to_file(self, text, path):
+        self._pending = ("save", text, path)
+
+    def runAndWait(self):
+        kind, text, path = self._pending
+        if kind == "save":
+            write(100)(path)
+            self.rendered.append(text)
+        else:
+            self.said.append(text)
+
+    def stop(self):
+        pass
+
+
+class FakePlayer:
+    def __init__(self):
+        self.played = []
+
+    def play(self, path, should_stop=None):
+        self.played.append(path)
+        return True
+
+    def close(self):
+        pass
+
+
+def test_key_depends_on_voice_settings():
+    assert cache_key("Olá", "pt-br", 180, 0.9) == cache_key("Olá", "pt-br", 180, 0.9)
+    assert cache_key("Olá", "pt-br", 180, 0.9) != cache_key("Olá", "pt-br", 200, 0.9)
+    assert cache_key("Olá", "pt-br", 180, 0.9) != cache_key("Olá", None, 180, 0.9)
+
+
+def test_lru_eviction_by_size_and_reload(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=250)
+    for key in ("a", "b"):
+        assert cache.store(key, write(100))
+    assert cache.get("a")  # "a" passa a ser o mais recente
+    cache.store("c", write(100))
+
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert not os.path.exists(cache.path("b"))
+    assert cache.total_bytes == 200
+
+    reloaded = TTSCache(str(tmp_path), max_bytes=250)
+    assert "a" in reloaded and reloaded.total_bytes == 200
+
+
+def test_failed_render_is_not_cached(tmp_path):
+    cache = TTSCache(str(tmp_path))
+    assert cache.store("x", lambda path: None) is None
+    assert "x" not in cache and os.listdir(str(tmp_path)) == []
+
+
+def test_warmed_phrases_play_from_cache_without_synthesis(tmp_path):
+    engine, player = RenderingEngine(), FakePlayer()
+    tts = TTSEngine(engine_factory=lambda: engine, cache=TTSCache(str(tmp_path)), player=player)
+
+    assert [f.result(timeout=2) for f in tts.warm_cache(["Sistemas online.", "Até logo."])] == [True, True]
+    tts.speak("Sistemas online.")
+    assert tts.submit("Até logo.").result(timeout=2) is True
+    tts.speak("Resposta nova do modelo.")
+    tts.cleanup()
+
+    assert engine.rendered == ["Sistemas online.", "Até logo."]
+    assert engine.said == ["Resposta nova do modelo."]
+    assert len(player.played) == 2
+
+
+def test_cache_flag_renders_once_then_replays(tmp_path):
+    engine, player = RenderingEngine(), FakePlayer()
+    tts = TTSEngine(engine_factory=lambda: engine, cache=TTSCache(str(tmp_path)), player=player)
+
+    for _ in range(3):
+        assert tts.submit("Atenção! Detectei uma possível queda!", cache=True).result(timeout=2) is True
+    tts.cleanup()
+
+    assert engine.rendered == ["Atenção! Detectei uma possível queda!"]
+    assert engine.said == [] and len(player.played) == 3
+
+
+def test_cold_emergency_speaks_first_and_renders_in_background(tmp_path):
+    engine, player = RenderingEngine(), FakePlayer()
+    tts = TTSEngine(engine_factory=lambda: engine, cache=TTSCache(str(tmp_path)), player=player)
+    alert = "Atenção! Detectei uma possível convulsão!"
+
+    # Fora do cache: sintetiza na hora, sem esperar a renderização do arquivo
+    assert tts.submit(alert, priority=PRIORITY_EMERGENCY, cache=True).result(timeout=2) is True
+    assert engine.said == [alert] and player.played == []
+
+    # A renderização em segundo plano deixa o próximo alerta pronto no cache
+    # (warm_cache entra na fila depois dela e só confirma que o arquivo existe)
+    assert [f.result(timeout=2) for f in tts.warm_cache([alert])] == [True]
+    assert engine.rendered == [alert]
+    assert tts.submit(alert, priority=PRIORITY_EMERGENCY, cache=True).result(timeout=2) is True
+    tts.cleanup()
+
+    assert engine.said == [alert] and len(player.played) == 1
@@ -0,0 +1,195 @@
+import functools
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.tts_engine import PRIORITY_EMERGENCY, PRIORITY_NORMAL, TTSEngine
+
+
+class FakeEngine:
+    """Motor pyttsx3 falso: cada palavra leva `word_time` e dispara 'started-word'."""
+
+    def __init__(self, word_time=0.02):
+        self.word_time = word_time
+        self.spoken = []
+        self.said = []
+        self.interrupted = []
+        self.threads = set()
+        self._pending = None
+        self._stopped = False
+        self._on_word = None
+
+    def getProperty(self, name):
+        return []
+
+    def setProperty(self, name, value):
+        pass
+
+    def connect(self, topic, callback):
+        self._on_word = callback
+
+    def say(self, text):
+        self.said.append(text)
+        self._pending = text
+
+    def runAndWait(self):
+        self.threads.add(threading.current_thread().name)
+        text, self._pending, self._stopped = self._pending, None, False
+        for word in text.split():
+            self._on_word("started-word", 0, len(word))
+            if self._stopped:
+                self.interrupted.append(text)
+                return
+            time.sleep(self.word_time)
+        self.spoken.append(text)
+
+    def stop(self):
+        self._stopped = True
+
+
+def make_tts(word_time=0.02):
+    engine = FakeEngine(word_time)
+    return TTSEngine(engine_factory=lambda: engine), engine
+
+
+def test_worker_owns_engine_and_resolves_futures():
+    tts, engine = make_tts(word_time=0)
+    futures = [tts.submit(f"frase {i}") for i in range(3)]
+    assert [future.result(timeout=2) for future in futures] == [True, True, True]
+    tts.speak("frase final")
+    assert engine.spoken == ["frase 0", "frase 1", "frase 2", "frase final"]
+    assert engine.threads == {"tts-worker"}
+    tts.cleanup()
+
+
+def test_emergency_preempts_and_flushes_chatter():
+    tts, engine = make_tts()
+    chatter = tts.submit("uma resposta longa " * 10)
+    queued = [tts.submit(f"conversa {i}") for i in range(3)]
+    time.sleep(0.1)
+
+    alert = tts.submit("Atenção! Detectei uma possível queda!", priority=PRIORITY_EMERGENCY)
+
+    assert alert.result(timeout=2) is True
+    assert chatter.result(timeout=2) is False
+    assert all(future.cancelled() for future in queued)
+    assert engine.spoken == ["Atenção! Detectei uma possível queda!"]
+    assert engine.interrupted == ["uma resposta longa " * 10]
+    tts.cleanup()
+
+
+def test_priority_order_and_interrupt_threshold():
+    tts, engine = make_tts()
+    blocker = tts.submit("ocupando o motor agora")
+    normal = tts.submit("normal", priority=PRIORITY_NORMAL)
+    high = tts.submit("urgente", priority=1)
+    time.sleep(0.05)
+
+    # Só o que for menos urgente que a prioridade 1 é descartado
+    assert tts.interrupt(1) == 1
+    assert normal.cancelled()
+    assert high.result(timeout=2) is True
+    assert blocker.result(timeout=2) is False
+    assert engine.spoken == ["urgente"]
+    tts.cleanup()
+
+
+def test_speak_async_returns_immediately_and_synthesizes_once():
+    engine = FakeEngine(word_time=0.05)
+    created = []
+    tts = TTSEngine(engine_factory=lambda: created.append(engine) or engine)
+
+    texts = [f"aviso número {i} para você" for i in range(3)]
+    started = time.perf_counter()
+    handles = [tts.speak_async(text) for text in texts]
+    caller_latency = time.perf_counter() - started
+
+    # 3 frases x 4 palavras x 50 ms: falar leva ~0,6 s, enfileirar não pode levar nem uma palavra
+    assert caller_latency < 0.02
+    assert not handles[-1].done()
+    assert [handle.result(timeout=3) for handle in handles] == [True, True, True]
+    assert engine.said == texts and engine.spoken == texts
+    assert len(created) == 1 and engine.threads == {"tts-worker"}
+    tts.cleanup()
+
+
+def test_speaking_and_interruption_count_for_barge_in():
+    tts, engine = make_tts()
+    assert tts.speaking is False and tts.interrupt() == 0 and tts.interruptions == 0
+
+    answer = tts.submit("uma resposta bem longa para interromper " * 3)
+    queued = tts.submit("e mais uma frase")
+    time.sleep(0.1)
+    assert tts.speaking is True
+
+    assert tts.interrupt() == 1
+    assert answer.result(timeout=2) is False and queued.cancelled()
+    assert tts.interruptions == 1
+    time.sleep(0.05)
+    assert tts.speaking is False
+    tts.cleanup()
+
+
+
+def test_unexpected_error_fails_the_item_and_keeps_the_worker_alive():
+    tts, engine = make_tts(word_time=0)
+    original = tts._speak_item
+
+    def broken_once(text, mode):
+        if text == "quebra":
+            raise OSError("dispositivo de áudio sumiu")
+        return original(text, mode)
+
+    tts._speak_item = broken_once
+    failed = tts.submit("quebra")
+    after = tts.submit("depois do erro")
+
+    with pytest.raises(OSError):
+        failed.result(timeout=2)
+    assert after.result(timeout=2) is True
+    assert tts.speaking is False
+    assert engine.spoken == ["depois do erro"]
+    tts.cleanup()
+
+
+def test_emergency_alert_survives_barge_in():
+    tts, engine = make_tts()
+    barge_in = functools.partial(tts.interrupt, PRIORITY_EMERGENCY)  # Como em main.py
+
+    alert = tts.submit("Atenção! Detectei uma possível convulsão agora!", priority=PRIORITY_EMERGENCY)
+    second = tts.submit("Chamando o contato de emergência.", priority=PRIORITY_EMERGENCY)
+    chatter = tts.submit("conversa comum")
+    time.sleep(0.05)
+
+    # Wake word ou início de voz (até o eco da própria fala) durante o alerta
+    assert barge_in() == 1
+    assert chatter.cancelled()
+    assert alert.result(timeout=2) is True and second.result(timeout=2) is True
+    assert engine.interrupted == []
+    assert engine.spoken == ["Atenção! Detectei uma possível convulsão agora!", "Chamando o contato de emergência."]
+    tts.cleanup()
+
+
+def test_interrupt_right_after_dequeue_is_not_missed():
+    tts, engine = make_tts(word_time=0)
+    take = tts._take
+
+    def take_then_barge_in():
+        item = take()
+        if item[2] == "resposta que acabou de sair da fila":
+            assert tts.speaking is True  # Já publicado como item atual
+            tts.interrupt()
+        return item
+
+    tts._take = take_then_barge_in
+    tts.speak("aquecendo")  # A thread de fala já estava esperando no _take original
+    answer = tts.submit("resposta que acabou de sair da fila")
+    assert answer.result(timeout=2) is False
+    assert tts.submit("próxima frase").result(timeout=2) is True
+    assert engine.said == ["aquecendo", "próxima frase"]
+    tts.cleanup()
@@ -0,0 +1,125 @@
+import math
+import os
+import random
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.vad import (
+    EnergyVAD, Endpointer, NoiseFloorEstimator, OnsetDetector, create_vad, zero_crossing_rate
+)
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 512
+FRAME_DURATION = FRAME_LENGTH / SAMPLE_RATE
+
+
+def tone(amplitude=3000, frequency=220):
+    samples = [int(amplitude * math.sin(2 * math.pi * frequency * i / SAMPLE_RATE)) for i in range(FRAME_LENGTH)]
+    return struct.pack("h" * FRAME_LENGTH, *samples)
+
+
+def noise(amplitude=100, seed=0):
+    rng = random.Random(seed)
+    return struct.pack("h" * FRAME_LENGTH, *[rng.randint(-amplitude, amplitude) for _ in range(FRAME_LENGTH)])
+
+
+def seconds(value):
+    return int(round(value / FRAME_DURATION))
+
+
+def run(endpointer, frames):
+    states = [endpointer.process(frame) for frame in frames]
+    return states, states.index("end") if "end" in states else None
+
+
+def test_energy_vad_separates_voice_from_noise():
+    vad = EnergyVAD(energy_threshold=400)
+    assert zero_crossing_rate(tone()) < 0.1 < zero_crossing_rate(noise())
+    assert vad.is_speech(tone()) is True
+    assert vad.is_speech(noise()) is False
+    # Ruído de fundo forte eleva o limiar
+    for seed in range(50):
+        vad.is_speech(noise(amplitude=1200, seed=seed))
+    assert vad.threshold > 1000
+    assert vad.is_speech(noise(amplitude=1000)) is False
+
+
+def test_fluent_speaker_ends_after_minimum_silence():
+    endpointer = Endpointer(EnergyVAD(), FRAME_DURATION, min_silence=0.5, max_silence=1.5)
+    frames = [noise()] * 5 + [tone()] * seconds(1.0) + [noise()] * seconds(2.0)
+    states, end = run(endpointer, frames)
+
+    assert "start" in states
+    assert (end - 5 - seconds(1.0) + 1) * FRAME_DURATION < 0.6
+    assert endpointer.get_stats()["last"] < 0.6
+
+
+def test_slow_speaker_is_not_cut_between_words():
+    endpointer = Endpointer(EnergyVAD(), FRAME_DURATION, min_silence=0.5, max_silence=1.5)
+    word, gap = [tone()] * seconds(0.4), [noise()] * seconds(0.45)
+    frames = word + gap + word + gap + word + [noise()] * seconds(2.0)
+    states, end = run(endpointer, frames)
+
+    assert end > len(word * 3 + gap * 2)
+    assert endpointer.required_silence > 0.5
+
+
+def test_silence_cap_and_unknown_backend():
+    endpointer = Endpointer(EnergyVAD(), FRAME_DURATION, min_silence=0.5, max_silence=0.7)
+    frames = [tone()] * 5 + [noise()] * seconds(0.45) + [tone()] * 5 + [noise()] * seconds(3.0)
+    _, end = run(endpointer, frames)
+    assert endpointer.required_silence == 0.7
+    assert end is not None
+
+    assert isinstance(create_vad("energy"), EnergyVAD)
+
+
+def test_noise_floor_follows_persistent_noise_but_not_speech():
+    estimator = NoiseFloorEstimator(initial_threshold=400, min_threshold=150, stride=1, window=20)
+    assert estimator.threshold == 400
+
+    for seed in range(30):
+        estimator.update(noise(amplitude=50, seed=seed))
+    assert estimator.threshold == 150
+
+    # Fala com pausas entre as palavras não eleva o piso
+    for _ in range(5):
+        for frame in [tone()] * 10 + [noise(amplitude=50)] * 3:
+            estimator.update(frame)
+    assert estimator.threshold == 150
+
+    # Ruído contínuo (TV) eleva o limiar em poucos segundos
+    for seed in range(40):
+        estimator.update(noise(amplitude=2000, seed=seed))
+    assert estimator.threshold > 2500
+
+
+def test_command_ends_in_loud_ambient_noise_with_noise_floor():
+    loud = [noise(amplitude=2000, seed=seed) for seed in range(seconds(5.0))]
+
+    # Sem o piso contínuo, o ruído forte conta como fala e o comando nunca termina
+    endpointer = Endpointer(EnergyVAD(), FRAME_DURATION)
+    assert run(endpointer, [tone(amplitude=12000)] * seconds(1.0) + loud)[1] is None
+
+    estimator = NoiseFloorEstimator()
+    for frame in loud:
+        estimator.update(frame)
+    endpointer = Endpointer(EnergyVAD(noise_estimator=estimator), FRAME_DURATION)
+    states, end = run(endpointer, [tone(amplitude=12000)] * seconds(1.0) + loud)
+    assert "start" in states and end is not None
+
+
+def test_onset_needs_sustained_speech_above_echo_margin():
+    estimator = NoiseFloorEstimator(stride=1)
+    for _ in range(10):
+        estimator.update(noise(100))
+    onset = OnsetDetector(estimator, FRAME_DURATION, min_speech=0.1, ratio=2.0)
+
+    # Eco baixo do alto-falante e estalos curtos não disparam
+    assert not any(onset.process(frame) for frame in [tone(300)] * 10 + [tone(8000), noise(100)] * 5)
+    # Fala forte e contínua dispara no frame em que completa `min_speech`
+    fired = [onset.process(tone(8000)) for _ in range(onset.min_frames)]
+    assert fired == [False] * (onset.min_frames - 1) + [True]
+
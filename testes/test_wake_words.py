@@ -0,0 +1,84 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.kamila'))
+
+from core.wake_words import (
+    DEFAULT_KEYWORD_PATH, DEFAULT_MODEL_PATH, PROJECT_ROOT,
+    ScriptedWakeDetector, WakeWordDetector, create_wake_word_detector, parse_keywords
+)
+
+FRAME = b"\x00\x00" * 512
+
+
+class FakePorcupine:
+    """Retorna o índice em `fires_on` para o valor da primeira amostra do frame."""
+
+    sample_rate = 16000
+    frame_length = 512
+
+    def __init__(self, keyword_paths, fires_on=None):
+        self.keyword_paths = keyword_paths
+        self.fires_on = fires_on or {}
+        self.deleted = False
+
+    def process(self, pcm):
+        return self.fires_on.get(pcm[0], -1)
+
+    def delete(self):
+        self.deleted = True
+
+
+def test_default_and_configured_keywords():
+    assert parse_keywords("") == [("kamila", DEFAULT_KEYWORD_PATH, DEFAULT_MODEL_PATH)]
+
+    keywords = parse_keywords("kamila=models/a.ppn, models/wake_words/socorro_pt_v3.ppn@models/en.pv")
+    assert keywords == [
+        ("kamila", os.path.join(PROJECT_ROOT, "models/a.ppn"), DEFAULT_MODEL_PATH),
+        ("socorro", os.path.join(PROJECT_ROOT, "models/wake_words/socorro_pt_v3.ppn"),
+         os.path.join(PROJECT_ROOT, "models/en.pv")),
+    ]
+
+
+def test_detector_reports_keyword_name_across_models():
+    kamila = FakePorcupine(["k.ppn", "s.ppn"], {1: 0, 2: 1})
+    other = FakePorcupine(["h.ppn"], {3: 0})
+    detector = WakeWordDetector([(kamila, ["kamila", "socorro"]), (other, ["help"])])
+
+    assert detector.keywords == ["kamila", "socorro", "help"]
+    assert detector.porcupine is kamila
+    assert detector.process(FRAME) is None
+    assert detector.process(b"\x02" + FRAME[1:]) == "socorro"
+    assert detector.process(b"\x03" + FRAME[1:]) == "help"
+
+    detector.delete()
+    assert kamila.deleted and other.deleted
+
+
+def test_keywords_are_grouped_by_model_and_missing_files_skipped(tmp_path):
+    for name in ("kamila.ppn", "socorro.ppn", "pt.pv"):
+        (tmp_path / name).write_bytes(b"")
+    created = []
+
+    def create(access_key, keyword_paths, model_path):
+        created.append((keyword_paths, model_path))
+        return FakePorcupine(keyword_paths)
+
+    model = str(tmp_path / "pt.pv")
+    detector = create_wake_word_detector("chave", [
+        ("kamila", str(tmp_path / "kamila.ppn"), model),
+        ("ausente", str(tmp_path / "ausente.ppn"), model),
+        ("socorro", str(tmp_path / "socorro.ppn"), model),
+    ], create=create)
+
+    assert created == [([str(tmp_path / "kamila.ppn"), str(tmp_path / "socorro.ppn")], model)]
+    assert detector.keywords == ["kamila", "socorro"]
+    assert create_wake_word_detector("chave", [("ausente", str(tmp_path / "x.ppn"), model)], create=create) is None
+
+
+def test_scripted_detector_fires_on_the_given_frames():
+    detector = ScriptedWakeDetector.at_times([(0.064, "kamila"), (0.16, "socorro")])
+
+    assert detector.keywords == ["kamila", "socorro"]
+    assert [detector.process(FRAME) for _ in range(6)] == [None, None, "kamila", None, None, "socorro"]
+    assert detector.porcupine is None